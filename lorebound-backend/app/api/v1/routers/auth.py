@@ -2,9 +2,12 @@
 
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....core.dependencies import get_current_user, get_current_active_user
+from ....core.dependencies import get_current_user, get_current_active_user, security
+from ....core.rate_limit import RateLimitRule
+from ....core.user_cache import UserPrincipal
 from ....repositories.base import get_session
 from ....services.dependencies import get_auth_service_with_session
 from ....services.auth_service import AuthenticationService
@@ -23,11 +26,17 @@ from ....schemas.auth import (
     TokenResponse,
     UserResponse
 )
-from ....domain.models import User
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Credential checks are costly and a brute-force target, so they weigh more
+rate_limit = RateLimitRule(
+    name="auth",
+    per_minute=30,
+    route_costs={"POST /login": 5, "POST /register": 5, "POST /apple": 3}
+)
+
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -159,7 +168,7 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> UserResponse:
     """
     Get current authenticated user information.
@@ -172,19 +181,21 @@ async def get_current_user_info(
 
 @router.post("/logout")
 async def logout(
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     service_session: tuple[AuthenticationService, AsyncSession] = Depends(get_auth_service_with_session)
 ) -> dict:
     """
-    Logout current user.
+    Logout current user from this device.
     
-    Invalidates user tokens (placeholder for token blacklist implementation).
+    Revokes the refresh token of the current sign-in session and every access
+    token issued from it; other sessions stay signed in.
     """
     auth_service, session = service_session
     
     try:
         logger.info(f"Logout request for user: {current_user.id}")
-        await auth_service.revoke_user_tokens(current_user.id, session)
+        await auth_service.revoke_session_tokens(credentials.credentials, current_user.id)
         logger.info(f"User logout successful: {current_user.id}")
         
         return {"message": "Successfully logged out"}
@@ -195,3 +206,30 @@ async def logout(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Logout failed"
         )
+
+
+@router.post("/logout/all")
+async def logout_all(
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    service_session: tuple[AuthenticationService, AsyncSession] = Depends(get_auth_service_with_session)
+) -> dict:
+    """
+    Logout current user everywhere.
+    
+    Revokes every access and refresh token issued to the user so far.
+    """
+    auth_service, session = service_session
+    
+    try:
+        logger.info(f"Logout everywhere request for user: {current_user.id}")
+        await auth_service.revoke_user_tokens(current_user.id, session)
+        logger.info(f"User logout everywhere successful: {current_user.id}")
+        
+        return {"message": "Successfully logged out of all sessions"}
+        
+    except Exception as e:
+        logger.error(f"Logout everywhere failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Logout failed"
+        )
@@ -7,6 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core.dependencies import get_current_active_user
+from ....core.rate_limit import RateLimitRule
+from ....core.user_cache import UserPrincipal
 from ....services.dependencies import get_content_service_with_session
 from ....services.content_service import ContentService
 from ....services.exceptions import (
@@ -21,16 +23,22 @@ from ....schemas.content import (
     QuestionsRequest,
     QuestionsResponse
 )
-from ....domain.models import User, DailyChallenge
+from ....domain.models import DailyChallenge
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/content", tags=["content"])
 
+# Question fetches can hit the external trivia API
+rate_limit = RateLimitRule(
+    name="content",
+    route_costs={"GET /questions": 3, "GET /daily/{challenge_id}/questions": 3, "POST /refresh-questions": 20}
+)
+
 
 @router.get("/dungeons", response_model=List[DungeonResponse])
 async def get_dungeons(
     service_session: tuple[ContentService, AsyncSession] = Depends(get_content_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> List[DungeonResponse]:
     """
     Get all available dungeons.
@@ -57,7 +65,7 @@ async def get_dungeons(
 async def get_dungeon(
     dungeon_id: UUID,
     service_session: tuple[ContentService, AsyncSession] = Depends(get_content_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> DungeonResponse:
     """
     Get specific dungeon details.
@@ -92,7 +100,7 @@ async def get_questions(
     floor: int = Query(..., ge=1, le=100, description="Floor number"),
     count: int = Query(default=10, ge=1, le=50, description="Number of questions"),
     service_session: tuple[ContentService, AsyncSession] = Depends(get_content_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> QuestionsResponse:
     """
     Get questions for a dungeon with varied selection.
@@ -153,7 +161,7 @@ async def get_questions(
 @router.get("/daily", response_model=DailyChallengeResponse)
 async def get_daily_challenge(
     service_session: tuple[ContentService, AsyncSession] = Depends(get_content_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> DailyChallengeResponse:
     """
     Get current daily challenge.
@@ -190,7 +198,7 @@ async def get_daily_challenge(
 async def get_daily_challenge_questions(
     challenge_id: UUID,
     service_session: tuple[ContentService, AsyncSession] = Depends(get_content_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> QuestionsResponse:
     """
     Get questions for daily challenge.
@@ -242,7 +250,7 @@ async def refresh_question_pool(
     category: Optional[str] = Query(None, description="Category to refresh (admin only)"),
     batch_size: int = Query(default=50, ge=10, le=100, description="Number of questions to fetch"),
     service_session: tuple[ContentService, AsyncSession] = Depends(get_content_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> dict:
     """
     Refresh question pool from external APIs.
@@ -6,11 +6,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core.dependencies import get_current_active_user
+from ....core.user_cache import UserPrincipal
 from ....repositories.base import get_session
 from ....services.inventory_service import InventoryService
 from ....services.exceptions import InventoryError, ItemNotFoundError
-from ....schemas.inventory import EquipItemRequest
-from ....domain.models import User
+from ....schemas.inventory import EquipItemRequest, LoadoutRequest
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/inventory", tags=["inventory"])
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 @router.get("/")
 async def get_inventory(
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -40,10 +40,32 @@ async def get_inventory(
         )
 
 
+@router.get("/summary")
+async def get_inventory_summary(
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get inventory summary.
+    
+    Returns item counts by slot and rarity, the equipped count and total equipped stats.
+    """
+    try:
+        inventory_service = InventoryService()
+        return await inventory_service.get_inventory_summary(current_user.id, session)
+        
+    except Exception as e:
+        logger.error(f"Error getting inventory summary for user {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get inventory summary"
+        )
+
+
 @router.post("/equip")
 async def equip_item(
     equip_request: EquipItemRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -86,3 +108,43 @@ async def equip_item(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to equip item"
         )
+
+
+@router.put("/loadout")
+async def set_loadout(
+    loadout_request: LoadoutRequest,
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Equip a set of items at once.
+    
+    Applies the whole slot to item map or nothing, and returns the changed slots and total stats.
+    """
+    try:
+        logger.info(f"User {current_user.id} setting loadout for {len(loadout_request.loadout)} slots")
+        inventory_service = InventoryService()
+        
+        result = await inventory_service.set_loadout(
+            user_id=current_user.id,
+            loadout=loadout_request.loadout,
+            session=session
+        )
+        
+        await session.commit()
+        return result
+        
+    except InventoryError as e:
+        logger.error(f"Inventory error for user {current_user.id}: {e}")
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error setting loadout for user {current_user.id}: {e}")
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to set loadout"
+        )
@@ -1,25 +1,35 @@
 """Leaderboard endpoints."""
 
+import asyncio
+import json
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core.dependencies import get_current_active_user
+from ....core.user_cache import UserPrincipal
 from ....core.redis_client import get_redis, RedisClient
 from ....repositories.base import get_session
-from ....domain.models import User
-from ....domain.enums import LeaderboardScope
+from ....domain.enums import LeaderboardScope, DungeonCategory
+from ....repositories.leaderboard_repo import LeaderboardRepository
 from ....services.leaderboard_service import LeaderboardService
+from ....services.leaderboard_events import leaderboard_event_hub
+from ....services.exceptions import LeaderboardPeriodNotFoundError
 
 router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
 
+# Comment lines keep idle streams alive through proxies
+STREAM_KEEPALIVE_SECONDS = 15
+
 
 @router.get("/")
 async def get_leaderboard(
     scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope for leaderboard"),
     limit: int = Query(default=100, ge=1, le=100, description="Number of entries to return"),
     offset: int = Query(default=0, ge=0, description="Offset for pagination"),
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session),
     redis: RedisClient = Depends(get_redis),
 ):
@@ -54,7 +64,7 @@ async def get_leaderboard(
 async def get_my_rank(
     scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope for ranking"),
     neighbors: int = Query(default=3, ge=0, le=10, description="Number of neighbors to show"),
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session),
     redis: RedisClient = Depends(get_redis),
 ):
@@ -70,11 +80,14 @@ async def get_my_rank(
     - `user_id`: Your user ID
     - `handle`: Your handle
     - `rank`: Your current rank (null if no scores in this period)
+    - `rank_is_approximate`: True when the rank is estimated (outside the top 1000)
+    - `percentile`: Your position as "top X%" of players in this period
     - `score`: Your score for this period
-    - `total_runs`: Your total number of runs
+    - `total_runs`: Your number of runs in this period
+    - `total_participants`: Number of players ranked in this period
     - `scope`: The requested scope
     - `period_key`: Period identifier
-    - `neighbors`: List of players ranked near you
+    - `neighbors`: Players ranked directly above and below you (top 1000 only)
     """
     service = LeaderboardService(session, redis)
     
@@ -92,10 +105,78 @@ async def get_my_rank(
         )
 
 
+@router.get("/friends")
+async def get_friends_leaderboard(
+    scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope for leaderboard"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    Get rankings among the players you follow (and yourself).
+    
+    Follow players with `PUT /profile/following/{handle}`.
+    
+    **Response:**
+    - `scope`: The requested scope
+    - `period_key`: Period identifier
+    - `total_participants`: Number of ranked players in your circle
+    - `entries`: Leaderboard entries ranked within your circle; `is_you` marks your own entry
+    - `last_updated`: Timestamp of when this data was generated
+    """
+    service = LeaderboardService(session, redis)
+    
+    try:
+        return await service.get_friends_leaderboard(current_user.id, scope)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch friends leaderboard: {str(e)}"
+        )
+
+
+@router.get("/stream")
+async def stream_leaderboard_changes(
+    request: Request,
+    scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope to follow"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Stream live score changes for a scope as server-sent events.
+    
+    Each `score` event carries `user_id`, `handle`, `score` (new period total),
+    `delta` (points just added) and `period_key`; clients re-sort the entries
+    they display instead of polling.
+    """
+    # Authentication is done; don't hold a pooled connection for the stream's lifetime
+    await session.close()
+    
+    queue = leaderboard_event_hub.subscribe(scope)
+    
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: score\ndata: {json.dumps(event)}\n\n"
+        finally:
+            leaderboard_event_hub.unsubscribe(scope, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/stats")
 async def get_leaderboard_stats(
     scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope for statistics"),
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session),
     redis: RedisClient = Depends(get_redis),
 ):
@@ -127,3 +208,180 @@ async def get_leaderboard_stats(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch leaderboard stats: {str(e)}"
         )
+
+
+@router.get("/history")
+async def get_archived_periods(
+    scope: LeaderboardScope = Query(default=LeaderboardScope.WEEKLY, description="Time scope of the archived periods"),
+    limit: int = Query(default=30, ge=1, le=100, description="Number of periods to return"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    List finished periods that can be viewed, newest first.
+    
+    Daily and weekly periods are archived shortly after they end.
+    
+    **Response:**
+    - `scope`: The requested scope
+    - `period_keys`: Archived period identifiers (e.g., "2025-W43")
+    """
+    service = LeaderboardService(session, redis)
+    
+    try:
+        period_keys = await service.get_archived_periods(scope, limit)
+        return {"scope": scope.value, "period_keys": period_keys}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch leaderboard history: {str(e)}"
+        )
+
+
+@router.get("/history/{period_key}")
+async def get_archived_leaderboard(
+    period_key: str,
+    scope: LeaderboardScope = Query(default=LeaderboardScope.WEEKLY, description="Time scope of the period"),
+    limit: int = Query(default=100, ge=1, le=100, description="Number of entries to return"),
+    offset: int = Query(default=0, ge=0, description="Offset for pagination"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    Get the final rankings of a finished period.
+    
+    Same response as `GET /leaderboards/` plus the period's final `stats` and
+    `frozen_at`. Archives hold the top 1000 entries.
+    """
+    service = LeaderboardService(session, redis)
+    
+    try:
+        return await service.get_archived_leaderboard(scope, period_key, limit, offset)
+    except LeaderboardPeriodNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch archived leaderboard: {str(e)}"
+        )
+
+
+@router.get("/dungeons/{dungeon_id}")
+async def get_dungeon_leaderboard(
+    dungeon_id: UUID,
+    scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope for leaderboard"),
+    limit: int = Query(default=100, ge=1, le=100, description="Number of entries to return"),
+    offset: int = Query(default=0, ge=0, description="Offset for pagination"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    Get leaderboard rankings for a single dungeon.
+    
+    Same response as `GET /leaderboards/`, counting only runs in this dungeon.
+    """
+    service = LeaderboardService(session, redis)
+    
+    try:
+        return await service.get_leaderboard(
+            scope, limit, offset, board=LeaderboardRepository.board_key(dungeon_id=dungeon_id)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch dungeon leaderboard: {str(e)}"
+        )
+
+
+@router.get("/dungeons/{dungeon_id}/me")
+async def get_my_dungeon_rank(
+    dungeon_id: UUID,
+    scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope for ranking"),
+    neighbors: int = Query(default=3, ge=0, le=10, description="Number of neighbors to show"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    Get current user's rank and neighboring players in a single dungeon.
+    
+    Same response as `GET /leaderboards/me`, counting only runs in this dungeon.
+    """
+    service = LeaderboardService(session, redis)
+    
+    try:
+        return await service.get_user_rank(
+            user_id=current_user.id,
+            scope=scope,
+            neighbors_count=neighbors,
+            board=LeaderboardRepository.board_key(dungeon_id=dungeon_id)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch dungeon rank: {str(e)}"
+        )
+
+
+@router.get("/categories/{category}")
+async def get_category_leaderboard(
+    category: DungeonCategory,
+    scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope for leaderboard"),
+    limit: int = Query(default=100, ge=1, le=100, description="Number of entries to return"),
+    offset: int = Query(default=0, ge=0, description="Offset for pagination"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    Get leaderboard rankings for a dungeon category (e.g. `sports`).
+    
+    Same response as `GET /leaderboards/`, counting only runs in dungeons of this category.
+    """
+    service = LeaderboardService(session, redis)
+    
+    try:
+        return await service.get_leaderboard(
+            scope, limit, offset, board=LeaderboardRepository.board_key(category=category)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch category leaderboard: {str(e)}"
+        )
+
+
+@router.get("/categories/{category}/me")
+async def get_my_category_rank(
+    category: DungeonCategory,
+    scope: LeaderboardScope = Query(default=LeaderboardScope.ALLTIME, description="Time scope for ranking"),
+    neighbors: int = Query(default=3, ge=0, le=10, description="Number of neighbors to show"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    Get current user's rank and neighboring players in a dungeon category.
+    
+    Same response as `GET /leaderboards/me`, counting only runs in dungeons of this category.
+    """
+    service = LeaderboardService(session, redis)
+    
+    try:
+        return await service.get_user_rank(
+            user_id=current_user.id,
+            scope=scope,
+            neighbors_count=neighbors,
+            board=LeaderboardRepository.board_key(category=category)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch category rank: {str(e)}"
+        )
@@ -1,10 +1,12 @@
 """User profile endpoints."""
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core.dependencies import get_current_active_user
+from ....core.user_cache import UserPrincipal, user_principal_cache
 from ....services.dependencies import get_profile_service_with_session
 from ....services.profile_service import ProfileService
 from ....services.exceptions import (
@@ -12,8 +14,7 @@ from ....services.exceptions import (
     HandleAlreadyExistsError,
     ProfileError
 )
-from ....schemas.user import ProfileResponse, ProfileUpdateRequest
-from ....domain.models import User
+from ....schemas.user import ProfileResponse, ProfileUpdateRequest, FollowedPlayerResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/profile", tags=["profile"])
@@ -21,7 +22,7 @@ router = APIRouter(prefix="/profile", tags=["profile"])
 
 @router.get("/", response_model=ProfileResponse)
 async def get_profile(
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
     service_session: tuple[ProfileService, AsyncSession] = Depends(get_profile_service_with_session)
 ) -> ProfileResponse:
     """
@@ -53,7 +54,7 @@ async def get_profile(
 @router.put("/", response_model=ProfileResponse)
 async def update_profile(
     profile_data: ProfileUpdateRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
     service_session: tuple[ProfileService, AsyncSession] = Depends(get_profile_service_with_session)
 ) -> ProfileResponse:
     """
@@ -77,6 +78,8 @@ async def update_profile(
         
         # Commit the transaction
         await session.commit()
+        # The cached principal carries the handle; drop it only once committed
+        await user_principal_cache.invalidate(current_user.id)
         
         logger.info(f"Profile updated successfully for user: {current_user.id}")
         return ProfileResponse.model_validate(updated_profile)
@@ -107,3 +110,93 @@ async def update_profile(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update profile"
         )
+
+
+@router.get("/following", response_model=List[FollowedPlayerResponse])
+async def get_following(
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    service_session: tuple[ProfileService, AsyncSession] = Depends(get_profile_service_with_session)
+) -> List[FollowedPlayerResponse]:
+    """
+    Get the players the current user follows.
+    
+    Followed players make up the friends leaderboard (`GET /leaderboards/friends`).
+    """
+    profile_service, session = service_session
+    
+    try:
+        profiles = await profile_service.get_followed_players(current_user.id, session)
+        return [FollowedPlayerResponse.model_validate(profile) for profile in profiles]
+        
+    except Exception as e:
+        logger.error(f"Error getting followed players for user {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get followed players"
+        )
+
+
+@router.put("/following/{handle}", response_model=FollowedPlayerResponse)
+async def follow_player(
+    handle: str,
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    service_session: tuple[ProfileService, AsyncSession] = Depends(get_profile_service_with_session)
+) -> FollowedPlayerResponse:
+    """
+    Follow a player by handle. Following an already followed player is a no-op.
+    """
+    profile_service, session = service_session
+    
+    try:
+        profile = await profile_service.follow_player(current_user.id, handle, session)
+        await session.commit()
+        return FollowedPlayerResponse.model_validate(profile)
+        
+    except ProfileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ProfileError as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error following {handle} for user {current_user.id}: {e}")
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to follow player"
+        )
+
+
+@router.delete("/following/{handle}", status_code=status.HTTP_204_NO_CONTENT)
+async def unfollow_player(
+    handle: str,
+    current_user: UserPrincipal = Depends(get_current_active_user),
+    service_session: tuple[ProfileService, AsyncSession] = Depends(get_profile_service_with_session)
+) -> Response:
+    """
+    Stop following a player by handle.
+    """
+    profile_service, session = service_session
+    
+    try:
+        await profile_service.unfollow_player(current_user.id, handle, session)
+        await session.commit()
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+        
+    except ProfileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error unfollowing {handle} for user {current_user.id}: {e}")
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to unfollow player"
+        )
@@ -7,6 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core.dependencies import get_current_active_user
+from ....core.rate_limit import RateLimitRule
+from ....core.user_cache import UserPrincipal
 from ....services.dependencies import get_run_service_with_session
 from ....services.run_service import RunService
 from ....services.exceptions import (
@@ -21,17 +23,19 @@ from ....schemas.run import (
     RunStatsResponse,
     StartRunResponse
 )
-from ....domain.models import User
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/runs", tags=["runs"])
 
+# Submissions run validation and scoring
+rate_limit = RateLimitRule(name="runs", route_costs={"POST /{run_id}/submit": 3})
+
 
 @router.post("/start", response_model=StartRunResponse, status_code=status.HTTP_201_CREATED)
 async def start_run(
     start_data: RunStartRequest,
     service_session: tuple[RunService, AsyncSession] = Depends(get_run_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> StartRunResponse:
     """
     Start a new game run.
@@ -63,7 +67,7 @@ async def validate_answer(
     question_id: UUID,
     answer_index: int,
     service_session: tuple[RunService, AsyncSession] = Depends(get_run_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ):
     """
     Validate a single answer for real-time feedback.
@@ -115,7 +119,7 @@ async def submit_run(
     run_id: UUID,
     submit_data: RunSubmitRequest,
     service_session: tuple[RunService, AsyncSession] = Depends(get_run_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> RunResponse:
     """
     Submit completed run with anti-cheat verification.
@@ -133,9 +137,9 @@ async def submit_run(
         try:
             from ....core.redis_client import get_redis
             from ....services.leaderboard_service import LeaderboardService
-            redis = await anext(get_redis())
+            redis = await get_redis()
             lb_service = LeaderboardService(session, redis)
-            await lb_service.invalidate_all_caches()
+            await lb_service.update_user_score(current_user.id, result.total_score or 0, run_id)
             logger.info("Invalidated leaderboard caches after run submission")
         except Exception as cache_error:
             logger.warning(f"Failed to invalidate leaderboard cache: {cache_error}")
@@ -178,7 +182,7 @@ async def get_user_runs(
     limit: int = Query(default=20, ge=1, le=100, description="Number of runs to return"),
     offset: int = Query(default=0, ge=0, description="Number of runs to skip"),
     service_session: tuple[RunService, AsyncSession] = Depends(get_run_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> List[RunResponse]:
     """
     Get user's run history.
@@ -205,7 +209,7 @@ async def get_user_runs(
 async def get_run(
     run_id: UUID,
     service_session: tuple[RunService, AsyncSession] = Depends(get_run_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> RunResponse:
     """
     Get specific run details.
@@ -238,7 +242,7 @@ async def get_run(
 async def abandon_run(
     run_id: UUID,
     service_session: tuple[RunService, AsyncSession] = Depends(get_run_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> RunResponse:
     """
     Abandon a run in progress.
@@ -270,7 +274,7 @@ async def abandon_run(
 @router.get("/stats/me", response_model=RunStatsResponse)
 async def get_user_stats(
     service_session: tuple[RunService, AsyncSession] = Depends(get_run_service_with_session),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserPrincipal = Depends(get_current_active_user)
 ) -> RunStatsResponse:
     """
     Get user's game statistics.
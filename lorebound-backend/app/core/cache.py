@@ -0,0 +1,203 @@
+"""Read-through caching with request coalescing and early refresh."""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import uuid4
+
+from .metrics import record_cache
+from .redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Long enough to cover one leaderboard aggregate, short enough that a crashed
+# worker never blocks recomputation for long
+LOCK_TTL_MS = 5000
+LOCK_WAIT_INTERVAL = 0.05
+
+# XFetch tuning: values above 1.0 refresh earlier, below 1.0 later
+XFETCH_BETA = 1.0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent computations of the same key within the process.
+    
+    The computation runs in its own task, so it finishes for the remaining
+    callers even when the caller that started it is cancelled.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def do(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run compute once per key; concurrent callers await the same result."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        
+        # Shield so a cancelled caller, the first one included, doesn't cancel
+        # the shared computation
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        """Drop a finished computation so the next call starts a new one."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            task.exception()
+
+
+single_flight = SingleFlight()
+
+
+def should_refresh_early(entry: Dict[str, Any], beta: float = XFETCH_BETA) -> bool:
+    """
+    XFetch: decide probabilistically whether to recompute a value before it expires.
+    
+    The closer the entry is to its expiry and the longer it took to compute,
+    the more likely a request is to refresh it, so hot keys are recomputed by
+    a single early request instead of a miss storm at the TTL boundary.
+    """
+    delta = entry.get("delta", 0.0)
+    expiry = entry.get("expiry", 0.0)
+    # 1 - random() lies in (0, 1], keeping log() finite
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+async def get_or_compute(
+    redis: RedisClient,
+    key: str,
+    ttl: int,
+    compute: Callable[[], Awaitable[Any]],
+    lock_ttl_ms: int = LOCK_TTL_MS
+) -> Any:
+    """
+    Read a JSON value through the cache, computing it at most once per key.
+    
+    Concurrent misses in this process share one in-flight computation and a
+    short Redis lock keeps other processes from running it at the same time.
+    Values are stored together with their compute time and expiry so hot keys
+    can be refreshed early. When Redis fails the value is computed uncached.
+    
+    Args:
+        redis: Redis client
+        key: Cache key
+        ttl: Cache TTL in seconds
+        compute: Coroutine function producing the JSON-serializable value
+        lock_ttl_ms: How long the cross-process lock is held at most
+    """
+    # Keys are "<namespace>:<rest>"
+    namespace = key.split(":", 1)[0]
+    
+    try:
+        entry = await redis.get_json(key)
+    except Exception as e:
+        # Redis is an optimization here; compute without it
+        logger.warning(f"Cache read of {key} failed: {e}")
+        record_cache(namespace, hit=False)
+        return await single_flight.do(key, compute)
+    
+    if not _is_entry(entry):
+        entry = None
+    elif not should_refresh_early(entry):
+        record_cache(namespace, hit=True)
+        return entry["value"]
+    
+    record_cache(namespace, hit=False)
+    return await single_flight.do(
+        key,
+        lambda: _recompute(redis, key, ttl, compute, lock_ttl_ms, entry)
+    )
+
+
+async def _recompute(
+    redis: RedisClient,
+    key: str,
+    ttl: int,
+    compute: Callable[[], Awaitable[Any]],
+    lock_ttl_ms: int,
+    stale: Optional[Dict[str, Any]]
+) -> Any:
+    """Recompute a value under the cross-process lock."""
+    lock_key = f"lock:{key}"
+    token = uuid4().hex
+    
+    try:
+        locked = await redis.acquire_lock(lock_key, token, lock_ttl_ms)
+    except Exception as e:
+        logger.warning(f"Cache lock of {key} failed: {e}")
+        return await compute()
+    
+    if not locked:
+        # Another process is already refreshing; keep serving what we have
+        if stale is not None:
+            return stale["value"]
+        
+        entry = await _wait_for_entry(redis, key, lock_ttl_ms)
+        if entry is not None:
+            return entry["value"]
+        
+        logger.warning(f"Timed out waiting for {key} to be computed elsewhere")
+        return await _compute_and_store(redis, key, ttl, compute)
+    
+    try:
+        return await _compute_and_store(redis, key, ttl, compute)
+    finally:
+        try:
+            await redis.release_lock(lock_key, token)
+        except Exception as e:
+            # The lock expires on its own
+            logger.warning(f"Cache lock release of {key} failed: {e}")
+
+
+async def _compute_and_store(
+    redis: RedisClient,
+    key: str,
+    ttl: int,
+    compute: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Compute a value and cache it together with its XFetch metadata."""
+    started = time.monotonic()
+    value = await compute()
+    delta = time.monotonic() - started
+    
+    try:
+        await redis.set_json(
+            key,
+            {"value": value, "delta": delta, "expiry": time.time() + ttl},
+            ttl
+        )
+    except Exception as e:
+        logger.warning(f"Cache write of {key} failed: {e}")
+    return value
+
+
+async def _wait_for_entry(
+    redis: RedisClient,
+    key: str,
+    lock_ttl_ms: int
+) -> Optional[Dict[str, Any]]:
+    """Poll the cache until the lock holder has stored the value."""
+    deadline = time.monotonic() + lock_ttl_ms / 1000
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_WAIT_INTERVAL)
+        try:
+            entry = await redis.get_json(key)
+        except Exception as e:
+            logger.warning(f"Cache read of {key} failed: {e}")
+            return None
+        if _is_entry(entry):
+            return entry
+    return None
+
+
+def _is_entry(entry: Any) -> bool:
+    """Check a cached payload was written by get_or_compute."""
+    return isinstance(entry, dict) and "value" in entry
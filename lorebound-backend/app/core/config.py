@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     
     # Redis
     redis_url: str = Field(alias="REDIS_URL")
+    redis_max_connections: int = Field(default=50, alias="REDIS_MAX_CONNECTIONS")  # per process
+    redis_pool_timeout_seconds: float = Field(default=2.0, alias="REDIS_POOL_TIMEOUT_SECONDS")  # wait for a free connection before failing
     
     # JWT
     jwt_algorithm: str = Field(default="RS256", alias="JWT_ALG")
@@ -29,16 +31,21 @@ class Settings(BaseSettings):
     jwt_public_key_path: str = Field(alias="JWT_PUBLIC_KEY_PATH")
     access_token_ttl_seconds: int = Field(default=3600, alias="ACCESS_TOKEN_TTL_SECONDS")  # 1 hour
     refresh_token_ttl_seconds: int = Field(default=1209600, alias="REFRESH_TOKEN_TTL_SECONDS")  # 14 days
+    token_cache_size: int = Field(default=10000, alias="TOKEN_CACHE_SIZE")  # verified access tokens per process
+    token_revocation_filter_size: int = Field(default=100000, alias="TOKEN_REVOCATION_FILTER_SIZE")  # revoked token IDs before the filter is resized
+    refresh_token_reuse_grace_seconds: int = Field(default=10, alias="REFRESH_TOKEN_REUSE_GRACE_SECONDS")  # a rotated-away refresh token still refreshes this long
     
     # Apple Sign-In (optional for development)
     apple_team_id: str = Field(default="", alias="APPLE_TEAM_ID")
     apple_client_id: str = Field(default="", alias="APPLE_CLIENT_ID")
     apple_key_id: str = Field(default="", alias="APPLE_KEY_ID")
     apple_private_key_path: str = Field(default="", alias="APPLE_PRIVATE_KEY_PATH")
+    apple_jwks_url: str = Field(default="https://appleid.apple.com/auth/keys", alias="APPLE_JWKS_URL")
     
     # Observability
     sentry_dsn: str = Field(default="", alias="SENTRY_DSN")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    celery_metrics_port: int = Field(default=9540, alias="CELERY_METRICS_PORT")  # 0 = no metrics server in workers
     
     # Game Config
     feature_flags_seed: int = Field(default=1, alias="FEATURE_FLAGS_SEED")
@@ -49,6 +56,16 @@ class Settings(BaseSettings):
     cors_origins: List[str] = Field(default=["*"], alias="CORS_ORIGINS")
     rate_limit_per_minute: int = Field(default=60, alias="RATE_LIMIT_PER_MINUTE")
     
+    # Password hashing
+    password_hash_concurrency: int = Field(default=2, alias="PASSWORD_HASH_CONCURRENCY")
+    bcrypt_rounds: int = Field(default=0, alias="BCRYPT_ROUNDS")  # 0 = benchmark at startup
+    bcrypt_target_ms: int = Field(default=250, alias="BCRYPT_TARGET_MS")
+    bcrypt_min_rounds: int = Field(default=12, alias="BCRYPT_MIN_ROUNDS")  # bcrypt.gensalt()'s cost; calibration only raises it
+    bcrypt_max_rounds: int = Field(default=14, alias="BCRYPT_MAX_ROUNDS")
+    
+    # Rewards
+    drop_tables_path: str = Field(default="", alias="DROP_TABLES_PATH")  # empty = packaged tables
+    
     # Background Jobs
     celery_broker_url: str = Field(alias="CELERY_BROKER_URL")
     celery_result_backend: str = Field(alias="CELERY_RESULT_BACKEND")
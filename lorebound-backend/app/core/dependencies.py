@@ -4,23 +4,60 @@ import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from uuid import UUID
 from typing import Optional
 
 from ..repositories.base import get_session
-from ..core.security import verify_token, extract_user_id_from_token
-from ..domain.models import User
+from ..repositories.user_repo import UserRepository
+from ..core.token_cache import verified_token_cache
+from ..core.token_revocation import token_revocation_list
+from ..core.user_cache import UserPrincipal, user_principal_cache
 from ..domain.enums import UserStatus
 
 
 security = HTTPBearer()
 
 
+def authenticate_token(token: str) -> UUID:
+    """
+    Resolve the user ID of a valid, unrevoked access token.
+    
+    Raises:
+        jwt.InvalidTokenError: If the token is invalid, expired or revoked
+        ValueError: If the user ID claim is malformed
+    """
+    payload = verified_token_cache.verify(token)
+    
+    if token_revocation_list.is_revoked(payload):
+        raise jwt.InvalidTokenError("Token has been revoked")
+    
+    user_id_str = payload.get("user_id")
+    if user_id_str is None:
+        raise jwt.InvalidTokenError("Token missing user ID")
+    
+    return UUID(user_id_str)
+
+
+async def load_user_principal(user_id: UUID, session: AsyncSession) -> Optional[UserPrincipal]:
+    """
+    Get the principal of a user through the user cache.
+    
+    The session only checks out a connection on a cache miss, so endpoints
+    served from Redis never touch the database pool.
+    """
+    async def load() -> Optional[UserPrincipal]:
+        row = await UserRepository(session).get_user_principal(user_id)
+        # Hand the connection back before the handler, which may be served from cache
+        await session.close()
+        return UserPrincipal(**row) if row else None
+    
+    return await user_principal_cache.get(user_id, load)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     session: AsyncSession = Depends(get_session),
-) -> User:
+) -> UserPrincipal:
     """Get current authenticated user."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -29,25 +66,15 @@ async def get_current_user(
     )
     
     try:
-        # Verify the JWT token
-        payload = verify_token(credentials.credentials)
-        user_id_str = payload.get("user_id")
-        
-        if user_id_str is None:
-            raise credentials_exception
-            
-        user_id = UUID(user_id_str)
+        # Verify the JWT token, skipping the signature check for tokens seen before
+        user_id = authenticate_token(credentials.credentials)
         
     except jwt.InvalidTokenError:
         raise credentials_exception
     except ValueError:
         raise credentials_exception
     
-    # Get user from database
-    result = await session.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user = await load_user_principal(user_id, session)
     
     if user is None:
         raise credentials_exception
@@ -56,8 +83,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """Get current active user."""
     if current_user.status != UserStatus.ACTIVE:
         raise HTTPException(
@@ -70,24 +97,15 @@ async def get_current_active_user(
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
     session: AsyncSession = Depends(get_session),
-) -> Optional[User]:
+) -> Optional[UserPrincipal]:
     """Get current user if token is provided, None otherwise."""
     if not credentials:
         return None
     
     try:
-        payload = verify_token(credentials.credentials)
-        user_id_str = payload.get("user_id")
-        
-        if user_id_str is None:
-            return None
-            
-        user_id = UUID(user_id_str)
+        user_id = authenticate_token(credentials.credentials)
         
-        result = await session.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        return await load_user_principal(user_id, session)
         
     except (jwt.InvalidTokenError, ValueError):
         return None
@@ -0,0 +1,157 @@
+"""Cached JSON Web Key Set fetching for third-party identity tokens."""
+
+import asyncio
+import re
+import time
+from typing import Dict, Optional
+
+import httpx
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from jwt.algorithms import RSAAlgorithm
+
+from .cache import SingleFlight
+from .config import settings
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """
+    Parsed RSA keys of a JWKS endpoint, by key ID.
+    
+    Keys live as long as the endpoint's Cache-Control allows and a background
+    task refreshes them ahead of expiry over a kept-alive connection, so token
+    verification normally never waits on the network. Concurrent refreshes
+    share one request.
+    """
+    
+    # Used when the response carries no max-age, and bounds for the ones that do
+    DEFAULT_MAX_AGE = 60 * 60
+    MIN_MAX_AGE = 60
+    MAX_MAX_AGE = 60 * 60 * 24
+    
+    REFRESH_AHEAD = 60
+    RETRY_DELAY = 10
+    # An unknown key ID triggers a refetch at most this often, so forged key
+    # IDs can't turn every sign-in into a request to the provider
+    UNKNOWN_KID_REFETCH_INTERVAL = 10
+    REQUEST_TIMEOUT = 5.0
+    
+    def __init__(self, url: str, client: Optional[httpx.AsyncClient] = None):
+        self.url = url
+        self._client = client
+        self._keys: Dict[str, RSAPublicKey] = {}
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        self._single_flight = SingleFlight()
+        self._refresher: Optional[asyncio.Task] = None
+    
+    async def get_key(self, kid: str) -> Optional[RSAPublicKey]:
+        """
+        Get the public key for a key ID, or None if the provider doesn't publish it.
+        
+        Raises:
+            httpx.HTTPError: If no keys are cached and the endpoint can't be reached
+        """
+        if not self._keys or time.monotonic() >= self._expires_at:
+            await self._refresh_keeping_stale()
+        
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._fetched_at >= self.UNKNOWN_KID_REFETCH_INTERVAL:
+            # The provider may have rotated in a key we haven't seen yet
+            logger.info(f"Unknown JWKS key ID {kid}, refetching {self.url}")
+            await self._refresh_keeping_stale()
+            key = self._keys.get(kid)
+        
+        return key
+    
+    async def refresh(self) -> None:
+        """Fetch the key set now, sharing one request between concurrent callers."""
+        await self._single_flight.do(self.url, self._fetch)
+    
+    def start(self) -> None:
+        """Start refreshing the keys in the background."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop())
+    
+    async def stop(self) -> None:
+        """Stop the background refresh and close the connection."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @classmethod
+    def max_age(cls, cache_control: Optional[str]) -> int:
+        """Get how long a response may be cached from its Cache-Control header."""
+        if not cache_control:
+            return cls.DEFAULT_MAX_AGE
+        
+        directives = cache_control.lower()
+        if "no-store" in directives or "no-cache" in directives:
+            return cls.MIN_MAX_AGE
+        
+        match = MAX_AGE_PATTERN.search(directives)
+        if not match:
+            return cls.DEFAULT_MAX_AGE
+        
+        return min(max(int(match.group(1)), cls.MIN_MAX_AGE), cls.MAX_MAX_AGE)
+    
+    async def _refresh_keeping_stale(self) -> None:
+        """Refresh, falling back to the keys we already have if the endpoint fails."""
+        try:
+            await self.refresh()
+        except httpx.HTTPError as e:
+            if not self._keys:
+                raise
+            logger.warning(f"JWKS refresh from {self.url} failed, keeping cached keys: {e}")
+    
+    async def _fetch(self) -> None:
+        """Download and parse the key set."""
+        response = await self._get_client().get(self.url)
+        response.raise_for_status()
+        
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            if jwk.get("kty") != "RSA" or not jwk.get("kid"):
+                continue
+            keys[jwk["kid"]] = RSAAlgorithm.from_jwk(jwk)
+        
+        now = time.monotonic()
+        self._keys = keys
+        self._fetched_at = now
+        self._expires_at = now + self.max_age(response.headers.get("cache-control"))
+        logger.info(f"Fetched {len(keys)} keys from {self.url}")
+    
+    async def _refresh_loop(self) -> None:
+        """Keep the keys fresh ahead of their expiry."""
+        while True:
+            try:
+                await self.refresh()
+                delay = max(self._expires_at - time.monotonic() - self.REFRESH_AHEAD, self.MIN_MAX_AGE)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Background JWKS refresh from {self.url} failed: {e}")
+                delay = self.RETRY_DELAY
+            await asyncio.sleep(delay)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the kept-alive HTTP client on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.REQUEST_TIMEOUT)
+        return self._client
+
+
+# Apple's Sign in with Apple signing keys
+apple_jwks = JWKSCache(settings.apple_jwks_url)
@@ -0,0 +1,241 @@
+"""Prometheus metrics for the API, its caches and the Celery workers."""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+# With several uvicorn or Celery worker processes, prometheus_client writes
+# samples to files in this directory and a scrape merges them. It must be set
+# before the process starts and emptied on deploy.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REDIS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "lorebound_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "lorebound_http_requests_in_flight",
+    "HTTP requests being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge(
+    "lorebound_db_pool_size",
+    "Connections kept in the SQLAlchemy pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "lorebound_db_pool_checked_out",
+    "SQLAlchemy pool connections in use",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "lorebound_db_pool_overflow",
+    "SQLAlchemy connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+
+REDIS_COMMAND_SECONDS = Histogram(
+    "lorebound_redis_command_duration_seconds",
+    "Redis round trip latency by command",
+    ["command"],
+    buckets=REDIS_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "lorebound_cache_requests_total",
+    "Cache lookups by namespace and result",
+    ["namespace", "result"],
+)
+
+PASSWORD_HASH_QUEUE_SECONDS = Histogram(
+    "lorebound_password_hash_queue_seconds",
+    "Time password hashes wait for a hashing thread",
+    buckets=REQUEST_BUCKETS,
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "lorebound_password_hash_duration_seconds",
+    "Time spent hashing or verifying a password",
+    buckets=REQUEST_BUCKETS,
+)
+PASSWORD_HASHES_QUEUED = Gauge(
+    "lorebound_password_hashes_queued",
+    "Password hashes waiting for a hashing thread",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASHES_IN_FLIGHT = Gauge(
+    "lorebound_password_hashes_in_flight",
+    "Password hashes being computed",
+    multiprocess_mode="livesum",
+)
+
+CELERY_TASK_SECONDS = Histogram(
+    "lorebound_celery_task_duration_seconds",
+    "Celery task run time by task and final state",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+
+
+def record_cache(namespace: str, hit: bool) -> None:
+    """Count a cache lookup."""
+    CACHE_REQUESTS.labels(namespace=namespace, result="hit" if hit else "miss").inc()
+
+
+def observe_redis_command(command: str, seconds: float) -> None:
+    """Record the latency of one Redis round trip."""
+    REDIS_COMMAND_SECONDS.labels(command=command).observe(seconds)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose: this process's, or the merge of every process's samples."""
+    if not MULTIPROCESS:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    """Render the current metrics in the Prometheus text format."""
+    return generate_latest(metrics_registry())
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop the live gauges of an exiting worker process."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request.
+    
+    Requests are labelled with the matched route template, never the raw
+    path, so IDs in URLs don't create new series.
+    """
+    
+    UNMATCHED_ROUTE = "unmatched"
+    
+    def __init__(self, app: Any):
+        self.app = app
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        status_code = 500
+        
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method=method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", None) or self.UNMATCHED_ROUTE
+            HTTP_REQUEST_SECONDS.labels(
+                method=method, route=route, status=str(status_code)
+            ).observe(time.perf_counter() - started)
+
+
+class PoolSampler:
+    """Copy SQLAlchemy pool usage into gauges every few seconds."""
+    
+    INTERVAL = 5.0
+    
+    def __init__(self):
+        self._pool: Optional[Any] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def sample(self) -> None:
+        """Update the pool gauges now."""
+        if self._pool is None:
+            return
+        DB_POOL_SIZE.set(self._pool.size())
+        DB_POOL_CHECKED_OUT.set(self._pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(0, self._pool.overflow()))
+    
+    def start(self, pool: Any) -> None:
+        """Start sampling a pool in the background."""
+        self._pool = pool
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the sampling task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        """Sample until cancelled."""
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Database pool sampling failed: {e}")
+            await asyncio.sleep(self.INTERVAL)
+
+
+def instrument_celery() -> None:
+    """Record Celery task durations from the task signals."""
+    from celery import signals
+    
+    started: Dict[str, float] = {}
+    
+    def task_started(task_id: str = None, **kwargs: Any) -> None:
+        started[task_id] = time.perf_counter()
+    
+    def task_finished(task_id: str = None, task: Any = None, state: str = None, **kwargs: Any) -> None:
+        began = started.pop(task_id, None)
+        if began is None:
+            return
+        CELERY_TASK_SECONDS.labels(
+            task=getattr(task, "name", "unknown"), state=state or "UNKNOWN"
+        ).observe(time.perf_counter() - began)
+    
+    def process_exiting(**kwargs: Any) -> None:
+        mark_process_dead()
+    
+    signals.task_prerun.connect(task_started, weak=False)
+    signals.task_postrun.connect(task_finished, weak=False)
+    signals.worker_process_shutdown.connect(process_exiting, weak=False)
+
+
+# Global pool sampler instance
+db_pool_sampler = PoolSampler()
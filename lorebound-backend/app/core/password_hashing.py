@@ -0,0 +1,177 @@
+"""Password hashing in a dedicated thread pool, off the event loop."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .config import settings
+from .metrics import (
+    PASSWORD_HASH_QUEUE_SECONDS,
+    PASSWORD_HASH_SECONDS,
+    PASSWORD_HASHES_IN_FLIGHT,
+    PASSWORD_HASHES_QUEUED,
+)
+from .security import get_password_hash, verify_password
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PasswordHasher:
+    """
+    Run bcrypt in its own bounded thread pool.
+    
+    bcrypt releases the GIL while it works, so the pool size is the number of
+    hashes computed in parallel. Requests beyond that wait in the pool's queue
+    instead of blocking the event loop, and the wait is recorded in stats().
+    """
+    
+    BENCHMARK_PASSWORD = "lorebound-cost-benchmark"
+    
+    def __init__(
+        self,
+        max_workers: int = settings.password_hash_concurrency,
+        rounds: int = settings.bcrypt_rounds or settings.bcrypt_min_rounds
+    ):
+        self.max_workers = max_workers
+        self.rounds = rounds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._wait_seconds_total = 0.0
+        self._max_wait_seconds = 0.0
+        self._work_seconds_total = 0.0
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost factor."""
+        return await self._run(get_password_hash, password, self.rounds)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash."""
+        return await self._run(verify_password, plain_password, hashed_password)
+    
+    async def configure(self) -> int:
+        """
+        Settle the cost factor at startup.
+        
+        BCRYPT_ROUNDS pins it; otherwise it is benchmarked against
+        BCRYPT_TARGET_MS on this host.
+        """
+        if settings.bcrypt_rounds:
+            self.rounds = settings.bcrypt_rounds
+        else:
+            self.rounds = await self.calibrate(
+                settings.bcrypt_target_ms,
+                settings.bcrypt_min_rounds,
+                settings.bcrypt_max_rounds
+            )
+        return self.rounds
+    
+    async def calibrate(self, target_ms: float, min_rounds: int, max_rounds: int) -> int:
+        """Time one hash at min_rounds and pick the highest cost within target_ms."""
+        loop = asyncio.get_running_loop()
+        elapsed_ms = await loop.run_in_executor(self._get_executor(), self._benchmark, min_rounds)
+        
+        rounds = self.choose_rounds(elapsed_ms, target_ms, min_rounds, max_rounds)
+        logger.info(
+            f"bcrypt cost {rounds} selected: {elapsed_ms:.0f}ms at cost {min_rounds}, "
+            f"target {target_ms}ms"
+        )
+        return rounds
+    
+    @staticmethod
+    def choose_rounds(elapsed_ms: float, target_ms: float, min_rounds: int, max_rounds: int) -> int:
+        """
+        Pick a cost factor from a benchmark at min_rounds.
+        
+        Each extra round doubles the work, so the estimate for cost r is
+        elapsed_ms * 2 ** (r - min_rounds). Never goes below min_rounds.
+        """
+        rounds = min_rounds
+        while rounds < max_rounds and elapsed_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+            rounds += 1
+        return rounds
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queueing metrics of the hashing pool."""
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "queue_wait_seconds_total": round(self._wait_seconds_total, 6),
+                "queue_wait_seconds_max": round(self._max_wait_seconds, 6),
+                "hash_seconds_total": round(self._work_seconds_total, 6),
+            }
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the pool on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash"
+            )
+        return self._executor
+    
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a hashing call in the pool, accounting for the time spent queued."""
+        with self._lock:
+            self._queued += 1
+        PASSWORD_HASHES_QUEUED.inc()
+        
+        future = self._get_executor().submit(self._timed, func, time.monotonic(), *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A request that gave up while still queued never reaches _timed
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+                PASSWORD_HASHES_QUEUED.dec()
+            raise
+    
+    def _timed(self, func: Callable[..., Any], submitted: float, *args: Any) -> Any:
+        """Worker-thread wrapper recording queue wait and hashing time."""
+        started = time.monotonic()
+        wait = started - submitted
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+            self._wait_seconds_total += wait
+            self._max_wait_seconds = max(self._max_wait_seconds, wait)
+        PASSWORD_HASHES_QUEUED.dec()
+        PASSWORD_HASHES_IN_FLIGHT.inc()
+        PASSWORD_HASH_QUEUE_SECONDS.observe(wait)
+        
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._work_seconds_total += elapsed
+            PASSWORD_HASHES_IN_FLIGHT.dec()
+            PASSWORD_HASH_SECONDS.observe(elapsed)
+    
+    def _benchmark(self, rounds: int) -> float:
+        """Hash once at a cost factor and return the elapsed milliseconds."""
+        started = time.perf_counter()
+        get_password_hash(self.BENCHMARK_PASSWORD, rounds)
+        return (time.perf_counter() - started) * 1000
+
+
+# Global hasher instance
+password_hasher = PasswordHasher()
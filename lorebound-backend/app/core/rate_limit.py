@@ -0,0 +1,226 @@
+"""Cost-weighted rate limiting middleware backed by a Redis GCRA script."""
+
+import json
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+from .redis_client import RedisClient, redis_client
+from .token_cache import verified_token_cache
+
+logger = logging.getLogger(__name__)
+
+PATH_PARAM_PATTERN = re.compile(r"\{[^/]+\}")
+
+
+class RateLimitRule(BaseModel):
+    """
+    Rate limit of one router.
+    
+    Every caller gets `per_minute` units per minute on the router; routes listed
+    in `route_costs` ("METHOD /path" relative to the router prefix, path
+    parameters allowed) charge more than one unit per request.
+    """
+    
+    name: str
+    per_minute: int = Field(default_factory=lambda: settings.rate_limit_per_minute)
+    route_costs: Dict[str, int] = Field(default_factory=dict)
+    
+    model_config = ConfigDict(frozen=True)
+    
+    def compile_costs(self) -> List[Tuple[str, Pattern[str], int]]:
+        """Turn route cost keys into (method, path regex, cost) matchers."""
+        matchers = []
+        for route, cost in self.route_costs.items():
+            method, path = route.split(" ", 1)
+            regex = "[^/]+".join(re.escape(part) for part in PATH_PARAM_PATTERN.split(path))
+            matchers.append((method.upper(), re.compile(f"^{regex}$"), cost))
+        return matchers
+
+
+class LocalPrecheck:
+    """
+    Per-process allowance that spares Redis for callers clearly under their limit.
+    
+    The first `fraction` of a caller's units in each minute are admitted locally
+    and charged to Redis together with the next request that goes there, so
+    the shared limit can be exceeded by at most that fraction per process.
+    Callers Redis has rejected are rejected locally until their Retry-After.
+    """
+    
+    WINDOW_SECONDS = 60
+    MAX_CALLERS = 10000
+    
+    def __init__(self, fraction: float = 0.1):
+        self.fraction = fraction
+        # key -> [window start, locally admitted units, units not yet charged, blocked until]
+        self._callers: "OrderedDict[str, List[float]]" = OrderedDict()
+    
+    def admit(self, key: str, cost: int, limit: int) -> Optional[float]:
+        """
+        Try to decide a request without Redis.
+        
+        Returns:
+            0 if admitted locally, seconds to wait if locally blocked, or None
+            if Redis has to decide
+        """
+        now = time.monotonic()
+        state = self._state(key, now)
+        
+        if state[3] > now:
+            return state[3] - now
+        
+        if state[1] + cost <= limit * self.fraction:
+            state[1] += cost
+            state[2] += cost
+            return 0
+        return None
+    
+    def pending(self, key: str) -> int:
+        """Get the units admitted locally that Redis hasn't been charged for."""
+        state = self._callers.get(key)
+        return int(state[2]) if state is not None else 0
+    
+    def charged(self, key: str, units: int) -> None:
+        """Record that Redis admitted a charge including `units` pending units."""
+        state = self._callers.get(key)
+        if state is not None:
+            state[2] = max(0, state[2] - units)
+    
+    def block(self, key: str, seconds: float) -> None:
+        """Reject a caller locally until Redis would admit it again."""
+        self._state(key, time.monotonic())[3] = time.monotonic() + seconds
+    
+    def _state(self, key: str, now: float) -> List[float]:
+        """Get a caller's state for the current window."""
+        state = self._callers.get(key)
+        if state is None or now - state[0] >= self.WINDOW_SECONDS:
+            blocked_until = state[3] if state else 0.0
+            state = [now, 0, 0, blocked_until]
+            self._callers[key] = state
+        self._callers.move_to_end(key)
+        
+        if len(self._callers) > self.MAX_CALLERS:
+            self._callers.popitem(last=False)
+        return state
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing per-router limits for each user or client IP.
+    
+    Authenticated requests are limited per user and anonymous ones per IP.
+    Over-limit requests get 429 with a Retry-After header. If Redis is
+    unavailable requests are let through.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Dict[str, RateLimitRule],
+        default_rule: Optional[RateLimitRule] = None,
+        path_prefix: str = "/v1",
+        redis: RedisClient = redis_client,
+        precheck: Optional[LocalPrecheck] = None
+    ):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.default_rule = default_rule or RateLimitRule(name="default")
+        self.redis = redis
+        self.precheck = precheck or LocalPrecheck()
+        # Longest prefix first so nested prefixes match their own rule
+        self.rules = sorted(
+            ((prefix, rule, rule.compile_costs()) for prefix, rule in rules.items()),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        
+        rule, cost = self._match(scope["method"], scope["path"])
+        key = f"rate_limit:{rule.name}:{self._identity(scope)}"
+        
+        retry_after = await self._check(key, rule.per_minute, cost)
+        if retry_after:
+            await self._reject(send, retry_after)
+            return
+        
+        await self.app(scope, receive, send)
+    
+    def _match(self, method: str, path: str) -> Tuple[RateLimitRule, int]:
+        """Find the rule of the router serving a path and the cost of the route."""
+        relative = path[len(self.path_prefix):]
+        for prefix, rule, matchers in self.rules:
+            if relative == prefix or relative.startswith(prefix + "/"):
+                route_path = relative[len(prefix):] or "/"
+                for route_method, pattern, cost in matchers:
+                    if route_method == method and pattern.match(route_path):
+                        return rule, cost
+                return rule, 1
+        return self.default_rule, 1
+    
+    def _identity(self, scope: Scope) -> str:
+        """Identify the caller by verified user ID, falling back to the client IP."""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    try:
+                        # Cached after the first request with a token
+                        user_id = verified_token_cache.verify(token).get("user_id")
+                        if user_id:
+                            return f"user:{user_id}"
+                    except Exception:
+                        pass
+                break
+        
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+    
+    async def _check(self, key: str, limit: int, cost: int) -> float:
+        """Charge a request, returning 0 if allowed or the seconds to wait."""
+        local = self.precheck.admit(key, cost, limit)
+        if local is not None:
+            return local
+        
+        # Pending units stay pending until Redis admits them: a rejected
+        # request isn't charged, and a failed call may not have been
+        pending = self.precheck.pending(key)
+        try:
+            allowed, retry_after_ms, _ = await self.redis.rate_limit(
+                key, limit, 60_000, cost + pending
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit check failed, allowing request: {e}")
+            return 0
+        
+        if allowed:
+            self.precheck.charged(key, pending)
+            return 0
+        
+        self.precheck.block(key, retry_after_ms / 1000)
+        return retry_after_ms / 1000
+    
+    async def _reject(self, send: Send, retry_after: float) -> None:
+        """Send a 429 response."""
+        body = json.dumps({"detail": "Rate limit exceeded, try again later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,28 +1,122 @@
 """Redis client for caching and pub/sub."""
 
 import json
-from typing import Optional, Any
-from redis.asyncio import Redis
+import time
+from typing import Optional, Any, Dict, List, Tuple
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline, PubSub
 from contextlib import asynccontextmanager
 
 from .config import settings
+from .metrics import observe_redis_command
+
+
+# Delete the lock only when the caller still owns it, so a lock that expired and
+# was re-acquired by another worker is never released by the previous holder
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Rotation with a grace window: KEYS[1] holds the current value and KEYS[2] the
+# value it replaced, for ARGV[4] ms. Returns {1, value} when the current value
+# or, within the grace window, the replaced one was presented, {0} when another
+# value was presented and {-1} when KEYS[1] doesn't exist.
+ROTATE_SCRIPT = """
+local current = redis.call("get", KEYS[1])
+if not current then
+    return {-1}
+end
+if current == ARGV[1] then
+    redis.call("set", KEYS[1], ARGV[2], "ex", ARGV[3])
+    redis.call("set", KEYS[2], ARGV[1], "px", ARGV[4])
+    return {1, ARGV[2]}
+end
+if redis.call("get", KEYS[2]) == ARGV[1] then
+    return {1, current}
+end
+return {0}
+"""
+
+# GCRA rate limiting: the key holds the theoretical arrival time (TAT) in ms.
+# A request of `cost` units is allowed when it would not push the TAT more than
+# the burst window ahead of now. Returns {allowed, retry_after_ms, remaining}.
+RATE_LIMIT_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call("time")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local tat = tonumber(redis.call("get", KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval * cost
+local allow_at = new_tat - burst
+if allow_at > now then
+    return {0, allow_at - now, 0}
+end
+
+-- Whole milliseconds so the TAT survives Lua's number-to-string conversion
+redis.call("set", KEYS[1], math.ceil(new_tat), "px", math.ceil(new_tat - now))
+return {1, 0, math.floor((burst - (new_tat - now)) / interval)}
+"""
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline recording the latency of each round trip."""
+    
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            observe_redis_command("MULTI" if self.is_transaction else "PIPELINE", time.perf_counter() - started)
+
+
+class InstrumentedRedis(Redis):
+    """Redis connection recording the latency of every command by name."""
+    
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            observe_redis_command(str(args[0]).upper(), time.perf_counter() - started)
+    
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
 
 
 class RedisClient:
-    """Redis client wrapper for async operations."""
+    """
+    Redis client wrapper for async operations.
+    
+    Commands wait up to REDIS_POOL_TIMEOUT_SECONDS for a free pooled
+    connection instead of failing as soon as the pool is exhausted.
+    """
     
-    def __init__(self):
+    def __init__(self, max_connections: Optional[int] = None):
         self._redis: Optional[Redis] = None
+        self.max_connections = max_connections
     
     async def connect(self) -> None:
         """Initialize Redis connection."""
         if not self._redis:
-            self._redis = Redis.from_url(
+            pool = BlockingConnectionPool.from_url(
                 settings.redis_url,
                 encoding="utf-8",
                 decode_responses=True,
-                max_connections=10,
+                max_connections=self.max_connections or settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout_seconds,
             )
+            self._redis = InstrumentedRedis.from_pool(pool)
     
     async def disconnect(self) -> None:
         """Close Redis connection."""
@@ -53,6 +147,14 @@ class RedisClient:
             await self.connect()
         await self._redis.delete(key)
     
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys in one round trip."""
+        if not self._redis:
+            await self.connect()
+        if not keys:
+            return 0
+        return await self._redis.delete(*keys)
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in Redis."""
         if not self._redis:
@@ -85,6 +187,178 @@ class RedisClient:
             await self.connect()
         return await self._redis.incrby(key, amount)
     
+    async def increment_many(
+        self,
+        keys: List[str],
+        expire_seconds: Optional[int] = None
+    ) -> List[int]:
+        """Increment several counters in one pipelined round trip."""
+        if not self._redis:
+            await self.connect()
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(key)
+            if expire_seconds:
+                pipe.expire(key, expire_seconds)
+        results = await pipe.execute()
+        
+        # Every other result is the EXPIRE reply when an expiry is requested
+        step = 2 if expire_seconds else 1
+        return results[::step]
+    
+    async def hash_get_all(self, key: str) -> Dict[str, str]:
+        """Get all fields of a hash."""
+        if not self._redis:
+            await self.connect()
+        return await self._redis.hgetall(key)
+    
+    async def hash_increment_many(
+        self,
+        updates: Dict[str, Dict[str, int]],
+        expire_seconds: Optional[int] = None
+    ) -> None:
+        """Increment fields of several hashes in one pipelined round trip."""
+        if not self._redis:
+            await self.connect()
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for key, increments in updates.items():
+            for field, amount in increments.items():
+                pipe.hincrby(key, field, amount)
+            if expire_seconds:
+                pipe.expire(key, expire_seconds)
+        await pipe.execute()
+    
+    async def replace_hash(
+        self,
+        key: str,
+        mapping: Dict[str, Any],
+        expire_seconds: Optional[int] = None
+    ) -> None:
+        """Atomically replace the whole content of a hash."""
+        if not self._redis:
+            await self.connect()
+        
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(key)
+        if mapping:
+            pipe.hset(key, mapping=mapping)
+            if expire_seconds:
+                pipe.expire(key, expire_seconds)
+        await pipe.execute()
+    
+    async def publish_many(self, messages: List[Tuple[str, str]]) -> None:
+        """Publish several (channel, message) pairs in one pipelined round trip."""
+        if not self._redis:
+            await self.connect()
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for channel, message in messages:
+            pipe.publish(channel, message)
+        await pipe.execute()
+    
+    async def pubsub(self) -> PubSub:
+        """Get a pub/sub handle on its own connection."""
+        if not self._redis:
+            await self.connect()
+        return self._redis.pubsub(ignore_subscribe_messages=True)
+    
+    async def sorted_set_add(
+        self,
+        key: str,
+        mapping: Dict[str, float],
+        expire_seconds: Optional[int] = None
+    ) -> None:
+        """Add or update members of a sorted set."""
+        if not self._redis:
+            await self.connect()
+        
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zadd(key, mapping)
+        if expire_seconds:
+            pipe.expire(key, expire_seconds)
+        await pipe.execute()
+    
+    async def sorted_set_range_by_score(
+        self,
+        key: str,
+        min_score: float,
+        max_score: float = float("inf")
+    ) -> List[Tuple[str, float]]:
+        """Get (member, score) pairs of a sorted set within a score range."""
+        if not self._redis:
+            await self.connect()
+        return await self._redis.zrangebyscore(key, min_score, max_score, withscores=True)
+    
+    async def sorted_set_remove_by_score(self, key: str, min_score: float, max_score: float) -> int:
+        """Remove members of a sorted set within a score range."""
+        if not self._redis:
+            await self.connect()
+        return await self._redis.zremrangebyscore(key, min_score, max_score)
+    
+    async def acquire_lock(self, key: str, token: str, ttl_ms: int) -> bool:
+        """Take a short-lived lock, returning False if someone else holds it."""
+        if not self._redis:
+            await self.connect()
+        return bool(await self._redis.set(key, token, nx=True, px=ttl_ms))
+    
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock only if it is still held with the given token."""
+        if not self._redis:
+            await self.connect()
+        return bool(await self._redis.eval(RELEASE_LOCK_SCRIPT, 1, key, token))
+    
+    async def rotate(
+        self,
+        key: str,
+        previous_key: str,
+        presented: str,
+        value: str,
+        expire_seconds: int,
+        grace_ms: int
+    ) -> Tuple[Optional[bool], Optional[str]]:
+        """
+        Atomically replace a key's value, still accepting the replaced value for a grace window.
+        
+        Returns:
+            (True, current value) if the current value, or the one it replaced
+            within the grace window, was presented; (False, None) if another
+            value was presented; (None, None) if the key doesn't exist
+        """
+        if not self._redis:
+            await self.connect()
+        
+        result = await self._redis.eval(
+            ROTATE_SCRIPT, 2, key, previous_key, presented, value, expire_seconds, grace_ms
+        )
+        status = int(result[0])
+        if status == -1:
+            return None, None
+        return (True, result[1]) if status == 1 else (False, None)
+    
+    async def rate_limit(
+        self,
+        key: str,
+        limit: int,
+        period_ms: int,
+        cost: int = 1
+    ) -> Tuple[bool, int, int]:
+        """
+        Charge `cost` units against a GCRA limit of `limit` units per period.
+        
+        Returns:
+            Tuple of (allowed, retry_after_ms, remaining units)
+        """
+        if not self._redis:
+            await self.connect()
+        
+        interval = period_ms / limit
+        allowed, retry_after_ms, remaining = await self._redis.eval(
+            RATE_LIMIT_SCRIPT, 1, key, interval, period_ms, cost
+        )
+        return bool(allowed), int(retry_after_ms), int(remaining)
+    
     async def expire(self, key: str, seconds: int) -> None:
         """Set expiration on existing key."""
         if not self._redis:
@@ -119,6 +393,11 @@ class RedisClient:
 # Global Redis client instance
 redis_client = RedisClient()
 
+# Pub/sub subscribers hold their connection for as long as they listen, so they
+# get a pool of their own and never starve request handlers
+PUBSUB_MAX_CONNECTIONS = 4
+pubsub_redis_client = RedisClient(max_connections=PUBSUB_MAX_CONNECTIONS)
+
 
 async def get_redis() -> RedisClient:
     """Dependency function to get Redis client."""
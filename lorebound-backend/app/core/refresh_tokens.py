@@ -0,0 +1,91 @@
+"""Refresh token families with rotation and reuse detection."""
+
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+
+from .config import settings
+from .redis_client import RedisClient, redis_client
+from .token_revocation import TokenRevocationList, token_revocation_list
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RefreshTokenStore:
+    """
+    Tracks the one valid refresh token of every sign-in session.
+    
+    Each sign-in starts a token family. Refreshing rotates the family to a new
+    token ID and invalidates the presented one; presenting a token that was
+    already rotated away means it leaked, so the whole family is revoked,
+    including the access tokens issued from it.
+    
+    The token rotated away last keeps refreshing for a few seconds, so a
+    client retrying a refresh whose response it never got isn't signed out.
+    """
+    
+    KEY_PREFIX = "refresh_family"
+    
+    def __init__(
+        self,
+        redis: RedisClient = redis_client,
+        revocations: TokenRevocationList = token_revocation_list
+    ):
+        self.redis = redis
+        self.revocations = revocations
+    
+    def _make_key(self, family_id: str) -> str:
+        """Generate Redis key for a token family."""
+        return f"{self.KEY_PREFIX}:{family_id}"
+    
+    def _make_previous_key(self, family_id: str) -> str:
+        """Generate Redis key for the token ID a family last rotated away."""
+        return f"{self._make_key(family_id)}:previous"
+    
+    async def start_family(self, user_id: UUID) -> Tuple[str, str]:
+        """
+        Start a token family for a new sign-in.
+        
+        Returns:
+            Tuple of (family ID, first token ID)
+        """
+        family_id = uuid4().hex
+        token_id = uuid4().hex
+        await self.redis.set(self._make_key(family_id), token_id, settings.refresh_token_ttl_seconds)
+        logger.debug(f"Started refresh token family {family_id} for user {user_id}")
+        return family_id, token_id
+    
+    async def rotate(self, family_id: str, token_id: str) -> Optional[str]:
+        """
+        Replace a family's current token ID with a new one.
+        
+        Returns:
+            The new token ID, or None if the presented token is no longer
+            valid; a reused token also revokes its family. Retrying with the
+            previous token within the grace window returns the current ID.
+        """
+        swapped, current_token_id = await self.redis.rotate(
+            self._make_key(family_id),
+            self._make_previous_key(family_id),
+            token_id,
+            uuid4().hex,
+            settings.refresh_token_ttl_seconds,
+            settings.refresh_token_reuse_grace_seconds * 1000
+        )
+        
+        if swapped:
+            return current_token_id
+        
+        if swapped is False:
+            logger.warning(f"Refresh token reuse detected, revoking family {family_id}")
+            await self.revoke_family(family_id)
+        return None
+    
+    async def revoke_family(self, family_id: str) -> None:
+        """Invalidate a family's refresh token and every access token issued from it."""
+        await self.redis.delete_many([self._make_key(family_id), self._make_previous_key(family_id)])
+        await self.revocations.revoke_token_id(family_id)
+
+
+# Global refresh token store instance
+refresh_token_store = RefreshTokenStore()
@@ -8,6 +8,7 @@ from typing import Optional, Dict, Any
 from uuid import UUID
 
 from .config import settings
+from .jwks import apple_jwks
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -32,8 +33,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
             return False
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password."""
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password, optionally with an explicit bcrypt cost factor."""
     try:
         # Ensure password is within bcrypt limits (72 bytes)
         password_bytes = password.encode('utf-8')
@@ -43,7 +44,7 @@ def get_password_hash(password: str) -> str:
         
         # Use a simple approach that bypasses bcrypt version detection issues
         import bcrypt
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=rounds) if rounds else bcrypt.gensalt()
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
         
@@ -60,15 +61,17 @@ def get_password_hash(password: str) -> str:
 def create_access_token(
     subject: str, 
     scopes: Optional[list[str]] = None,
-    user_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None,
+    family_id: Optional[str] = None
 ) -> str:
-    """Create JWT access token."""
+    """Create JWT access token, tied to the refresh token family it came from."""
     now = datetime.now(timezone.utc)
     expire = now + timedelta(seconds=settings.access_token_ttl_seconds)
     
     payload = {
         "sub": subject,
         "iat": now,
+        "iat_ms": int(now.timestamp() * 1000),
         "exp": expire,
         "type": "access"
     }
@@ -79,6 +82,9 @@ def create_access_token(
     if user_id:
         payload["user_id"] = str(user_id)
     
+    if family_id:
+        payload["fam"] = family_id
+    
     try:
         return jwt.encode(
             payload, 
@@ -90,14 +96,20 @@ def create_access_token(
         raise ValueError("Failed to create access token")
 
 
-def create_refresh_token(subject: str, user_id: Optional[UUID] = None) -> str:
-    """Create JWT refresh token."""
+def create_refresh_token(
+    subject: str,
+    user_id: Optional[UUID] = None,
+    family_id: Optional[str] = None,
+    token_id: Optional[str] = None
+) -> str:
+    """Create JWT refresh token as a member of a rotation family."""
     now = datetime.now(timezone.utc)
     expire = now + timedelta(seconds=settings.refresh_token_ttl_seconds)
     
     payload = {
         "sub": subject,
         "iat": now,
+        "iat_ms": int(now.timestamp() * 1000),
         "exp": expire,
         "type": "refresh"
     }
@@ -105,6 +117,12 @@ def create_refresh_token(subject: str, user_id: Optional[UUID] = None) -> str:
     if user_id:
         payload["user_id"] = str(user_id)
     
+    if family_id:
+        payload["fam"] = family_id
+    
+    if token_id:
+        payload["jti"] = token_id
+    
     try:
         return jwt.encode(
             payload, 
@@ -116,12 +134,16 @@ def create_refresh_token(subject: str, user_id: Optional[UUID] = None) -> str:
         raise ValueError("Failed to create refresh token")
 
 
-def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
-    """Verify and decode JWT token."""
+def verify_token(
+    token: str,
+    token_type: str = "access",
+    public_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """Verify and decode JWT token, with the configured public key unless one is given."""
     try:
         payload = jwt.decode(
             token,
-            settings.jwt_public_key,
+            public_key or settings.jwt_public_key,
             algorithms=[settings.jwt_algorithm]
         )
         
@@ -172,13 +194,6 @@ async def verify_apple_token(identity_token: str) -> Dict[str, Any]:
                 "email_verified": True
             }
         
-        # Fetch Apple's public keys
-        jwks_url = "https://appleid.apple.com/auth/keys"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(jwks_url)
-            response.raise_for_status()
-            jwks = response.json()
-        
         # Decode token header to get key ID
         unverified_header = jwt.get_unverified_header(identity_token)
         key_id = unverified_header.get("kid")
@@ -186,12 +201,8 @@ async def verify_apple_token(identity_token: str) -> Dict[str, Any]:
         if not key_id:
             raise ValueError("Token header missing key ID")
         
-        # Find the matching public key
-        public_key = None
-        for key in jwks.get("keys", []):
-            if key.get("kid") == key_id:
-                public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key)
-                break
+        # Find the matching public key among Apple's cached keys
+        public_key = await apple_jwks.get_key(key_id)
         
         if not public_key:
             raise ValueError("Unable to find matching public key")
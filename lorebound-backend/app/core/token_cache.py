@@ -0,0 +1,111 @@
+"""In-process cache of verified access token claims."""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .config import settings
+from .metrics import record_cache
+from .security import verify_token
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of decoded access token claims keyed by the token's digest.
+    
+    A token seen before is trusted until its `exp` without repeating the RS256
+    signature check. Entries belong to the public key they were verified with,
+    so rotating the key drops them all. Revocation is checked by the caller on
+    every request, cached or not.
+    
+    The public key is read on first use and kept in memory. The key file's
+    mtime is checked every KEY_CHECK_INTERVAL seconds; the file is only read
+    again when it changed or on reload_key().
+    """
+    
+    NAMESPACE = "verified_token"
+    KEY_CHECK_INTERVAL = 30.0
+    
+    def __init__(self, max_size: int = settings.token_cache_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._public_key: Optional[str] = None
+        self._key_fingerprint: Optional[bytes] = None
+        self._key_mtime: Optional[int] = None
+        self._key_checked_at = 0.0
+    
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify an access token, reusing the claims of an earlier verification.
+        
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid or expired
+        """
+        public_key = self._current_key()
+        
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        claims = self._entries.get(digest)
+        if claims is not None:
+            if claims["exp"] > time.time():
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                record_cache(self.NAMESPACE, hit=True)
+                return claims
+            del self._entries[digest]
+        
+        self.misses += 1
+        record_cache(self.NAMESPACE, hit=False)
+        claims = verify_token(token, token_type="access", public_key=public_key)
+        
+        # Tokens without an expiry would never leave the cache
+        if "exp" in claims:
+            self._entries[digest] = claims
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        
+        return claims
+    
+    def reload_key(self) -> None:
+        """Read the public key again, dropping the cached claims if it changed."""
+        public_key = settings.jwt_public_key
+        fingerprint = hashlib.sha256(public_key.encode("utf-8")).digest()
+        if fingerprint != self._key_fingerprint:
+            # Claims verified with a previous key must be checked again
+            self._entries.clear()
+            self._key_fingerprint = fingerprint
+        
+        self._public_key = public_key
+        self._key_mtime = self._read_key_mtime()
+        self._key_checked_at = time.monotonic()
+    
+    def _current_key(self) -> str:
+        """Get the loaded public key, reloading it when the key file changed."""
+        if self._public_key is None:
+            self.reload_key()
+        elif time.monotonic() - self._key_checked_at >= self.KEY_CHECK_INTERVAL:
+            self._key_checked_at = time.monotonic()
+            if self._read_key_mtime() != self._key_mtime:
+                self.reload_key()
+        return self._public_key
+    
+    def _read_key_mtime(self) -> Optional[int]:
+        """Modification time of the key file, None without one (e.g. a generated dev key)."""
+        try:
+            return os.stat(settings.jwt_public_key_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def clear(self) -> None:
+        """Drop every cached token."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache instance
+verified_token_cache = VerifiedTokenCache()
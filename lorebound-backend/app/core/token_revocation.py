@@ -0,0 +1,216 @@
+"""Token revocation shared across processes."""
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from .config import settings
+from .redis_client import RedisClient, pubsub_redis_client, redis_client
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    
+    Membership tests never miss an added item and wrongly report a missing one
+    with about `false_positive_rate` probability while at most `capacity`
+    items have been added.
+    """
+    
+    def __init__(self, capacity: int, false_positive_rate: float = 1e-6):
+        self.capacity = max(capacity, 1)
+        self.size = math.ceil(-self.capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def add(self, item: str) -> None:
+        """Add an item."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    def _positions(self, item: str) -> Iterable[int]:
+        """Bit positions of an item, derived from one digest by double hashing."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+
+class TokenRevocationList:
+    """
+    Token revocations held in memory by every process.
+    
+    Two kinds of revocation are tracked:
+    
+    - Per-user cutoffs: revoking a user's tokens rejects every token issued to
+      the user before that millisecond, so tokens from a sign-in right after
+      the revocation stay valid.
+    - Revoked token IDs (refresh token families): kept in a Bloom filter, so
+      checking a token is a few bit tests whatever the number of revocations.
+      A false positive, about one in a million, only forces a new sign-in.
+    
+    Both are stored in Redis sorted sets and published, so checks never need a
+    Redis round trip.
+    """
+    
+    KEY = "token_revocations"
+    IDS_KEY = "revoked_token_ids"
+    CHANNEL = "token_revocations"
+    RECONNECT_DELAY = 1.0
+    # Cutoffs used to be stored in seconds; every millisecond cutoff is larger
+    LEGACY_CUTOFF_MAX = 10 ** 12
+    
+    def __init__(self, redis: RedisClient = redis_client, subscriber: RedisClient = pubsub_redis_client):
+        self.redis = redis
+        self.subscriber = subscriber
+        self._revoked_before: Dict[str, int] = {}
+        # A new filter is appended whenever the last one is full
+        self._revoked_ids: List[BloomFilter] = [BloomFilter(settings.token_revocation_filter_size)]
+        self._consumer: Optional[asyncio.Task] = None
+    
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        """Check whether a decoded token was revoked by ID or by its user's cutoff."""
+        family = claims.get("fam")
+        if family is not None and any(family in revoked for revoked in self._revoked_ids):
+            return True
+        
+        cutoff = self._revoked_before.get(claims.get("user_id"))
+        return cutoff is not None and self._issued_at_ms(claims) < cutoff
+    
+    async def revoke_user(self, user_id: UUID) -> None:
+        """Revoke every token issued to a user so far, in all processes."""
+        user_key = str(user_id)
+        revoked_before = time.time_ns() // 1_000_000
+        
+        await self.redis.sorted_set_add(self.KEY, {user_key: revoked_before})
+        await self.redis.publish_many([
+            (self.CHANNEL, json.dumps({"user_id": user_key, "revoked_before": revoked_before}))
+        ])
+        self._apply(user_key, revoked_before)
+    
+    async def revoke_token_id(self, token_id: str) -> None:
+        """Revoke every token carrying an ID, in all processes."""
+        # No token carrying the ID outlives a refresh token issued now
+        expires_at = int(time.time()) + settings.refresh_token_ttl_seconds
+        
+        await self.redis.sorted_set_add(self.IDS_KEY, {token_id: expires_at})
+        await self.redis.publish_many([
+            (self.CHANNEL, json.dumps({"token_id": token_id}))
+        ])
+        self._apply_token_id(token_id)
+    
+    def start(self) -> None:
+        """Start following revocations published by other processes."""
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self._consume())
+    
+    async def stop(self) -> None:
+        """Stop the consumer task."""
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+    
+    @staticmethod
+    def _issued_at_ms(claims: Dict[str, Any]) -> int:
+        """Issue time of a token in milliseconds, from older tokens' seconds if needed."""
+        if "iat_ms" in claims:
+            return int(claims["iat_ms"])
+        return int(claims.get("iat", 0)) * 1000
+    
+    @classmethod
+    def _cutoff_ms(cls, revoked_before: float) -> int:
+        """Cutoff in milliseconds, converting one stored in seconds."""
+        if revoked_before < cls.LEGACY_CUTOFF_MAX:
+            # A seconds cutoff rejected tokens issued during that second too
+            return (int(revoked_before) + 1) * 1000
+        return int(revoked_before)
+    
+    def _apply(self, user_id: str, revoked_before: int) -> None:
+        """Record a cutoff, never moving an existing one backwards."""
+        self._revoked_before[user_id] = max(self._revoked_before.get(user_id, 0), revoked_before)
+    
+    def _apply_token_id(self, token_id: str) -> None:
+        """Add a revoked ID to the filter, once; it also arrives back over pub/sub."""
+        if any(token_id in revoked for revoked in self._revoked_ids):
+            return
+        if self._revoked_ids[-1].count >= self._revoked_ids[-1].capacity:
+            self._revoked_ids.append(BloomFilter(settings.token_revocation_filter_size))
+        self._revoked_ids[-1].add(token_id)
+    
+    async def _load(self) -> None:
+        """Replace the in-memory revocations with the ones still relevant in Redis."""
+        now = int(time.time())
+        # Every token issued before this horizon has expired on its own
+        horizon = now - settings.refresh_token_ttl_seconds
+        await self.redis.sorted_set_remove_by_score(self.KEY, 0, horizon)
+        await self.redis.sorted_set_remove_by_score(self.KEY, self.LEGACY_CUTOFF_MAX, horizon * 1000)
+        await self.redis.sorted_set_remove_by_score(self.IDS_KEY, 0, now)
+        
+        entries = await self.redis.sorted_set_range_by_score(self.KEY, horizon)
+        token_ids = await self.redis.sorted_set_range_by_score(self.IDS_KEY, now)
+        
+        revoked_ids = BloomFilter(max(settings.token_revocation_filter_size, 2 * len(token_ids)))
+        for token_id, _ in token_ids:
+            revoked_ids.add(token_id)
+        
+        self._revoked_before = {user_id: self._cutoff_ms(revoked_before) for user_id, revoked_before in entries}
+        self._revoked_ids = [revoked_ids]
+        logger.info(
+            f"Loaded {len(self._revoked_before)} user revocations and "
+            f"{len(token_ids)} revoked token IDs"
+        )
+    
+    async def _consume(self) -> None:
+        """Follow the revocation channel, reloading from Redis after every (re)connect."""
+        while True:
+            pubsub = None
+            try:
+                pubsub = await self.subscriber.pubsub()
+                await pubsub.subscribe(self.CHANNEL)
+                # Subscribe first so nothing published during the load is missed
+                await self._load()
+                
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    
+                    try:
+                        data = json.loads(message["data"])
+                        if "token_id" in data:
+                            self._apply_token_id(str(data["token_id"]))
+                        else:
+                            self._apply(data["user_id"], self._cutoff_ms(int(data["revoked_before"])))
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                        logger.warning("Dropping malformed token revocation message")
+            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Token revocation consumer error, reconnecting: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.reset()
+                    except Exception:
+                        pass
+
+
+# Global revocation list instance
+token_revocation_list = TokenRevocationList()
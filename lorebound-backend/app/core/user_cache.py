@@ -0,0 +1,113 @@
+"""Two-tier cache of authenticated user principals."""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Optional, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from .metrics import record_cache
+from .redis_client import RedisClient, redis_client
+from ..core.logging import get_logger
+from ..domain.enums import UserStatus
+
+logger = get_logger(__name__)
+
+
+class UserPrincipal(BaseModel):
+    """The fields of an authenticated user that request handlers read."""
+    
+    id: UUID
+    status: UserStatus
+    email: Optional[str] = None
+    apple_sub: Optional[str] = None
+    handle: Optional[str] = None
+    created_at: datetime
+    last_login_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class UserPrincipalCache:
+    """
+    User principals cached in process, in front of Redis, in front of Postgres.
+    
+    The in-process tier absorbs bursts from one client without a Redis round
+    trip; Redis shares principals between workers. Invalidation clears Redis
+    and the local tier of the invalidating process, so other processes may
+    serve a changed user for at most LOCAL_TTL seconds.
+    """
+    
+    KEY_PREFIX = "user_principal"
+    REDIS_TTL = 60
+    LOCAL_TTL = 5
+    LOCAL_MAX_SIZE = 10000
+    
+    def __init__(self, redis: RedisClient = redis_client):
+        self.redis = redis
+        self._local: "OrderedDict[UUID, Tuple[float, UserPrincipal]]" = OrderedDict()
+    
+    def _make_key(self, user_id: UUID) -> str:
+        """Generate Redis key for a user principal."""
+        return f"{self.KEY_PREFIX}:{user_id}"
+    
+    async def get(
+        self,
+        user_id: UUID,
+        load: Callable[[], Awaitable[Optional[UserPrincipal]]]
+    ) -> Optional[UserPrincipal]:
+        """Get a principal from the nearest tier, loading it from the database on a miss."""
+        cached = self._local.get(user_id)
+        if cached is not None:
+            expires_at, principal = cached
+            if expires_at > time.monotonic():
+                self._local.move_to_end(user_id)
+                record_cache(self.KEY_PREFIX, hit=True)
+                return principal
+            del self._local[user_id]
+        
+        try:
+            data = await self.redis.get_json(self._make_key(user_id))
+        except Exception as e:
+            # Redis is an optimization here; fall through to the database
+            logger.warning(f"User principal cache read failed: {e}")
+            data = None
+        
+        record_cache(self.KEY_PREFIX, hit=data is not None)
+        if data is not None:
+            principal = UserPrincipal.model_validate(data)
+        else:
+            principal = await load()
+            if principal is None:
+                return None
+            
+            try:
+                await self.redis.set_json(
+                    self._make_key(user_id), principal.model_dump(mode="json"), self.REDIS_TTL
+                )
+            except Exception as e:
+                logger.warning(f"User principal cache write failed: {e}")
+        
+        self._store_local(principal)
+        return principal
+    
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's principal after its status or profile changed."""
+        self._local.pop(user_id, None)
+        try:
+            await self.redis.delete(self._make_key(user_id))
+        except Exception as e:
+            logger.warning(f"User principal cache invalidation failed: {e}")
+    
+    def _store_local(self, principal: UserPrincipal) -> None:
+        """Keep a principal in process for LOCAL_TTL seconds."""
+        self._local[principal.id] = (time.monotonic() + self.LOCAL_TTL, principal)
+        self._local.move_to_end(principal.id)
+        if len(self._local) > self.LOCAL_MAX_SIZE:
+            self._local.popitem(last=False)
+
+
+# Global cache instance
+user_principal_cache = UserPrincipalCache()
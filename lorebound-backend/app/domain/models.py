@@ -1,12 +1,12 @@
 """Domain models and database entities."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
-    Boolean, DateTime, Integer, String, Text, JSON, ARRAY,
-    ForeignKey, Index, UniqueConstraint
+    Boolean, Date, DateTime, Integer, BigInteger, String, Text, JSON, ARRAY,
+    ForeignKey, Index, UniqueConstraint, false
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import DeclarativeBase
@@ -56,6 +56,24 @@ class Profile(Base):
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="profile")
+    
+    __table_args__ = (
+        # Prefix lookups of numbered handle variants
+        Index("idx_profiles_handle_pattern", handle, postgresql_ops={"handle": "varchar_pattern_ops"}),
+    )
+
+
+class Follow(Base):
+    """One-way follow relation between players; the friends leaderboard ranks followed players."""
+    __tablename__ = "follows"
+    
+    follower_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    followee_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("idx_follows_followee", followee_id),
+    )
 
 
 class Item(Base):
@@ -240,6 +258,39 @@ class Score(Base):
     )
 
 
+class UserDailyScore(Base):
+    """Per-user score rollup of one board for one UTC day, maintained on every score write."""
+    __tablename__ = "user_daily_scores"
+    
+    board: Mapped[str] = mapped_column(String(50), primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_score: Mapped[int] = mapped_column(BigInteger, default=0)
+    run_count: Mapped[int] = mapped_column(Integer, default=0)
+    best_score: Mapped[int] = mapped_column(Integer, default=0)
+    last_played: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        Index("idx_user_daily_scores_board_day", board, day),
+    )
+
+
+class UserScoreTotal(Base):
+    """All-time per-user score totals of one board, maintained on every score write."""
+    __tablename__ = "user_score_totals"
+    
+    board: Mapped[str] = mapped_column(String(50), primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    total_score: Mapped[int] = mapped_column(BigInteger, default=0)
+    run_count: Mapped[int] = mapped_column(Integer, default=0)
+    best_score: Mapped[int] = mapped_column(Integer, default=0)
+    last_played: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        Index("idx_user_score_totals_board_total", board, total_score.desc()),
+    )
+
+
 class LeaderboardSnapshot(Base):
     """Leaderboard snapshot model."""
     __tablename__ = "leaderboard_snapshots"
@@ -248,10 +299,16 @@ class LeaderboardSnapshot(Base):
     scope: Mapped[LeaderboardScope] = mapped_column(String(20))
     period_key: Mapped[str] = mapped_column(String(50))
     payload: Mapped[dict] = mapped_column(JSON)
+    # Frozen snapshots archive a finished period and are never rewritten
+    is_frozen: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     
     __table_args__ = (
         Index("idx_leaderboard_snapshots_scope_period", scope, period_key),
+        Index(
+            "idx_leaderboard_snapshots_frozen", scope, period_key,
+            unique=True, postgresql_where=is_frozen
+        ),
     )
 
 
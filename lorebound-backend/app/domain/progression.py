@@ -0,0 +1,59 @@
+"""Player level curve."""
+
+from bisect import bisect_right
+from itertools import pairwise
+from typing import List, Sequence
+
+from pydantic import BaseModel, ConfigDict
+
+MAX_LEVEL = 100
+XP_PER_LEVEL = 1000
+
+
+class LevelCurve:
+    """
+    Total XP needed for each level, precomputed once.
+    
+    The thresholds are the lower XP bound of levels 1..max_level, so the level
+    for an XP total is the number of thresholds at or below it.
+    """
+    
+    def __init__(self, thresholds: Sequence[int]):
+        if not thresholds or thresholds[0] != 0:
+            raise ValueError("Level 1 must start at 0 XP")
+        if any(lower >= upper for lower, upper in pairwise(thresholds)):
+            raise ValueError("Level thresholds must be strictly increasing")
+        self.thresholds = tuple(thresholds)
+    
+    @classmethod
+    def linear(cls, xp_per_level: int = XP_PER_LEVEL, max_level: int = MAX_LEVEL) -> "LevelCurve":
+        """Curve with the same XP needed for every level."""
+        return cls([level * xp_per_level for level in range(max_level)])
+    
+    @property
+    def max_level(self) -> int:
+        """Highest reachable level."""
+        return len(self.thresholds)
+    
+    def level_for(self, xp: int) -> int:
+        """Get the level of an XP total."""
+        return max(1, bisect_right(self.thresholds, xp))
+
+
+class LevelProgress(BaseModel):
+    """A profile's level and XP after gaining XP."""
+    
+    xp: int
+    level: int
+    previous_level: int
+    
+    model_config = ConfigDict(frozen=True)
+    
+    @property
+    def levels_gained(self) -> List[int]:
+        """Levels reached by this XP gain, in order."""
+        return list(range(self.previous_level + 1, self.level + 1))
+
+
+# Global level curve instance
+level_curve = LevelCurve.linear()
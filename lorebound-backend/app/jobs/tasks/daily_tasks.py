@@ -35,14 +35,14 @@ def refresh_question_pool(self, category=None, batch_size=10):
     Batch size is kept small (10) to respect rate limiting.
     """
     import asyncio
-    from ...repositories.base import AsyncSessionLocal
+    from ...repositories.base import task_session
     from ...repositories.content_repo import ContentRepository
     from ...services.content_service import ContentService
     from ...services.trivia_api_client import TriviaAPIClient
     from ...core.config import settings
     
     async def _fetch_questions():
-        async with AsyncSessionLocal() as session:
+        async with task_session() as session:
             try:
                 content_repo = ContentRepository(session)
                 trivia_client = TriviaAPIClient()
@@ -10,23 +10,119 @@ logger = logging.getLogger(__name__)
 
 @celery_app.task(bind=True, retry_kwargs={"max_retries": 3})
 def update_leaderboard_snapshots(self):
-    """Update leaderboard snapshots for performance."""
+    """
+    Materialize the current period of every leaderboard scope.
+    Player requests read these snapshots while the live cache is cold,
+    so the heavy aggregate only ever runs here.
+    """
+    import asyncio
+    from ...repositories.base import task_session
+    from ...core.redis_client import redis_context
+    from ...services.leaderboard_service import LeaderboardService
+    
+    async def _materialize():
+        async with task_session() as session, redis_context() as redis:
+            try:
+                leaderboard_service = LeaderboardService(session, redis)
+                materialized = await leaderboard_service.materialize_snapshots()
+                await session.commit()
+                return materialized
+                
+            except Exception:
+                await session.rollback()
+                raise
+    
     try:
         logger.info("Updating leaderboard snapshots...")
         
-        # TODO: Implement leaderboard snapshot updates
-        # This would use the LeaderboardService to create/update snapshots
+        materialized = asyncio.run(_materialize())
         
         timestamp = datetime.now(timezone.utc)
-        logger.info(f"Leaderboard snapshots updated at {timestamp}")
+        logger.info(f"Leaderboard snapshots updated at {timestamp}: {', '.join(materialized)}")
         
-        return {"status": "success", "updated_at": timestamp.isoformat()}
+        return {
+            "status": "success",
+            "updated_at": timestamp.isoformat(),
+            "snapshots": materialized
+        }
         
     except Exception as exc:
         logger.error(f"Leaderboard snapshot update failed: {exc}")
         raise self.retry(exc=exc, countdown=30)
 
 
+@celery_app.task(bind=True, retry_kwargs={"max_retries": 3})
+def rollover_leaderboard_periods(self):
+    """
+    Freeze finished daily and weekly periods into immutable archives and
+    drop their live ranking structures. Already frozen periods are skipped,
+    so the task can run often.
+    """
+    import asyncio
+    from ...repositories.base import task_session
+    from ...core.redis_client import redis_context
+    from ...services.leaderboard_service import LeaderboardService
+    
+    async def _rollover():
+        async with task_session() as session, redis_context() as redis:
+            try:
+                leaderboard_service = LeaderboardService(session, redis)
+                frozen = await leaderboard_service.rollover_periods()
+                await session.commit()
+                return frozen
+                
+            except Exception:
+                await session.rollback()
+                raise
+    
+    try:
+        frozen = asyncio.run(_rollover())
+        
+        if frozen:
+            logger.info(f"Leaderboard periods frozen: {', '.join(frozen)}")
+        
+        return {"status": "success", "frozen": frozen}
+        
+    except Exception as exc:
+        logger.error(f"Leaderboard period rollover failed: {exc}")
+        raise self.retry(exc=exc, countdown=60)
+
+
+@celery_app.task(bind=True)
+def backfill_score_rollups(self):
+    """
+    Rebuild the daily score rollups and all-time totals from raw scores.
+    Run once after deploying the rollup tables, or to repair drift.
+    """
+    import asyncio
+    from ...repositories.base import task_session
+    from ...repositories.leaderboard_repo import LeaderboardRepository
+    
+    async def _backfill():
+        async with task_session() as session:
+            try:
+                rows = await LeaderboardRepository(session).rebuild_score_rollups()
+                await session.commit()
+                return rows
+                
+            except Exception:
+                await session.rollback()
+                raise
+    
+    try:
+        logger.info("Backfilling score rollups...")
+        
+        rows = asyncio.run(_backfill())
+        
+        logger.info(f"Score rollups backfilled: {rows} daily rows written")
+        
+        return {"status": "success", "daily_rows": rows}
+        
+    except Exception as exc:
+        logger.error(f"Score rollup backfill failed: {exc}")
+        raise
+
+
 @celery_app.task(bind=True)
 def calculate_weekly_rankings(self):
     """Calculate weekly leaderboard rankings."""
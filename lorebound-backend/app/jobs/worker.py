@@ -1,8 +1,10 @@
 """Celery worker configuration and task definitions."""
 
 import logging
-from celery import Celery
+from celery import Celery, signals
+from prometheus_client import start_http_server
 from ..core.config import settings
+from ..core.metrics import instrument_celery, metrics_registry
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +65,12 @@ celery_app.conf.beat_schedule = {
     },
     "update-leaderboards": {
         "task": "app.jobs.tasks.leaderboard_tasks.update_leaderboard_snapshots",
-        "schedule": 60.0 * 15.0,  # Every 15 minutes
+        "schedule": 60.0,  # Every minute, snapshots back cold leaderboard reads
+        "options": {"queue": "leaderboard"}
+    },
+    "rollover-leaderboard-periods": {
+        "task": "app.jobs.tasks.leaderboard_tasks.rollover_leaderboard_periods",
+        "schedule": 300.0,  # Every 5 minutes, freezes periods shortly after they end
         "options": {"queue": "leaderboard"}
     },
     "cleanup-old-data": {
@@ -73,6 +80,18 @@ celery_app.conf.beat_schedule = {
     },
 }
 
+# Record task durations
+instrument_celery()
+
+
+@signals.worker_init.connect
+def start_metrics_server(**kwargs):
+    """Serve the worker's metrics, merged across its pool processes."""
+    if settings.celery_metrics_port:
+        start_http_server(settings.celery_metrics_port, registry=metrics_registry())
+        logger.info(f"Serving worker metrics on port {settings.celery_metrics_port}")
+
+
 @celery_app.task(bind=True)
 def debug_task(self):
     """Debug task for testing Celery worker."""
@@ -3,13 +3,21 @@
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from .core.config import settings
 from .core.logging import setup_logging, get_logger
-from .core.redis_client import redis_client
+from .core.redis_client import pubsub_redis_client, redis_client
+from .core.jwks import apple_jwks
+from .core.metrics import MetricsMiddleware, db_pool_sampler, mark_process_dead, render_metrics
+from .core.password_hashing import password_hasher
+from .core.rate_limit import RateLimitMiddleware
+from .core.token_revocation import token_revocation_list
+from .services.leaderboard_events import leaderboard_event_hub
 from .repositories.base import (
+    engine,
     wait_for_database, 
     close_database_connection,
     get_database_info,
@@ -53,14 +61,35 @@ async def lifespan(app: FastAPI):
         logger.warning(f"⚠️  Redis connection failed: {e}")
         # Don't fail startup if Redis is down - app can work without caching
     
+    # Follow token revocations from every process
+    token_revocation_list.start()
+    
+    # Keep Apple's signing keys warm so sign-ins never wait on appleid.apple.com
+    if settings.apple_client_id:
+        apple_jwks.start()
+    
+    # Export connection pool usage
+    db_pool_sampler.start(engine.pool)
+    
+    # Pick the bcrypt cost factor for this host
+    rounds = await password_hasher.configure()
+    logger.info(f"✅ Password hashing ready (bcrypt cost {rounds})")
+    
     logger.info("✅ Application startup complete")
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down LoreBound Backend...")
+    await leaderboard_event_hub.stop()
+    await token_revocation_list.stop()
+    await apple_jwks.stop()
+    password_hasher.shutdown()
+    await db_pool_sampler.stop()
     await close_database_connection()
     await redis_client.disconnect()
+    await pubsub_redis_client.disconnect()
+    mark_process_dead()
     logger.info("✅ Application shutdown complete")
 
 
@@ -80,6 +109,15 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
     
+    # Add rate limiting inside CORS so rejections still carry CORS headers
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules={
+            module.router.prefix: module.rate_limit
+            for module in (auth, content, runs)
+        },
+    )
+    
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -89,6 +127,9 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Time every request, including those rejected by the middleware above
+    app.add_middleware(MetricsMiddleware)
+    
     # Add custom exception handler for validation errors
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -224,14 +265,16 @@ def create_app() -> FastAPI:
             "jwt": {
                 "algorithm": settings.jwt_algorithm,
                 "keys_loaded": bool(settings.jwt_private_key and settings.jwt_public_key)
-            }
+            },
+            "password_hashing": password_hasher.stats()
         }
     
-    # Metrics endpoint placeholder
+    # Metrics endpoint
     @app.get("/metrics", tags=["monitoring"])
     async def metrics():
-        """Prometheus metrics endpoint."""
-        return {"metrics": "placeholder"}
+        """Prometheus metrics endpoint, merged across worker processes."""
+        db_pool_sampler.sample()
+        return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
     
     return app
 
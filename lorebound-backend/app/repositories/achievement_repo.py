@@ -0,0 +1,55 @@
+"""Achievement repository for unlocking user achievements."""
+
+from typing import List
+from uuid import UUID
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import JSON, DateTime, select, literal
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+
+from ..domain.models import Achievement, UserAchievement
+
+
+class AchievementRepository:
+    """Repository for achievement-related database operations."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def unlock_level_achievements(self, user_id: UUID, level: int) -> List[str]:
+        """
+        Unlock every achievement whose level criterion ({"level": n}) is reached.
+        
+        Returns the slugs of the achievements unlocked by this call.
+        """
+        reached = (
+            select(
+                literal(user_id, PG_UUID(as_uuid=True)),
+                Achievement.id,
+                literal({"level": level}, JSON),
+                literal(datetime.now(timezone.utc), DateTime(timezone=True))
+            )
+            .where(Achievement.criteria["level"].as_integer() <= level)
+        )
+        
+        statement = insert(UserAchievement).from_select(
+            ["user_id", "achievement_id", "progress", "unlocked_at"], reached
+        )
+        # Progress tracked before unlocking is kept; unlocked ones stay as they are
+        unlocked = (
+            statement
+            .on_conflict_do_update(
+                index_elements=[UserAchievement.user_id, UserAchievement.achievement_id],
+                set_={"unlocked_at": statement.excluded.unlocked_at},
+                where=UserAchievement.unlocked_at.is_(None)
+            )
+            .returning(UserAchievement.achievement_id)
+            .cte("unlocked")
+        )
+        
+        result = await self.session.execute(
+            select(Achievement.slug)
+            .join(unlocked, unlocked.c.achievement_id == Achievement.id)
+            .order_by(Achievement.slug)
+        )
+        return list(result.scalars().all())
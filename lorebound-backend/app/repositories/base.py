@@ -1,8 +1,10 @@
 """Database base configuration and session management."""
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 from typing import AsyncGenerator
+from contextlib import asynccontextmanager
 import asyncio
 
 from ..core.config import settings
@@ -43,6 +45,27 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def task_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a database session for a background job run with asyncio.run().
+    
+    Each run gets its own engine without pooling. Pooled asyncpg connections
+    are bound to the event loop that opened them, so they can't be reused by
+    the next run's loop.
+    """
+    task_engine = create_async_engine(
+        settings.database_url,
+        echo=settings.db_echo,
+        poolclass=NullPool,
+    )
+    try:
+        async with AsyncSession(task_engine, expire_on_commit=False, autoflush=False) as session:
+            yield session
+    finally:
+        await task_engine.dispose()
+
+
 async def test_database_connection() -> bool:
     """Test database connection."""
     try:
@@ -1,10 +1,11 @@
 """Inventory repository for item and equipment management."""
 
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, Set, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 
 from ..domain.models import Item, Inventory
@@ -14,9 +15,30 @@ from ..domain.enums import ItemSlot, ItemRarity
 class InventoryRepository:
     """Repository for inventory and item-related database operations."""
 
+    # Equipped for every new player
+    STARTER_ITEM_SLUGS = ["leather_cap", "travelers_tunic", "iron_sword", "wooden_shield"]
+
+    # Seeded items never change, so their IDs are looked up once per process
+    _starter_item_ids: Optional[List[UUID]] = None
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def get_starter_item_ids(self) -> List[UUID]:
+        """Get the IDs of the starter items, cached once all of them exist."""
+        if InventoryRepository._starter_item_ids is not None:
+            return InventoryRepository._starter_item_ids
+
+        result = await self.session.execute(
+            select(Item.id).where(Item.slug.in_(self.STARTER_ITEM_SLUGS))
+        )
+        item_ids = list(result.scalars().all())
+
+        # Don't cache a partially seeded catalog
+        if len(item_ids) == len(self.STARTER_ITEM_SLUGS):
+            InventoryRepository._starter_item_ids = item_ids
+        return item_ids
+
     # Item operations
     async def get_item_by_id(self, item_id: UUID) -> Optional[Item]:
         """Get item by ID."""
@@ -58,6 +80,28 @@ class InventoryRepository:
         return list(result.scalars().all())
 
     # Inventory operations
+    async def get_owned_item_ids(self, user_id: UUID) -> Set[UUID]:
+        """Get the IDs of the items a user owns, without loading the items."""
+        result = await self.session.execute(
+            select(Inventory.item_id).where(Inventory.user_id == user_id)
+        )
+        return set(result.scalars().all())
+
+    async def add_items_to_inventory(self, user_id: UUID, item_ids: List[UUID]) -> int:
+        """Add unequipped items to a user's inventory in one statement, skipping owned ones."""
+        if not item_ids:
+            return 0
+
+        result = await self.session.execute(
+            insert(Inventory)
+            .values([
+                {"user_id": user_id, "item_id": item_id, "equipped": False}
+                for item_id in item_ids
+            ])
+            .on_conflict_do_nothing(index_elements=[Inventory.user_id, Inventory.item_id])
+        )
+        return result.rowcount
+
     async def get_user_inventory(self, user_id: UUID) -> List[Inventory]:
         """Get all inventory items for a user."""
         result = await self.session.execute(
@@ -175,6 +219,79 @@ class InventoryRepository:
 
         return inventory_item.item
 
+    async def set_loadout(
+        self,
+        user_id: UUID,
+        loadout: Dict[ItemSlot, Optional[UUID]]
+    ) -> Optional[Tuple[Dict[ItemSlot, UUID], Set[ItemSlot]]]:
+        """
+        Equip items by slot (None empties a slot) with one statement.
+        
+        The update only applies if the user owns every requested item and each
+        fits its slot. Returns the resulting equipped items by slot and the
+        slots that changed, or None if the loadout was rejected.
+        """
+        from sqlalchemy import func, literal, or_, true, tuple_
+        
+        requested = {slot: item_id for slot, item_id in loadout.items() if item_id is not None}
+        item_ids = list(requested.values())
+        
+        # Number of requested items the user owns in the requested slot
+        owned_requested = (
+            select(func.count())
+            .select_from(Inventory)
+            .join(Item, Item.id == Inventory.item_id)
+            .where(
+                Inventory.user_id == user_id,
+                tuple_(Inventory.item_id, Item.slot).in_(
+                    [(item_id, slot.value) for slot, item_id in requested.items()]
+                )
+            )
+            .scalar_subquery()
+        ) if requested else literal(0)
+        
+        equip = Inventory.item_id.in_(item_ids)
+        changed = (
+            update(Inventory)
+            .where(
+                Inventory.item_id == Item.id,
+                Inventory.user_id == user_id,
+                Item.slot.in_([slot.value for slot in loadout]),
+                or_(Inventory.equipped, equip),
+                Inventory.equipped != equip,
+                owned_requested == len(requested)
+            )
+            .values(equipped=equip)
+            .returning(Inventory.item_id, Item.slot, Inventory.equipped)
+            .cte("changed")
+        )
+        
+        # The equipped rows are read from the snapshot before the update
+        result = await self.session.execute(
+            select(changed.c.item_id, changed.c.slot, changed.c.equipped, true().label("changed"))
+            .union_all(
+                select(Inventory.item_id, Item.slot, Inventory.equipped, literal(False))
+                .join(Item, Item.id == Inventory.item_id)
+                .where(Inventory.user_id == user_id, Inventory.equipped == True)
+            )
+        )
+        rows = result.all()
+        
+        equipped = {ItemSlot(row.slot): row.item_id for row in rows if not row.changed}
+        changes = [row for row in rows if row.changed]
+        for row in changes:
+            if not row.equipped and equipped.get(ItemSlot(row.slot)) == row.item_id:
+                del equipped[ItemSlot(row.slot)]
+        for row in changes:
+            if row.equipped:
+                equipped[ItemSlot(row.slot)] = row.item_id
+        
+        # Nothing is updated for a rejected loadout, so it isn't in place
+        if any(equipped.get(slot) != item_id for slot, item_id in loadout.items()):
+            return None
+        
+        return equipped, {ItemSlot(row.slot) for row in changes}
+
     async def unequip_item(
         self,
         user_id: UUID,
@@ -270,35 +387,50 @@ class InventoryRepository:
         
         return total_stats
 
-    async def get_inventory_summary(self, user_id: UUID) -> Dict[str, any]:
-        """Get inventory summary statistics."""
-        from sqlalchemy import func
-        
-        # Total items
-        total_items = await self.count_user_items(user_id)
-        
-        # Items by slot
-        items_by_slot = {}
-        for slot in ItemSlot:
-            count = await self.count_user_items(user_id, slot=slot)
-            items_by_slot[slot.value] = count
-        
-        # Items by rarity
-        items_by_rarity = {}
-        for rarity in ItemRarity:
-            count = await self.count_user_items(user_id, rarity=rarity)
-            items_by_rarity[rarity.value] = count
+    async def get_inventory_summary(self, user_id: UUID) -> Dict[str, Any]:
+        """
+        Get inventory counts by slot, rarity and equipped state in one query.
         
-        # Equipped items count
-        equipped_count = await self.count_user_items(user_id, equipped_only=True)
+        Also returns the IDs of the equipped items so their stats can be
+        summed from the item catalog without another query.
+        """
+        from sqlalchemy import func, tuple_
         
-        # Total stats from equipped items
-        equipped_stats = await self.calculate_equipped_stats(user_id)
+        grouping = func.grouping(Item.slot, Item.rarity, Inventory.equipped)
+        result = await self.session.execute(
+            select(
+                Item.slot,
+                Item.rarity,
+                Inventory.equipped,
+                func.count().label("items"),
+                grouping.label("grouping"),
+                func.array_agg(Inventory.item_id).filter(Inventory.equipped).label("equipped_item_ids")
+            )
+            .join(Item, Item.id == Inventory.item_id)
+            .where(Inventory.user_id == user_id)
+            .group_by(func.grouping_sets(
+                tuple_(Item.slot), tuple_(Item.rarity), tuple_(Inventory.equipped), tuple_()
+            ))
+        )
         
-        return {
-            "total_items": total_items,
-            "equipped_items": equipped_count,
-            "items_by_slot": items_by_slot,
-            "items_by_rarity": items_by_rarity,
-            "equipped_stats": equipped_stats
+        summary = {
+            "total_items": 0,
+            "equipped_items": 0,
+            "items_by_slot": {slot.value: 0 for slot in ItemSlot},
+            "items_by_rarity": {rarity.value: 0 for rarity in ItemRarity},
+            "equipped_item_ids": []
         }
+        # GROUPING() sets a bit for each column aggregated away: slot=4, rarity=2, equipped=1
+        for row in result.all():
+            if row.grouping == 0b011:
+                summary["items_by_slot"][ItemSlot(row.slot).value] = row.items
+            elif row.grouping == 0b101:
+                summary["items_by_rarity"][ItemRarity(row.rarity).value] = row.items
+            elif row.grouping == 0b110:
+                if row.equipped:
+                    summary["equipped_items"] = row.items
+            else:
+                summary["total_items"] = row.items
+                summary["equipped_item_ids"] = list(row.equipped_item_ids or [])
+        
+        return summary
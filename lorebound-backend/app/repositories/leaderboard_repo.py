@@ -1,14 +1,21 @@
 """Leaderboard repository for ranking management."""
 
+import math
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func
+from sqlalchemy import select, and_, desc, func, literal_column, union_all, cast, Integer, String
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 
-from ..domain.models import LeaderboardSnapshot, Score, User, Run, Profile
-from ..domain.enums import LeaderboardScope
+from ..domain.models import (
+    LeaderboardSnapshot, Score, Run, Dungeon, Profile, Follow, UserDailyScore, UserScoreTotal
+)
+from ..domain.enums import LeaderboardScope, DungeonCategory
+
+# Board keys: every board shares the rollup tables and differs only by this key
+GLOBAL_BOARD = "global"
 
 
 class LeaderboardRepository:
@@ -17,155 +24,248 @@ class LeaderboardRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @staticmethod
+    def board_key(
+        dungeon_id: Optional[UUID] = None,
+        category: Optional[DungeonCategory] = None
+    ) -> str:
+        """Get the board key for the global, a dungeon or a category leaderboard."""
+        if dungeon_id is not None:
+            return f"dungeon:{dungeon_id}"
+        if category is not None:
+            return f"category:{DungeonCategory(category).value}"
+        return GLOBAL_BOARD
+
     async def get_top_scores_for_period(
         self,
         scope: LeaderboardScope,
         period_key: str,
         limit: int = 100,
-        offset: int = 0
-    ) -> List[tuple]:
-        """Get top aggregated scores for a specific leaderboard period."""
-        # Calculate time filter based on scope and period
-        time_filter = self._get_time_filter_for_period(scope, period_key)
+        offset: int = 0,
+        board: str = GLOBAL_BOARD
+    ) -> List[Dict[str, Any]]:
+        """
+        Get top aggregated scores for a specific leaderboard period.
+        
+        The per-user aggregate is ranked and paginated in a subquery, then joined
+        with profiles so the whole page resolves in a single statement.
+        """
+        aggregate_query = self._period_totals_query(scope, period_key, board)
+        columns = aggregate_query.selected_columns
+        
+        aggregated = (
+            aggregate_query
+            .order_by(desc(columns.total_score), columns.user_id)
+            .offset(offset)
+            .limit(limit)
+            .subquery()
+        )
         
-        # Aggregate scores by user
+        # Join only the page of aggregated rows with the profile columns we display
         query = (
             select(
-                Score.user_id,
-                func.sum(Score.score).label('total_score'),
-                func.count(Score.id).label('run_count'),
-                func.max(Score.created_at).label('last_played')
+                aggregated.c.user_id,
+                aggregated.c.total_score,
+                aggregated.c.run_count,
+                aggregated.c.last_played,
+                Profile.handle,
+                Profile.avatar_layers
             )
-            .group_by(Score.user_id)
-            .order_by(desc(func.sum(Score.score)))
+            .outerjoin(Profile, Profile.user_id == aggregated.c.user_id)
+            .order_by(desc(aggregated.c.total_score), aggregated.c.user_id)
         )
         
-        if time_filter:
-            query = query.where(Score.created_at >= time_filter)
-        
-        query = query.offset(offset).limit(limit)
-        
         result = await self.session.execute(query)
-        aggregated = result.all()
-        
-        # Now get user details for each aggregated result
-        leaderboard_data = []
-        for user_id, total_score, run_count, last_played in aggregated:
-            # Get user with profile
-            user_query = (
-                select(User)
-                .options(selectinload(User.profile))
-                .where(User.id == user_id)
-            )
-            user_result = await self.session.execute(user_query)
-            user = user_result.scalar_one_or_none()
-            
-            if user:
-                leaderboard_data.append({
-                    'user_id': user_id,
-                    'user': user,
-                    'total_score': total_score,
-                    'run_count': run_count,
-                    'last_played': last_played
-                })
-        
-        return leaderboard_data
+        
+        return [
+            {
+                'user_id': row.user_id,
+                'handle': row.handle,
+                'avatar_layers': row.avatar_layers,
+                'total_score': row.total_score,
+                'run_count': row.run_count,
+                'last_played': row.last_played
+            }
+            for row in result.all()
+        ]
 
-    async def get_user_rank_in_period(
+    async def get_user_rank_with_neighbors(
         self,
         user_id: UUID,
         scope: LeaderboardScope,
-        period_key: str
-    ) -> Optional[int]:
-        """Get user's rank in a specific leaderboard period."""
-        # Get user's best score for the period
-        time_filter = self._get_time_filter_for_period(scope, period_key)
+        period_key: str,
+        neighbors_count: int = 3,
+        board: str = GLOBAL_BOARD
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], int]:
+        """
+        Get user's rank entry, the players ranked directly around them and the
+        participant count for a period in a single statement.
+        
+        The period aggregate is ranked with window functions, so neighbors are
+        true rank neighbors and the cost does not depend on the user's history.
+        """
+        totals = self._period_totals_query(scope, period_key, board).subquery()
+        
+        order = (desc(totals.c.total_score), totals.c.user_id)
+        ranked = (
+            select(
+                totals.c.user_id,
+                totals.c.total_score,
+                totals.c.run_count,
+                func.rank().over(order_by=desc(totals.c.total_score)).label('rank'),
+                func.row_number().over(order_by=order).label('position'),
+                func.count().over().label('participants')
+            )
+            .cte('ranked')
+        )
+        me = (
+            select(ranked.c.position)
+            .where(ranked.c.user_id == user_id)
+            .cte('me')
+        )
         
-        user_score_query = (
-            select(func.max(Score.score))
-            .where(Score.user_id == user_id)
+        query = (
+            select(
+                ranked.c.user_id,
+                ranked.c.total_score,
+                ranked.c.run_count,
+                ranked.c.rank,
+                ranked.c.participants,
+                Profile.handle,
+                Profile.avatar_layers
+            )
+            .join(
+                me,
+                ranked.c.position.between(
+                    me.c.position - neighbors_count,
+                    me.c.position + neighbors_count
+                )
+            )
+            .outerjoin(Profile, Profile.user_id == ranked.c.user_id)
+            .order_by(ranked.c.position)
         )
         
-        if time_filter:
-            user_score_query = user_score_query.where(Score.created_at >= time_filter)
+        result = await self.session.execute(query)
+        rows = result.all()
+        
+        if not rows:
+            return None, [], 0
+        
+        user_entry = None
+        neighbors = []
+        for row in rows:
+            entry = {
+                'user_id': row.user_id,
+                'handle': row.handle,
+                'avatar_layers': row.avatar_layers,
+                'total_score': row.total_score,
+                'run_count': row.run_count,
+                'rank': row.rank
+            }
+            if row.user_id == user_id:
+                user_entry = entry
+            else:
+                neighbors.append(entry)
+        
+        return user_entry, neighbors, rows[0].participants
+
+    async def get_friends_ranking(
+        self,
+        user_id: UUID,
+        scope: LeaderboardScope,
+        period_key: str,
+        board: str = GLOBAL_BOARD
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank a user and everyone they follow for a period in a single statement.
         
-        user_score_result = await self.session.execute(user_score_query)
-        user_score = user_score_result.scalar()
+        The follow set filters the rollups before they are aggregated, so the
+        query only touches the circle's own rollup rows via the primary key.
+        """
+        circle = select(Follow.followee_id).where(Follow.follower_id == user_id)
         
-        if user_score is None:
-            return None
+        totals_query = self._period_totals_query(scope, period_key, board)
+        player = totals_query.selected_columns.user_id
+        totals = totals_query.where((player == user_id) | player.in_(circle)).subquery()
         
-        # Count how many users have a higher best score
-        higher_scores_query = (
-            select(func.count(func.distinct(Score.user_id)))
-            .where(Score.score > user_score)
+        query = (
+            select(
+                totals.c.user_id,
+                totals.c.total_score,
+                totals.c.run_count,
+                func.rank().over(order_by=desc(totals.c.total_score)).label('rank'),
+                Profile.handle,
+                Profile.avatar_layers
+            )
+            .outerjoin(Profile, Profile.user_id == totals.c.user_id)
+            .order_by(desc(totals.c.total_score), totals.c.user_id)
         )
         
-        if time_filter:
-            higher_scores_query = higher_scores_query.where(Score.created_at >= time_filter)
-        
-        higher_scores_result = await self.session.execute(higher_scores_query)
-        higher_scores_count = higher_scores_result.scalar() or 0
+        result = await self.session.execute(query)
         
-        return higher_scores_count + 1
+        return [
+            {
+                'user_id': row.user_id,
+                'handle': row.handle,
+                'avatar_layers': row.avatar_layers,
+                'total_score': row.total_score,
+                'run_count': row.run_count,
+                'rank': row.rank
+            }
+            for row in result.all()
+        ]
 
-    async def get_user_neighbors_in_leaderboard(
+    async def get_user_period_total(
         self,
         user_id: UUID,
         scope: LeaderboardScope,
         period_key: str,
-        neighbors_count: int = 5
-    ) -> Tuple[Optional[Score], List[Score]]:
-        """Get user's score and neighboring scores in leaderboard."""
-        # Get user's best score for the period
-        time_filter = self._get_time_filter_for_period(scope, period_key)
+        board: str = GLOBAL_BOARD
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single user's aggregate for a period; a primary key range lookup."""
+        totals_query = self._period_totals_query(scope, period_key, board)
+        totals = totals_query.where(totals_query.selected_columns.user_id == user_id).subquery()
         
-        user_score_query = (
-            select(Score)
-            .options(
-                selectinload(Score.user).selectinload(User.profile),
-                selectinload(Score.run)
-            )
-            .where(Score.user_id == user_id)
-            .order_by(desc(Score.score))
+        query = (
+            select(totals.c.total_score, totals.c.run_count, Profile.handle)
+            .outerjoin(Profile, Profile.user_id == totals.c.user_id)
         )
         
-        if time_filter:
-            user_score_query = user_score_query.where(Score.created_at >= time_filter)
-        
-        user_score_result = await self.session.execute(user_score_query)
-        user_score = user_score_result.scalar_one_or_none()
+        result = await self.session.execute(query)
+        row = result.first()
+        if not row:
+            return None
         
-        if not user_score:
-            return None, []
+        return {
+            'total_score': int(row.total_score or 0),
+            'run_count': int(row.run_count or 0),
+            'handle': row.handle
+        }
+
+    async def get_score_histogram(
+        self,
+        scope: LeaderboardScope,
+        period_key: str,
+        growth: float,
+        board: str = GLOBAL_BOARD
+    ) -> Dict[int, int]:
+        """
+        Count players per logarithmic score bucket for a period.
+        
+        Bucket b holds totals t with growth**b <= t + 1 < growth**(b + 1).
+        """
+        totals = self._period_totals_query(scope, period_key, board).subquery()
+        buckets = select(
+            cast(
+                func.floor(func.ln(totals.c.total_score + 1) / math.log(growth)),
+                Integer
+            ).label('bucket')
+        ).subquery()
         
-        # Get neighbors (scores around user's score)
-        neighbors_query = (
-            select(Score)
-            .options(
-                selectinload(Score.user).selectinload(User.profile),
-                selectinload(Score.run)
-            )
-            .where(
-                and_(
-                    Score.score.between(
-                        user_score.score - 1000,  # Adjust range as needed
-                        user_score.score + 1000
-                    ),
-                    Score.user_id != user_id
-                )
-            )
-            .order_by(desc(Score.score))
-            .limit(neighbors_count * 2)  # Get more to filter
+        result = await self.session.execute(
+            select(buckets.c.bucket, func.count()).group_by(buckets.c.bucket)
         )
-        
-        if time_filter:
-            neighbors_query = neighbors_query.where(Score.created_at >= time_filter)
-        
-        neighbors_result = await self.session.execute(neighbors_query)
-        neighbors = list(neighbors_result.scalars().all())
-        
-        return user_score, neighbors[:neighbors_count]
+        return {row[0]: row[1] for row in result.all()}
 
     async def create_leaderboard_snapshot(
         self,
@@ -200,9 +300,88 @@ class LeaderboardRepository:
                 )
             )
             .order_by(desc(LeaderboardSnapshot.created_at))
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def save_leaderboard_snapshot(
+        self,
+        scope: LeaderboardScope,
+        period_key: str,
+        payload: Dict[str, Any]
+    ) -> LeaderboardSnapshot:
+        """Create or refresh the snapshot of a leaderboard period in place."""
+        snapshot = await self.get_leaderboard_snapshot(scope, period_key)
+        if not snapshot:
+            return await self.create_leaderboard_snapshot(scope, period_key, payload)
+        
+        if snapshot.is_frozen:
+            # Finished periods are archived and never rewritten
+            return snapshot
+        
+        snapshot.payload = payload
+        snapshot.created_at = datetime.now(timezone.utc)
+        await self.session.flush()
+        return snapshot
+
+    async def freeze_leaderboard_snapshot(
+        self,
+        scope: LeaderboardScope,
+        period_key: str,
+        payload: Dict[str, Any]
+    ) -> LeaderboardSnapshot:
+        """Turn the snapshot of a finished period into its immutable archive."""
+        snapshot = await self.get_leaderboard_snapshot(scope, period_key)
+        if snapshot and snapshot.is_frozen:
+            return snapshot
+        
+        if not snapshot:
+            snapshot = await self.create_leaderboard_snapshot(scope, period_key, payload)
+        
+        snapshot.payload = payload
+        snapshot.is_frozen = True
+        snapshot.created_at = datetime.now(timezone.utc)
+        await self.session.flush()
+        return snapshot
+
+    async def get_frozen_snapshot(
+        self,
+        scope: LeaderboardScope,
+        period_key: str
+    ) -> Optional[LeaderboardSnapshot]:
+        """Get the archived snapshot of a finished period."""
+        result = await self.session.execute(
+            select(LeaderboardSnapshot)
+            .where(
+                and_(
+                    LeaderboardSnapshot.scope == scope,
+                    LeaderboardSnapshot.period_key == period_key,
+                    LeaderboardSnapshot.is_frozen.is_(True)
+                )
+            )
         )
         return result.scalar_one_or_none()
 
+    async def get_frozen_period_keys(
+        self,
+        scope: LeaderboardScope,
+        limit: int = 30
+    ) -> List[str]:
+        """Get the keys of the most recent archived periods of a scope, newest first."""
+        # Period keys sort chronologically, and only the key column is read
+        result = await self.session.execute(
+            select(LeaderboardSnapshot.period_key)
+            .where(
+                and_(
+                    LeaderboardSnapshot.scope == scope,
+                    LeaderboardSnapshot.is_frozen.is_(True)
+                )
+            )
+            .order_by(desc(LeaderboardSnapshot.period_key))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def get_recent_snapshots(
         self,
         scope: LeaderboardScope,
@@ -220,48 +399,50 @@ class LeaderboardRepository:
     async def count_participants_in_period(
         self,
         scope: LeaderboardScope,
-        period_key: str
+        period_key: str,
+        board: str = GLOBAL_BOARD
     ) -> int:
         """Count unique participants in a leaderboard period."""
-        time_filter = self._get_time_filter_for_period(scope, period_key)
-        
-        query = select(func.count(func.distinct(Score.user_id)))
-        
-        if time_filter:
-            query = query.where(Score.created_at >= time_filter)
+        totals = self._period_totals_query(scope, period_key, board).subquery()
         
-        result = await self.session.execute(query)
+        result = await self.session.execute(select(func.count()).select_from(totals))
         return result.scalar() or 0
 
     async def get_leaderboard_stats(
         self,
         scope: LeaderboardScope,
-        period_key: str
+        period_key: str,
+        board: str = GLOBAL_BOARD
     ) -> Dict[str, Any]:
         """Get comprehensive leaderboard statistics."""
-        time_filter = self._get_time_filter_for_period(scope, period_key)
-        
-        # Participant count
-        participants = await self.count_participants_in_period(scope, period_key)
+        totals = self._period_totals_query(scope, period_key, board).subquery()
         
-        # Score statistics
+        # Participants and per-run statistics come straight from the rollups
         stats_query = select(
-            func.count(Score.id),
-            func.avg(Score.score),
-            func.max(Score.score),
-            func.min(Score.score)
-        )
-        
-        if time_filter:
-            stats_query = stats_query.where(Score.created_at >= time_filter)
+            func.count(),
+            func.sum(totals.c.run_count),
+            func.sum(totals.c.total_score),
+            func.max(totals.c.best_score)
+        ).select_from(totals)
         
         stats_result = await self.session.execute(stats_query)
         stats_row = stats_result.one()
         
-        total_scores = stats_row[0] or 0
-        avg_score = float(stats_row[1] or 0)
-        max_score = stats_row[2] or 0
-        min_score = stats_row[3] or 0
+        participants = stats_row[0] or 0
+        total_scores = int(stats_row[1] or 0)
+        avg_score = float(stats_row[2] or 0) / total_scores if total_scores else 0.0
+        max_score = stats_row[3] or 0
+        
+        # Rollups don't track the worst run; a bounded MIN over scores is cheap
+        min_query = select(func.min(Score.score))
+        time_range = self._get_time_range_for_period(scope, period_key)
+        if time_range:
+            start, end = time_range
+            min_query = min_query.where(Score.created_at >= start, Score.created_at < end)
+        min_query = self._filter_scores_by_board(min_query, board)
+        
+        min_result = await self.session.execute(min_query)
+        min_score = min_result.scalar() or 0
         
         return {
             "scope": scope.value,
@@ -274,12 +455,212 @@ class LeaderboardRepository:
             "last_updated": datetime.now(timezone.utc)
         }
 
-    def _get_time_filter_for_period(
+    async def record_score(
+        self,
+        user_id: UUID,
+        score: int,
+        played_at: datetime,
+        dungeon_id: Optional[UUID] = None,
+        category: Optional[DungeonCategory] = None
+    ) -> None:
+        """
+        Fold a new score into the user's daily rollups and all-time totals.
+        
+        The global, dungeon and category boards are upserted as rows of one
+        multi-row statement per table, so extra boards add no round trips.
+        """
+        boards = [GLOBAL_BOARD]
+        if dungeon_id is not None:
+            boards.append(self.board_key(dungeon_id=dungeon_id))
+        if category is not None:
+            boards.append(self.board_key(category=category))
+        
+        rows = [
+            {
+                "board": board,
+                "user_id": user_id,
+                "total_score": score,
+                "run_count": 1,
+                "best_score": score,
+                "last_played": played_at
+            }
+            for board in boards
+        ]
+        day = played_at.astimezone(timezone.utc).date()
+        
+        daily = insert(UserDailyScore).values([{**row, "day": day} for row in rows])
+        await self.session.execute(
+            daily.on_conflict_do_update(
+                index_elements=[UserDailyScore.board, UserDailyScore.user_id, UserDailyScore.day],
+                set_=self._rollup_increment(UserDailyScore, daily.excluded)
+            )
+        )
+        
+        totals = insert(UserScoreTotal).values(rows)
+        await self.session.execute(
+            totals.on_conflict_do_update(
+                index_elements=[UserScoreTotal.board, UserScoreTotal.user_id],
+                set_=self._rollup_increment(UserScoreTotal, totals.excluded)
+            )
+        )
+
+    async def rebuild_score_rollups(self) -> int:
+        """
+        Recompute daily rollups and all-time totals of every board from the raw scores.
+        
+        Idempotent, so it can backfill existing data or repair drift.
+        
+        Returns:
+            Number of daily rollup rows written
+        """
+        # One row per score and board it counts towards
+        scores = (
+            select(Score.user_id, Score.score, Score.created_at, Run.dungeon_id, Dungeon.category)
+            .join(Run, Run.id == Score.run_id)
+            .join(Dungeon, Dungeon.id == Run.dungeon_id)
+            .subquery()
+        )
+        boards = [
+            literal_column(f"'{GLOBAL_BOARD}'"),
+            literal_column("'dungeon:'") + cast(scores.c.dungeon_id, String),
+            literal_column("'category:'") + scores.c.category
+        ]
+        per_board = union_all(*[
+            select(
+                board.label('board'),
+                scores.c.user_id,
+                scores.c.score,
+                scores.c.created_at
+            )
+            for board in boards
+        ]).subquery()
+        
+        day = func.date(func.timezone(literal_column("'UTC'"), per_board.c.created_at))
+        daily_rows = (
+            select(
+                per_board.c.board,
+                per_board.c.user_id,
+                day,
+                func.sum(per_board.c.score),
+                func.count(),
+                func.max(per_board.c.score),
+                func.max(per_board.c.created_at)
+            )
+            .group_by(per_board.c.board, per_board.c.user_id, day)
+        )
+        daily = insert(UserDailyScore).from_select(
+            ['board', 'user_id', 'day', 'total_score', 'run_count', 'best_score', 'last_played'],
+            daily_rows
+        )
+        result = await self.session.execute(
+            daily.on_conflict_do_update(
+                index_elements=[UserDailyScore.board, UserDailyScore.user_id, UserDailyScore.day],
+                set_=self._rollup_replace(daily.excluded)
+            )
+        )
+        
+        total_rows = (
+            select(
+                UserDailyScore.board,
+                UserDailyScore.user_id,
+                func.sum(UserDailyScore.total_score),
+                func.sum(UserDailyScore.run_count),
+                func.max(UserDailyScore.best_score),
+                func.max(UserDailyScore.last_played)
+            )
+            .group_by(UserDailyScore.board, UserDailyScore.user_id)
+        )
+        totals = insert(UserScoreTotal).from_select(
+            ['board', 'user_id', 'total_score', 'run_count', 'best_score', 'last_played'],
+            total_rows
+        )
+        await self.session.execute(
+            totals.on_conflict_do_update(
+                index_elements=[UserScoreTotal.board, UserScoreTotal.user_id],
+                set_=self._rollup_replace(totals.excluded)
+            )
+        )
+        
+        return result.rowcount
+
+    def _rollup_increment(self, model, excluded) -> Dict[str, Any]:
+        """SET clause adding an excluded row onto an existing rollup row."""
+        return {
+            "total_score": model.total_score + excluded.total_score,
+            "run_count": model.run_count + excluded.run_count,
+            "best_score": func.greatest(model.best_score, excluded.best_score),
+            "last_played": func.greatest(model.last_played, excluded.last_played)
+        }
+
+    def _rollup_replace(self, excluded) -> Dict[str, Any]:
+        """SET clause overwriting a rollup row with recomputed values."""
+        return {
+            "total_score": excluded.total_score,
+            "run_count": excluded.run_count,
+            "best_score": excluded.best_score,
+            "last_played": excluded.last_played
+        }
+
+    def _period_totals_query(
+        self,
+        scope: LeaderboardScope,
+        period_key: str,
+        board: str = GLOBAL_BOARD
+    ):
+        """
+        Build the per-user score aggregate for a leaderboard period.
+        
+        All-time reads the maintained totals directly; daily and weekly periods
+        sum at most seven daily rollup rows per user.
+        """
+        time_range = self._get_time_range_for_period(scope, period_key)
+        
+        if time_range is None:
+            return select(
+                UserScoreTotal.user_id.label('user_id'),
+                UserScoreTotal.total_score.label('total_score'),
+                UserScoreTotal.run_count.label('run_count'),
+                UserScoreTotal.best_score.label('best_score'),
+                UserScoreTotal.last_played.label('last_played')
+            ).where(UserScoreTotal.board == board)
+        
+        start, end = time_range
+        return (
+            select(
+                UserDailyScore.user_id.label('user_id'),
+                func.sum(UserDailyScore.total_score).label('total_score'),
+                func.sum(UserDailyScore.run_count).label('run_count'),
+                func.max(UserDailyScore.best_score).label('best_score'),
+                func.max(UserDailyScore.last_played).label('last_played')
+            )
+            .where(
+                UserDailyScore.board == board,
+                UserDailyScore.day >= start.date(),
+                UserDailyScore.day < end.date()
+            )
+            .group_by(UserDailyScore.user_id)
+        )
+
+    def _filter_scores_by_board(self, query, board: str):
+        """Restrict a query over raw scores to the runs counting towards a board."""
+        kind, _, value = board.partition(":")
+        if kind == "dungeon":
+            return query.join(Run, Run.id == Score.run_id).where(Run.dungeon_id == UUID(value))
+        if kind == "category":
+            return (
+                query
+                .join(Run, Run.id == Score.run_id)
+                .join(Dungeon, Dungeon.id == Run.dungeon_id)
+                .where(Dungeon.category == value)
+            )
+        return query
+
+    def _get_time_range_for_period(
         self,
         scope: LeaderboardScope,
         period_key: str
-    ) -> Optional[datetime]:
-        """Get time filter for a specific leaderboard period."""
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """Get the [start, end) UTC time range of a leaderboard period."""
         if scope == LeaderboardScope.ALLTIME:
             return None
         
@@ -287,11 +668,11 @@ class LeaderboardRepository:
             if scope == LeaderboardScope.TODAY:
                 # period_key format: "2024-01-01"
                 date_obj = datetime.strptime(period_key, "%Y-%m-%d")
-                return date_obj.replace(tzinfo=timezone.utc)
+                day_start = date_obj.replace(tzinfo=timezone.utc)
+                return day_start, day_start + timedelta(days=1)
             
             elif scope == LeaderboardScope.WEEKLY:
                 # period_key format: "2025-W43"
-                from datetime import timedelta
                 year, week = period_key.split("-W")
                 
                 # Use ISO 8601 week calculation
@@ -301,7 +682,7 @@ class LeaderboardRepository:
                 week_1_monday = jan_4 - timedelta(days=jan_4.weekday())
                 week_start = week_1_monday + timedelta(weeks=int(week) - 1)
                 
-                return week_start
+                return week_start, week_start + timedelta(weeks=1)
         
         except (ValueError, AttributeError):
             # If period_key is malformed, return None (no filter)
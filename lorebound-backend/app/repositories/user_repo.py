@@ -1,17 +1,29 @@
 """User repository for database operations."""
 
 import logging
-from typing import Optional, List
-from uuid import UUID
+import secrets
+import string
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_
+from sqlalchemy import JSON, Integer, select, update, delete, and_, or_, func, literal, true
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.orm import selectinload
 
-from ..domain.models import User, Profile
+from ..domain.models import User, Profile, Follow, Inventory, Item
 from ..domain.enums import UserStatus
+from ..domain.progression import LevelProgress, level_curve
 
 logger = logging.getLogger(__name__)
 
+HANDLE_MAX_LENGTH = 15
+
+# Numbered handles look like "<stem>_<n>" with n up to this many digits
+HANDLE_SUFFIX_DIGITS = 3
+HANDLE_RANDOM_ALPHABET = string.ascii_lowercase + string.digits
+HANDLE_RANDOM_ATTEMPTS = 3
+
 
 class UserRepository:
     """Repository for user-related database operations."""
@@ -38,6 +50,82 @@ class UserRepository:
         await self.session.refresh(user)
         return user
 
+    async def register_user(
+        self,
+        email: str,
+        password_hash: str,
+        handle: str,
+        starter_item_ids: Sequence[UUID]
+    ) -> Tuple[Optional[User], Optional[str]]:
+        """
+        Create a signed-in user with profile and equipped starter items in one statement.
+        
+        Uniqueness is left to the email and handle constraints instead of
+        checking first. A taken handle still inserts the user row, so the
+        caller must roll back on any conflict.
+        
+        Returns:
+            Tuple of (new user, None) or (None, "email" | "handle") on conflict
+        """
+        now = datetime.now(timezone.utc)
+        user_id = uuid4()
+        
+        new_user = (
+            insert(User)
+            .values(
+                id=user_id,
+                email=email,
+                password_hash=password_hash,
+                status=UserStatus.ACTIVE,
+                last_login_at=now
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.id, User.created_at)
+            .cte("new_user")
+        )
+        new_profile = (
+            insert(Profile)
+            .from_select(
+                ["user_id", "handle", "level", "xp", "avatar_layers"],
+                select(new_user.c.id, literal(handle), literal(1), literal(0), literal({}, JSON))
+            )
+            .on_conflict_do_nothing(index_elements=[Profile.handle])
+            .returning(Profile.user_id)
+            .cte("new_profile")
+        )
+        new_items = (
+            insert(Inventory)
+            .from_select(
+                ["user_id", "item_id", "equipped"],
+                select(new_profile.c.user_id, Item.id, true()).where(Item.id.in_(starter_item_ids))
+            )
+            .returning(Inventory.item_id)
+            .cte("new_items")
+        )
+        
+        result = await self.session.execute(
+            select(
+                new_user.c.created_at,
+                select(func.count()).select_from(new_profile).scalar_subquery().label("profiles"),
+                select(func.count()).select_from(new_items).scalar_subquery().label("items")
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None, "email"
+        if not row.profiles:
+            return None, "handle"
+        
+        logger.info(f"Registered user {user_id} with {row.items} starter items")
+        return User(
+            id=user_id,
+            email=email,
+            password_hash=password_hash,
+            status=UserStatus.ACTIVE,
+            created_at=row.created_at,
+            last_login_at=now
+        ), None
+
     async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID."""
         result = await self.session.execute(
@@ -47,6 +135,24 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_user_principal(self, user_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get the fields of a user needed to authenticate requests, in one row."""
+        result = await self.session.execute(
+            select(
+                User.id,
+                User.status,
+                User.email,
+                User.apple_sub,
+                User.created_at,
+                User.last_login_at,
+                Profile.handle
+            )
+            .outerjoin(Profile, Profile.user_id == User.id)
+            .where(User.id == user_id)
+        )
+        row = result.mappings().one_or_none()
+        return dict(row) if row else None
+
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         result = await self.session.execute(
@@ -66,7 +172,11 @@ class UserRepository:
         return result.scalar_one_or_none()
 
     async def update_user_login_time(self, user_id: UUID) -> bool:
-        """Update user's last login time."""
+        """
+        Update user's last login time.
+        
+        The caller drops the user's cached principal once this is committed.
+        """
         from datetime import datetime, timezone
         
         result = await self.session.execute(
@@ -77,7 +187,11 @@ class UserRepository:
         return result.rowcount > 0
 
     async def update_user_status(self, user_id: UUID, status: UserStatus) -> bool:
-        """Update user status."""
+        """
+        Update user status.
+        
+        The caller drops the user's cached principal once this is committed.
+        """
         result = await self.session.execute(
             update(User)
             .where(User.id == user_id)
@@ -85,28 +199,37 @@ class UserRepository:
         )
         return result.rowcount > 0
 
-    async def add_experience(self, user_id: UUID, xp_amount: int, session: AsyncSession = None) -> bool:
-        """Add experience points to user's profile."""
-        # Get user's profile
+    async def add_experience(self, user_id: UUID, xp_amount: int) -> Optional[LevelProgress]:
+        """
+        Add experience points to user's profile and level it up in one statement.
+        
+        The increment happens in the database, so concurrent gains are never lost.
+        """
+        new_xp = Profile.xp + xp_amount
         result = await self.session.execute(
-            select(Profile).where(Profile.user_id == user_id)
+            update(Profile)
+            .where(Profile.user_id == user_id)
+            .values(
+                xp=new_xp,
+                # Index of the last threshold at or below the new XP
+                level=func.width_bucket(new_xp, literal(list(level_curve.thresholds), ARRAY(Integer)))
+            )
+            .returning(Profile.xp, Profile.level)
         )
-        profile = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not profile:
-            return False
-        
-        # Add XP and check for level up
-        profile.xp += xp_amount
-        
-        # Simple level up formula: Level = floor(XP / 1000) + 1
-        new_level = (profile.xp // 1000) + 1
-        if new_level > profile.level:
-            profile.level = new_level
-            logger.info(f"User {user_id} leveled up to {new_level}!")
+        if not row:
+            return None
         
-        await self.session.flush()
-        return True
+        # The XP before this gain is exact even with concurrent gains
+        progress = LevelProgress(
+            xp=row.xp,
+            level=row.level,
+            previous_level=level_curve.level_for(row.xp - xp_amount)
+        )
+        if progress.levels_gained:
+            logger.info(f"User {user_id} leveled up to {progress.level}!")
+        return progress
 
     async def create_profile(
         self,
@@ -129,6 +252,83 @@ class UserRepository:
         await self.session.refresh(profile)
         return profile
 
+    async def create_profile_with_free_handle(self, user_id: UUID, handle: str) -> Optional[str]:
+        """
+        Create a profile under `handle` or a free variant of it.
+        
+        The next free numbered variant is found in one query and claimed with
+        a conflict-safe insert. If another sign-in takes it first, or all
+        numbered variants are used, a few random suffixes are tried, so this
+        takes a bounded number of round trips.
+        
+        Returns:
+            The handle the profile was created with, or None if every attempt collided
+        """
+        candidate = await self.find_free_handle(handle)
+        if candidate is not None and await self._insert_profile(user_id, candidate):
+            return candidate
+        
+        for _ in range(HANDLE_RANDOM_ATTEMPTS):
+            candidate = self._random_handle(handle)
+            if await self._insert_profile(user_id, candidate):
+                return candidate
+        
+        logger.warning(f"Could not allocate a handle like {handle!r} for user {user_id}")
+        return None
+
+    async def find_free_handle(self, handle: str) -> Optional[str]:
+        """
+        Get `handle` if it is free, else the variant after the highest numbered one.
+        
+        Returns:
+            A handle that was free when queried, or None if the numbered
+            variants are exhausted
+        """
+        handle = handle[:HANDLE_MAX_LENGTH]
+        stem = self._handle_stem(handle)
+        pattern = stem.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        suffix = func.substring(Profile.handle, len(stem) + 1)
+        
+        # Zero-padded so the text max is the numeric max
+        result = await self.session.execute(
+            select(
+                func.bool_or(Profile.handle == handle).label("taken"),
+                func.max(func.lpad(suffix, HANDLE_SUFFIX_DIGITS, "0"))
+                .filter(suffix.regexp_match(f"^[1-9][0-9]{{0,{HANDLE_SUFFIX_DIGITS - 1}}}$"))
+                .label("last_suffix")
+            )
+            .where(or_(Profile.handle == handle, Profile.handle.like(pattern, escape="\\")))
+        )
+        row = result.one()
+        if not row.taken:
+            return handle
+        
+        next_suffix = int(row.last_suffix or 0) + 1
+        if next_suffix >= 10 ** HANDLE_SUFFIX_DIGITS:
+            return None
+        return f"{stem}{next_suffix}"
+
+    async def _insert_profile(self, user_id: UUID, handle: str) -> bool:
+        """Insert a new profile unless its handle is taken."""
+        result = await self.session.execute(
+            insert(Profile)
+            .values(user_id=user_id, handle=handle, level=1, xp=0, avatar_layers={})
+            .on_conflict_do_nothing(index_elements=[Profile.handle])
+            .returning(Profile.user_id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    @staticmethod
+    def _handle_stem(handle: str) -> str:
+        """Prefix of the numbered variants of a handle, shortened to leave room for the suffix."""
+        return f"{handle[:HANDLE_MAX_LENGTH - HANDLE_SUFFIX_DIGITS - 1]}_"
+
+    @classmethod
+    def _random_handle(cls, handle: str) -> str:
+        """Variant of a handle with a random suffix."""
+        suffix = "".join(secrets.choice(HANDLE_RANDOM_ALPHABET) for _ in range(HANDLE_SUFFIX_DIGITS))
+        return f"{cls._handle_stem(handle)}{suffix}"
+
     async def get_profile_by_user_id(self, user_id: UUID) -> Optional[Profile]:
         """Get profile by user ID."""
         result = await self.session.execute(
@@ -149,7 +349,11 @@ class UserRepository:
         handle: Optional[str] = None,
         avatar_layers: Optional[dict] = None
     ) -> bool:
-        """Update user profile."""
+        """
+        Update user profile.
+        
+        The caller drops the user's cached principal once this is committed.
+        """
         update_data = {}
         if handle is not None:
             update_data["handle"] = handle
@@ -166,31 +370,39 @@ class UserRepository:
         )
         return result.rowcount > 0
 
-    async def update_user_xp(self, user_id: UUID, xp_gained: int) -> Optional[Profile]:
-        """Add XP to user and update level if necessary."""
-        profile = await self.get_profile_by_user_id(user_id)
-        if not profile:
-            return None
-
-        new_xp = profile.xp + xp_gained
-        new_level = self._calculate_level(new_xp)
+    async def follow_user(self, follower_id: UUID, followee_id: UUID) -> bool:
+        """Follow a user; returns False if already following."""
+        result = await self.session.execute(
+            insert(Follow)
+            .values(follower_id=follower_id, followee_id=followee_id)
+            .on_conflict_do_nothing(index_elements=[Follow.follower_id, Follow.followee_id])
+        )
+        return result.rowcount > 0
 
-        await self.session.execute(
-            update(Profile)
-            .where(Profile.user_id == user_id)
-            .values(xp=new_xp, level=new_level)
+    async def unfollow_user(self, follower_id: UUID, followee_id: UUID) -> bool:
+        """Stop following a user; returns False if not following."""
+        result = await self.session.execute(
+            delete(Follow).where(
+                and_(Follow.follower_id == follower_id, Follow.followee_id == followee_id)
+            )
         )
+        return result.rowcount > 0
 
-        # Refresh the profile to get updated values
-        await self.session.refresh(profile)
-        return profile
+    async def get_followed_profiles(self, follower_id: UUID) -> List[Profile]:
+        """Get profiles of all users followed by a user, by handle."""
+        result = await self.session.execute(
+            select(Profile)
+            .join(Follow, Follow.followee_id == Profile.user_id)
+            .where(Follow.follower_id == follower_id)
+            .order_by(Profile.handle)
+        )
+        return list(result.scalars().all())
 
-    def _calculate_level(self, xp: int) -> int:
-        """Calculate level based on XP."""
-        # Simple level calculation: level = floor(sqrt(xp / 100)) + 1
-        # This gives levels at: 0, 100, 400, 900, 1600, 2500, etc.
-        import math
-        return max(1, int(math.sqrt(xp / 100)) + 1)
+    async def update_user_xp(self, user_id: UUID, xp_gained: int) -> Optional[Profile]:
+        """Add XP to user and update level if necessary."""
+        if await self.add_experience(user_id, xp_gained) is None:
+            return None
+        return await self.get_profile_by_user_id(user_id)
 
     async def list_users(
         self,
@@ -120,6 +120,22 @@ class EquipItemRequest(BaseModel):
     )
 
 
+class LoadoutRequest(BaseModel):
+    """Set loadout request schema."""
+    loadout: Dict[ItemSlot, Optional[UUID]] = Field(..., min_length=1, description="Item to equip per slot, null to empty the slot")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "loadout": {
+                    "weapon": "123e4567-e89b-12d3-a456-426614174000",
+                    "shield": None
+                }
+            }
+        }
+    )
+
+
 class EquipItemResponse(BaseModel):
     """Equip item response schema."""
     success: bool = Field(..., description="Whether equip operation succeeded")
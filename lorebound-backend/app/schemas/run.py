@@ -203,6 +203,16 @@ class RunSubmitRequest(BaseModel):
     )
 
 
+class RunProgressionResponse(BaseModel):
+    """XP and levels gained by a submitted run."""
+    xp_gained: int = Field(..., description="XP granted for the run")
+    xp: int = Field(..., description="Total XP after the run")
+    level: int = Field(..., description="Level after the run")
+    levels_gained: List[int] = Field(default_factory=list, description="Levels reached by the run, in order")
+    level_up_rewards: List[Dict[str, Any]] = Field(default_factory=list, description="Items granted for the levels reached")
+    achievements_unlocked: List[str] = Field(default_factory=list, description="Slugs of achievements unlocked by the levels reached")
+
+
 class RunResponse(BaseModel):
     """Run response schema."""
     id: UUID = Field(..., description="Run unique identifier")
@@ -215,6 +225,7 @@ class RunResponse(BaseModel):
     started_at: datetime = Field(..., description="Run start timestamp")
     completed_at: Optional[datetime] = Field(None, description="Run completion timestamp")
     dungeon: Optional[DungeonMetaResponse] = Field(None, description="Dungeon information")
+    progression: Optional[RunProgressionResponse] = Field(None, description="XP and levels gained, on submission")
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -56,6 +56,24 @@ class ProfileUpdateRequest(BaseModel):
     )
 
 
+class FollowedPlayerResponse(BaseModel):
+    """Followed player schema."""
+    user_id: UUID = Field(..., description="User unique identifier")
+    handle: str = Field(..., description="User display name")
+    level: int = Field(..., description="User level")
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "user_id": "123e4567-e89b-12d3-a456-426614174000",
+                "handle": "AwesomePlayer",
+                "level": 15
+            }
+        }
+    )
+
+
 class UserProfileResponse(BaseModel):
     """Complete user profile with user data."""
     user_id: UUID = Field(..., description="User unique identifier")
@@ -1,12 +1,16 @@
 """Apple Sign-In service for token verification."""
 
 import logging
+import httpx
 import jwt
 from typing import Optional
 from datetime import datetime, timezone
 from pydantic import BaseModel
 
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+
 from ..core.config import Settings
+from ..core.jwks import JWKSCache, apple_jwks
 from .exceptions import AppleSignInError
 
 logger = logging.getLogger(__name__)
@@ -27,20 +31,19 @@ class AppleUserInfo(BaseModel):
 class AppleSignInService:
     """Service for handling Apple Sign-In token verification."""
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, jwks: JWKSCache = apple_jwks):
         self.settings = settings
-        self.apple_public_keys = {}  # Cache for Apple's public keys
-        self.keys_last_updated = None
+        self.jwks = jwks  # Process-wide cache of Apple's public keys
 
     async def verify_identity_token(self, identity_token: str) -> AppleUserInfo:
         """
         Verify Apple identity token and return user information.
         
-        In production, this would:
-        1. Fetch Apple's public keys from https://appleid.apple.com/auth/keys
-        2. Verify the JWT signature using Apple's public keys
-        3. Validate the token claims (audience, issuer, expiration)
-        4. Return the user information
+        In production this:
+        1. Looks up Apple's public key for the token's key ID in the JWKS cache
+        2. Verifies the JWT signature using that key
+        3. Validates the token claims (audience, issuer, expiration)
+        4. Returns the user information
         
         For development, we'll implement a simplified version.
         """
@@ -146,24 +149,21 @@ class AppleSignInService:
             logger.warning(f"Invalid Apple token: {e}")
             raise AppleSignInError("Invalid token")
 
-    async def _get_apple_public_key(self, key_id: str) -> str:
+    async def _get_apple_public_key(self, key_id: str) -> RSAPublicKey:
         """
-        Fetch Apple's public key for token verification.
-        In production, this would fetch from Apple's JWKS endpoint.
+        Get Apple's public key for token verification.
+        Keys come from the JWKS cache, which refetches once for unknown key IDs.
         """
-        # TODO: Implement actual fetching from Apple's JWKS endpoint
-        # https://appleid.apple.com/auth/keys
-        
-        # For now, return a placeholder
-        logger.warning("Apple public key fetching not implemented - using placeholder")
+        try:
+            public_key = await self.jwks.get_key(key_id)
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching Apple JWKs: {e}")
+            raise AppleSignInError("Failed to fetch Apple verification keys")
         
-        # In production, you would:
-        # 1. Check if we have cached keys and they're not expired
-        # 2. If not, fetch from https://appleid.apple.com/auth/keys
-        # 3. Parse the JWKS response and find the key with matching kid
-        # 4. Convert to PEM format and return
+        if public_key is None:
+            raise AppleSignInError(f"Unknown Apple signing key: {key_id}")
         
-        raise AppleSignInError("Apple public key verification not implemented")
+        return public_key
 
     def _validate_token_claims(self, payload: dict) -> None:
         """Validate additional Apple token claims."""
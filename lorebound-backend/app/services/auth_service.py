@@ -10,14 +10,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import Settings
 from ..core.security import (
-    get_password_hash, 
-    verify_password, 
     create_access_token, 
     create_refresh_token,
     verify_token
 )
+from ..core.password_hashing import password_hasher
+from ..core.refresh_tokens import refresh_token_store
+from ..core.token_cache import verified_token_cache
+from ..core.token_revocation import token_revocation_list
+from ..core.user_cache import user_principal_cache
 from ..domain.enums import UserStatus
 from ..domain.models import User
+from ..repositories.inventory_repo import InventoryRepository
 from ..repositories.user_repo import UserRepository
 from ..schemas.auth import (
     UserRegisterRequest,
@@ -34,7 +38,8 @@ from .exceptions import (
     UserAlreadyExistsError,
     UserNotFoundError,
     InvalidCredentialsError,
-    TokenExpiredError
+    TokenExpiredError,
+    AppleSignInError
 )
 
 logger = logging.getLogger(__name__)
@@ -64,58 +69,32 @@ class AuthenticationService:
         # Normalize email to lowercase
         normalized_email = registration_data.email.lower().strip()
 
-        # Check if user already exists
-        existing_user = await self.user_repo.get_user_by_email(normalized_email)
-        if existing_user:
-            logger.warning(f"Registration attempt for existing email: {normalized_email}")
-            raise UserAlreadyExistsError("User with this email already exists")
-
-        # Check if handle is already taken
-        existing_handle = await self.user_repo.get_profile_by_handle(registration_data.handle)
-        if existing_handle:
-            logger.warning(f"Registration attempt for existing handle: {registration_data.handle}")
-            raise UserAlreadyExistsError("Handle is already taken")
-
         try:
             # Hash password
-            password_hash = get_password_hash(registration_data.password)
+            password_hash = await password_hasher.hash(registration_data.password)
 
-            # Create user
-            user = await self.user_repo.create_user(
+            # Create user, profile and equipped base items in one statement
+            starter_item_ids = await InventoryRepository(session).get_starter_item_ids()
+            user, conflict = await self.user_repo.register_user(
                 email=normalized_email,
-                password_hash=password_hash
-            )
-            
-            # Create profile for the user
-            await self.user_repo.create_profile(
-                user_id=user.id,
-                handle=registration_data.handle
+                password_hash=password_hash,
+                handle=registration_data.handle,
+                starter_item_ids=starter_item_ids
             )
-
-            # Give base items to new user
-            from ..repositories.inventory_repo import InventoryRepository
-            inventory_repo = InventoryRepository(session)
-            base_item_slugs = ["leather_cap", "travelers_tunic", "iron_sword", "wooden_shield"]
             
-            for item_slug in base_item_slugs:
-                item = await inventory_repo.get_item_by_slug(item_slug)
-                if item:
-                    # Add to inventory, equip the base items
-                    await inventory_repo.add_item_to_inventory(
-                        user_id=user.id,
-                        item_id=item.id,
-                        equipped=True
-                    )
-                    logger.info(f"Added base item '{item.name}' to new user {user.id}")
-
-            # Update last login
-            await self.user_repo.update_user_login_time(user.id)
+            if conflict:
+                await session.rollback()
+                if conflict == "email":
+                    logger.warning(f"Registration attempt for existing email: {normalized_email}")
+                    raise UserAlreadyExistsError("User with this email already exists")
+                logger.warning(f"Registration attempt for existing handle: {registration_data.handle}")
+                raise UserAlreadyExistsError("Handle is already taken")
 
             # Commit the transaction
             await session.commit()
 
             # Generate tokens
-            tokens = self._generate_token_pair(user)
+            tokens = await self._generate_token_pair(user)
 
             logger.info(f"Successfully registered user: {user.id}")
             return AuthResponse(
@@ -123,6 +102,8 @@ class AuthenticationService:
                 user=UserResponse.model_validate(user)
             )
 
+        except UserAlreadyExistsError:
+            raise
         except Exception as e:
             logger.error(f"Failed to register user: {e}")
             await session.rollback()
@@ -151,7 +132,7 @@ class AuthenticationService:
             raise InvalidCredentialsError("Account is not active")
 
         # Verify password
-        if not verify_password(login_data.password, user.password_hash):
+        if not await password_hasher.verify(login_data.password, user.password_hash):
             logger.warning(f"Invalid password for user: {user.id}")
             raise InvalidCredentialsError("Invalid email or password")
 
@@ -161,9 +142,11 @@ class AuthenticationService:
 
             # Commit the transaction
             await session.commit()
+            # Only now can a cache miss reload the new login time
+            await user_principal_cache.invalidate(user.id)
 
             # Generate tokens
-            tokens = self._generate_token_pair(user)
+            tokens = await self._generate_token_pair(user)
 
             logger.info(f"Successfully logged in user: {user.id}")
             return AuthResponse(
@@ -214,33 +197,27 @@ class AuthenticationService:
                 if not handle:
                     handle = f"Player_{apple_user_info.sub[:8]}"
 
-                # Ensure handle is unique
-                counter = 1
-                original_handle = handle
-                while await self.user_repo.get_profile_by_handle(handle):
-                    handle = f"{original_handle}_{counter}"
-                    counter += 1
-
                 # Create user with Apple sub
                 user = await self.user_repo.create_user(
                     apple_sub=apple_user_info.sub,
                     email=apple_user_info.email
                 )
                 
-                # Create profile for the user
-                await self.user_repo.create_profile(
-                    user_id=user.id,
-                    handle=handle
-                )
+                # Create profile for the user under a free variant of the handle
+                handle = await self.user_repo.create_profile_with_free_handle(user.id, handle)
+                if handle is None:
+                    raise AppleSignInError("Could not allocate a handle")
 
                 # Update last login
                 await self.user_repo.update_user_login_time(user.id)
 
             # Commit the transaction
             await session.commit()
+            # Only now can a cache miss reload the new login time
+            await user_principal_cache.invalidate(user.id)
 
             # Generate tokens
-            tokens = self._generate_token_pair(user)
+            tokens = await self._generate_token_pair(user)
 
             logger.info(f"Apple Sign-In successful for user: {user.id}")
             return AuthResponse(
@@ -264,6 +241,8 @@ class AuthenticationService:
         try:
             # Verify refresh token
             payload = verify_token(refresh_data.refresh_token, token_type="refresh")
+            if token_revocation_list.is_revoked(payload):
+                raise InvalidCredentialsError("Refresh token has been revoked")
             user_id = UUID(payload.get("user_id"))
 
             # Get user to ensure they still exist and are active
@@ -276,8 +255,18 @@ class AuthenticationService:
                 logger.warning(f"Token refresh for inactive user: {user_id}")
                 raise InvalidCredentialsError("Account is not active")
 
+            # Rotate the token family; tokens issued before families existed
+            # start a new one
+            family_id = payload.get("fam")
+            token_id = None
+            if family_id:
+                token_id = await refresh_token_store.rotate(family_id, payload.get("jti", ""))
+                if token_id is None:
+                    logger.warning(f"Stale or reused refresh token for user: {user_id}")
+                    raise InvalidCredentialsError("Refresh token is no longer valid")
+
             # Generate new token pair
-            tokens = self._generate_token_pair(user)
+            tokens = await self._generate_token_pair(user, family_id, token_id)
 
             logger.info(f"Token refresh successful for user: {user_id}")
             return tokens
@@ -285,6 +274,8 @@ class AuthenticationService:
         except TokenExpiredError:
             logger.warning("Token refresh attempted with expired token")
             raise InvalidCredentialsError("Refresh token has expired")
+        except InvalidCredentialsError:
+            raise
         except Exception as e:
             logger.error(f"Token refresh failed: {e}")
             raise AuthenticationError("Token refresh failed")
@@ -297,7 +288,9 @@ class AuthenticationService:
         """Get current user from access token."""
         try:
             # Verify access token
-            payload = verify_token(access_token, token_type="access")
+            payload = verified_token_cache.verify(access_token)
+            if token_revocation_list.is_revoked(payload):
+                raise InvalidCredentialsError("Access token has been revoked")
             user_id = UUID(payload.get("user_id"))
 
             # Get user from database
@@ -314,16 +307,31 @@ class AuthenticationService:
             logger.warning(f"Failed to get current user: {e}")
             raise InvalidCredentialsError("Invalid access token")
 
-    def _generate_token_pair(self, user: User) -> TokenResponse:
-        """Generate access and refresh token pair for user."""
+    async def _generate_token_pair(
+        self,
+        user: User,
+        family_id: Optional[str] = None,
+        token_id: Optional[str] = None
+    ) -> TokenResponse:
+        """
+        Generate access and refresh token pair for user.
+        
+        Without a family a new one is started, i.e. a new sign-in session.
+        """
+        if not family_id or not token_id:
+            family_id, token_id = await refresh_token_store.start_family(user.id)
+        
         access_token = create_access_token(
             subject=user.email or user.apple_sub,
-            user_id=user.id
+            user_id=user.id,
+            family_id=family_id
         )
         
         refresh_token = create_refresh_token(
             subject=user.email or user.apple_sub,
-            user_id=user.id
+            user_id=user.id,
+            family_id=family_id,
+            token_id=token_id
         )
 
         return TokenResponse(
@@ -333,13 +341,19 @@ class AuthenticationService:
             expires_in=self.settings.access_token_ttl_seconds
         )
 
+    async def revoke_session_tokens(self, access_token: str, user_id: UUID) -> None:
+        """Revoke the tokens of the sign-in session an access token belongs to."""
+        family_id = verified_token_cache.verify(access_token).get("fam")
+        if family_id:
+            await refresh_token_store.revoke_family(family_id)
+        else:
+            # Tokens issued before families existed can only be revoked together
+            await token_revocation_list.revoke_user(user_id)
+
     async def revoke_user_tokens(self, user_id: UUID, session: AsyncSession) -> None:
-        """Revoke all tokens for a user (for logout/security purposes)."""
-        # In a more sophisticated implementation, you would maintain a 
-        # blacklist of tokens or token versions in Redis/database
-        # For now, we'll just log the action
+        """Revoke all tokens for a user, in every session (for security purposes)."""
         logger.info(f"Token revocation requested for user: {user_id}")
-        # TODO: Implement token blacklist in Redis
+        await token_revocation_list.revoke_user(user_id)
 
 
 # Dependency for getting authentication service
@@ -111,6 +111,11 @@ class RankingCalculationError(LeaderboardError):
     pass
 
 
+class LeaderboardPeriodNotFoundError(LeaderboardError):
+    """Raised when a leaderboard period has not been archived."""
+    pass
+
+
 class ProfileError(ServiceError):
     """Base exception for profile service errors."""
     pass
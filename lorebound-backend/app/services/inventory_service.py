@@ -9,31 +9,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..repositories.inventory_repo import InventoryRepository
 from ..domain.models import Item, Inventory
-from ..domain.enums import ItemRarity
+from ..domain.enums import ItemRarity, ItemSlot
 from .exceptions import InventoryError, ItemNotFoundError
+from .item_catalog import item_catalog_cache
+from .rewards import rarity_mask, reward_engine
 
 logger = logging.getLogger(__name__)
 
 
-# Rarity drop rates (percentages)
-RARITY_DROP_RATES = {
-    "normal_run": {
-        ItemRarity.COMMON: 0.50,      # 50%
-        ItemRarity.UNCOMMON: 0.30,    # 30%
-        ItemRarity.RARE: 0.15,        # 15%
-        ItemRarity.EPIC: 0.04,        # 4%
-        ItemRarity.LEGENDARY: 0.01,    # 1%
-    },
-    "daily_challenge": {
-        ItemRarity.COMMON: 0.10,      # 10%
-        ItemRarity.UNCOMMON: 0.25,    # 25%
-        ItemRarity.RARE: 0.40,        # 40%
-        ItemRarity.EPIC: 0.20,        # 20%
-        ItemRarity.LEGENDARY: 0.05,    # 5%
-    },
-}
-
-
 class InventoryService:
     """Service for managing user inventory and item rewards."""
 
@@ -103,6 +86,35 @@ class InventoryService:
             logger.error(f"Error getting inventory for user {user_id}: {e}")
             raise InventoryError(f"Failed to get inventory: {str(e)}")
 
+    async def get_inventory_summary(
+        self,
+        user_id: UUID,
+        session: AsyncSession
+    ) -> Dict[str, Any]:
+        """
+        Get counts of a user's items by slot and rarity and their equipped stats.
+        
+        Args:
+            user_id: User unique identifier
+            session: Database session
+            
+        Returns:
+            Dictionary with item counts and total equipped stats
+        """
+        inventory_repo = InventoryRepository(session)
+        
+        try:
+            catalog = await item_catalog_cache.get(session)
+            summary = await inventory_repo.get_inventory_summary(user_id)
+            
+            # Stats of the equipped items come from the cached catalog
+            summary["equipped_stats"] = catalog.total_stats(summary.pop("equipped_item_ids"))
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Error getting inventory summary for user {user_id}: {e}")
+            raise InventoryError(f"Failed to get inventory summary: {str(e)}")
+
     async def equip_item(
         self,
         user_id: UUID,
@@ -144,6 +156,50 @@ class InventoryService:
             logger.error(f"Error equipping item for user {user_id}: {e}")
             raise InventoryError(f"Failed to equip item: {str(e)}")
 
+    async def set_loadout(
+        self,
+        user_id: UUID,
+        loadout: Dict[ItemSlot, Optional[UUID]],
+        session: AsyncSession
+    ) -> Dict[str, Any]:
+        """
+        Equip a set of items by slot at once.
+        
+        Args:
+            user_id: User unique identifier
+            loadout: Item to equip per slot, None to empty the slot
+            session: Database session
+            
+        Returns:
+            The changed slots and the total equipped stats
+        """
+        inventory_repo = InventoryRepository(session)
+        
+        try:
+            catalog = await item_catalog_cache.get(session)
+            result = await inventory_repo.set_loadout(user_id, loadout)
+            if result is None:
+                raise InventoryError("Failed to set loadout - user may not own an item or it doesn't fit the slot")
+            
+            equipped, changed_slots = result
+            logger.info(f"User {user_id} changed loadout slots: {sorted(slot.value for slot in changed_slots)}")
+            
+            changed_loadout = {}
+            for slot in changed_slots:
+                item = catalog.get(equipped[slot]) if slot in equipped else None
+                changed_loadout[slot.value] = item.to_dict() if item else None
+            
+            return {
+                "loadout": changed_loadout,
+                "equipped_stats": catalog.total_stats(equipped.values())
+            }
+            
+        except InventoryError:
+            raise
+        except Exception as e:
+            logger.error(f"Error setting loadout for user {user_id}: {e}")
+            raise InventoryError(f"Failed to set loadout: {str(e)}")
+
     async def distribute_run_rewards(
         self,
         user_id: UUID,
@@ -165,94 +221,85 @@ class InventoryService:
         Returns:
             List of rewarded items
         """
-        inventory_repo = InventoryRepository(session)
-        
         try:
             # Determine number of reward items based on performance
             num_items = self._calculate_num_rewards(is_victory, is_daily_challenge, score)
             
             # Determine rarity distribution
-            rarity_type = "daily_challenge" if is_daily_challenge else "normal_run"
-            drop_rates = RARITY_DROP_RATES[rarity_type]
-            
-            # Get all items grouped by rarity
-            all_items = await inventory_repo.list_all_items()
-            items_by_rarity = {}
-            for item in all_items:
-                if item.rarity not in items_by_rarity:
-                    items_by_rarity[item.rarity] = []
-                items_by_rarity[item.rarity].append(item)
+            drop_table = "daily_challenge" if is_daily_challenge else "normal_run"
             
-            # Get user's current inventory to avoid duplicates
-            user_inventory = await inventory_repo.get_user_inventory(user_id)
-            owned_item_ids = {inv.item_id for inv in user_inventory}
-            
-            # Select reward items
-            rewarded_items = []
-            for _ in range(num_items):
-                # Roll for rarity
-                rarity = self._roll_rarity(drop_rates)
-                
-                # Get available items of this rarity that user doesn't own
-                available_items = [
-                    item for item in items_by_rarity.get(rarity, [])
-                    if item.id not in owned_item_ids
-                ]
-                
-                if not available_items:
-                    # If no items of this rarity available, try other rarities
-                    logger.warning(f"No available items of rarity {rarity} for user {user_id}, trying other rarities...")
-                    
-                    # Try all rarities in order: Uncommon, Rare, Epic, Legendary, Common
-                    fallback_order = [ItemRarity.UNCOMMON, ItemRarity.RARE, ItemRarity.EPIC, ItemRarity.LEGENDARY, ItemRarity.COMMON]
-                    
-                    for fallback_rarity in fallback_order:
-                        if fallback_rarity == rarity:
-                            continue  # Skip the one we already tried
-                        
-                        available_items = [
-                            item for item in items_by_rarity.get(fallback_rarity, [])
-                            if item.id not in owned_item_ids
-                        ]
-                        
-                        if available_items:
-                            rarity = fallback_rarity
-                            logger.info(f"Found {len(available_items)} available {fallback_rarity} items as fallback")
-                            break
-                    
-                    if not available_items:
-                        logger.warning(f"No available items of any rarity for user {user_id}, skipping reward")
-                        continue
-                
-                # Randomly select an item
-                selected_item = random.choice(available_items)
-                
-                # Add to user's inventory
-                await inventory_repo.add_item_to_inventory(
-                    user_id=user_id,
-                    item_id=selected_item.id,
-                    equipped=False
-                )
-                
-                owned_item_ids.add(selected_item.id)
-                rewarded_items.append({
-                    "id": str(selected_item.id),
-                    "slug": selected_item.slug,
-                    "name": selected_item.name,
-                    "slot": selected_item.slot.value if hasattr(selected_item.slot, 'value') else str(selected_item.slot),
-                    "rarity": selected_item.rarity.value if hasattr(selected_item.rarity, 'value') else str(selected_item.rarity),
-                    "stats": selected_item.stats
-                })
-                
-                rarity_str = selected_item.rarity.value if hasattr(selected_item.rarity, 'value') else str(selected_item.rarity)
-                logger.info(f"Rewarded {selected_item.name} ({rarity_str}) to user {user_id}")
-            
-            return rewarded_items
+            return await self._grant_random_items(user_id, num_items, drop_table, session)
             
         except Exception as e:
             logger.error(f"Error distributing rewards to user {user_id}: {e}")
             raise InventoryError(f"Failed to distribute rewards: {str(e)}")
 
+    async def distribute_level_up_rewards(
+        self,
+        user_id: UUID,
+        levels_gained: List[int],
+        session: AsyncSession
+    ) -> List[Dict[str, Any]]:
+        """
+        Distribute one item reward for each level gained.
+        
+        Args:
+            user_id: User unique identifier
+            levels_gained: Levels the user just reached
+            session: Database session
+            
+        Returns:
+            List of rewarded items
+        """
+        try:
+            return await self._grant_random_items(user_id, len(levels_gained), "level_up", session)
+            
+        except Exception as e:
+            logger.error(f"Error distributing level up rewards to user {user_id}: {e}")
+            raise InventoryError(f"Failed to distribute level up rewards: {str(e)}")
+
+    async def _grant_random_items(
+        self,
+        user_id: UUID,
+        num_items: int,
+        drop_table: str,
+        session: AsyncSession
+    ) -> List[Dict[str, Any]]:
+        """Roll items the user doesn't own yet from a drop table and add them to the inventory."""
+        if num_items == 0:
+            return []
+        
+        inventory_repo = InventoryRepository(session)
+        
+        # Items grouped by rarity, cached per process
+        catalog = await item_catalog_cache.get(session)
+        
+        # Get user's current items to avoid duplicates
+        owned = catalog.owned_mask(await inventory_repo.get_owned_item_ids(user_id))
+        
+        # Select reward items
+        rewarded_items = []
+        for _ in range(num_items):
+            # Roll for rarity among those with items the user doesn't own
+            available = rarity_mask(
+                rarity for rarity in ItemRarity if catalog.has_unowned(rarity, owned)
+            )
+            rarity = reward_engine.roll_rarity(drop_table, available)
+            if rarity is None:
+                logger.warning(f"No available items of any rarity for user {user_id}, skipping reward")
+                break
+            
+            # Randomly select an item
+            selected_item = random.choice(catalog.unowned(rarity, owned))
+            owned = catalog.with_owned(selected_item, owned)
+            rewarded_items.append(selected_item)
+            logger.info(f"Rewarded {selected_item.name} ({selected_item.rarity.value}) to user {user_id}")
+        
+        # Add to user's inventory
+        await inventory_repo.add_items_to_inventory(user_id, [item.id for item in rewarded_items])
+        
+        return [item.to_dict() for item in rewarded_items]
+
     def _calculate_num_rewards(self, is_victory: bool, is_daily_challenge: bool, score: int) -> int:
         """Calculate number of reward items based on performance."""
         if not is_victory:
@@ -271,16 +318,3 @@ class InventoryService:
         
         return min(base_items, 3)  # Cap at 3 items per run
 
-    def _roll_rarity(self, drop_rates: Dict[ItemRarity, float]) -> ItemRarity:
-        """Roll for item rarity based on drop rates."""
-        roll = random.random()
-        cumulative = 0.0
-        
-        for rarity, rate in drop_rates.items():
-            cumulative += rate
-            if roll < cumulative:
-                return rarity
-        
-        # Fallback to common if something went wrong
-        return ItemRarity.COMMON
-
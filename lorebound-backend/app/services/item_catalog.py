@@ -0,0 +1,180 @@
+"""Immutable in-process snapshot of the item catalog."""
+
+import logging
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import SingleFlight
+from ..core.metrics import record_cache
+from ..core.redis_client import RedisClient, redis_client
+from ..domain.enums import ItemRarity, ItemSlot
+from ..repositories.inventory_repo import InventoryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogItem(BaseModel):
+    """An item of the catalog."""
+    
+    id: UUID
+    slug: str
+    name: str
+    slot: ItemSlot
+    rarity: ItemRarity
+    stats: Dict[str, Any]
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for API responses."""
+        return {
+            "id": str(self.id),
+            "slug": self.slug,
+            "name": self.name,
+            "slot": self.slot.value,
+            "rarity": self.rarity.value,
+            "stats": dict(self.stats)
+        }
+
+
+class ItemCatalog:
+    """
+    One version of the item catalog, grouped by rarity and slot.
+    
+    Never modified after construction, so it is shared freely between
+    requests. Each item has a position in the catalog, which lets a user's
+    owned items be held as a single integer bitmask.
+    """
+    
+    def __init__(self, items: Iterable[CatalogItem], version: int):
+        self.version = version
+        self.items: Tuple[CatalogItem, ...] = tuple(sorted(items, key=lambda item: item.slug))
+        self._positions: Mapping[UUID, int] = MappingProxyType(
+            {item.id: position for position, item in enumerate(self.items)}
+        )
+        self.by_rarity: Mapping[ItemRarity, Tuple[CatalogItem, ...]] = self._group(lambda item: item.rarity)
+        self.by_slot: Mapping[ItemSlot, Tuple[CatalogItem, ...]] = self._group(lambda item: item.slot)
+        self._rarity_masks: Mapping[ItemRarity, int] = MappingProxyType({
+            rarity: self.owned_mask(item.id for item in items)
+            for rarity, items in self.by_rarity.items()
+        })
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def get(self, item_id: UUID) -> Optional[CatalogItem]:
+        """Get an item by ID."""
+        position = self._positions.get(item_id)
+        return None if position is None else self.items[position]
+    
+    def owned_mask(self, item_ids: Iterable[UUID]) -> int:
+        """Pack a set of item IDs into a bitmask over catalog positions."""
+        mask = 0
+        for item_id in item_ids:
+            position = self._positions.get(item_id)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+    
+    def is_owned(self, item: CatalogItem, owned_mask: int) -> bool:
+        """Check whether an item is in an owned-item bitmask."""
+        return bool(owned_mask >> self._positions[item.id] & 1)
+    
+    def with_owned(self, item: CatalogItem, owned_mask: int) -> int:
+        """Add an item to an owned-item bitmask."""
+        return owned_mask | 1 << self._positions[item.id]
+    
+    def total_stats(self, item_ids: Iterable[UUID]) -> Dict[str, float]:
+        """Sum the numeric stats of a set of items, e.g. a loadout."""
+        totals: Dict[str, float] = {}
+        for item_id in item_ids:
+            item = self.get(item_id)
+            if item is None:
+                continue
+            for stat_name, stat_value in item.stats.items():
+                if isinstance(stat_value, (int, float)):
+                    totals[stat_name] = totals.get(stat_name, 0) + stat_value
+        return totals
+    
+    def has_unowned(self, rarity: ItemRarity, owned_mask: int) -> bool:
+        """Check whether any item of a rarity is missing from an owned-item bitmask."""
+        return bool(self._rarity_masks.get(rarity, 0) & ~owned_mask)
+    
+    def unowned(self, rarity: ItemRarity, owned_mask: int) -> List[CatalogItem]:
+        """Items of a rarity missing from an owned-item bitmask."""
+        return [item for item in self.by_rarity.get(rarity, ()) if not self.is_owned(item, owned_mask)]
+    
+    def _group(self, key) -> Mapping[Any, Tuple[CatalogItem, ...]]:
+        """Group items by a key into a read-only mapping of tuples."""
+        groups: Dict[Any, List[CatalogItem]] = {}
+        for item in self.items:
+            groups.setdefault(key(item), []).append(item)
+        return MappingProxyType({group: tuple(items) for group, items in groups.items()})
+
+
+class ItemCatalogCache:
+    """
+    Process-wide item catalog, reloaded when its version changes.
+    
+    The version is a Redis counter bumped by the seeding scripts. It is
+    checked at most every VERSION_CHECK_INTERVAL seconds, so reads in between
+    touch neither Redis nor the database.
+    """
+    
+    VERSION_KEY = "item_catalog:version"
+    VERSION_CHECK_INTERVAL = 30
+    
+    def __init__(self, redis: RedisClient = redis_client):
+        self.redis = redis
+        self._catalog: Optional[ItemCatalog] = None
+        self._checked_at = 0.0
+        self._single_flight = SingleFlight()
+    
+    @classmethod
+    async def bump_version(cls, redis: RedisClient) -> int:
+        """Make every process reload the catalog on its next version check."""
+        return await redis.increment(cls.VERSION_KEY)
+    
+    async def get(self, session: AsyncSession) -> ItemCatalog:
+        """Get the current catalog, loading it if missing or outdated."""
+        if self._catalog is not None and time.monotonic() - self._checked_at < self.VERSION_CHECK_INTERVAL:
+            record_cache("item_catalog", hit=True)
+            return self._catalog
+        return await self._single_flight.do("item_catalog", lambda: self._refresh(session))
+    
+    def clear(self) -> None:
+        """Drop the cached catalog."""
+        self._catalog = None
+        self._checked_at = 0.0
+    
+    async def _refresh(self, session: AsyncSession) -> ItemCatalog:
+        """Reload the catalog if its version moved on."""
+        try:
+            version = int(await self.redis.get(self.VERSION_KEY) or 0)
+        except Exception as e:
+            logger.warning(f"Item catalog version check failed: {e}")
+            if self._catalog is not None:
+                self._checked_at = time.monotonic()
+                return self._catalog
+            # Unknown version: reloaded once the real one can be read
+            version = -1
+        
+        record_cache("item_catalog", hit=self._catalog is not None and self._catalog.version == version)
+        if self._catalog is None or self._catalog.version != version:
+            items = await InventoryRepository(session).list_all_items()
+            self._catalog = ItemCatalog(
+                (CatalogItem.model_validate(item) for item in items), version
+            )
+            logger.info(f"Loaded item catalog version {version} with {len(self._catalog)} items")
+        
+        self._checked_at = time.monotonic()
+        return self._catalog
+
+
+# Global item catalog cache instance
+item_catalog_cache = ItemCatalogCache()
@@ -0,0 +1,114 @@
+"""Live leaderboard change events fanned out from Redis pub/sub."""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Optional, Set
+
+from ..core.redis_client import RedisClient, pubsub_redis_client
+from ..domain.enums import LeaderboardScope
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderboardEventHub:
+    """
+    Single Redis subscriber per process that fans leaderboard events out to
+    local SSE subscribers.
+    
+    Each subscriber is only a small bounded queue, so idle connections cost a
+    few hundred bytes and no Redis connection of their own.
+    """
+    
+    CHANNEL_PREFIX = "leaderboard_events"
+    
+    # Slow clients lose their oldest events instead of growing memory
+    SUBSCRIBER_QUEUE_SIZE = 100
+    RECONNECT_DELAY = 1.0
+    
+    def __init__(self, redis: RedisClient = pubsub_redis_client):
+        self.redis = redis
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._consumer: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def channel_for(cls, scope: LeaderboardScope) -> str:
+        """Get the pub/sub channel of a scope."""
+        return f"{cls.CHANNEL_PREFIX}:{scope.value}"
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Number of local subscribers across all scopes."""
+        return sum(len(queues) for queues in self._subscribers.values())
+    
+    def subscribe(self, scope: LeaderboardScope) -> asyncio.Queue:
+        """Register a subscriber for a scope, starting the consumer on first use."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(scope.value, set()).add(queue)
+        
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self._consume())
+        
+        return queue
+    
+    def unsubscribe(self, scope: LeaderboardScope, queue: asyncio.Queue) -> None:
+        """Remove a subscriber."""
+        queues = self._subscribers.get(scope.value)
+        if queues is None:
+            return
+        
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[scope.value]
+    
+    def dispatch(self, scope: str, event: Dict) -> None:
+        """Deliver an event to every local subscriber of a scope."""
+        for queue in self._subscribers.get(scope, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+    
+    async def stop(self) -> None:
+        """Stop the consumer task."""
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+    
+    async def _consume(self) -> None:
+        """Read every scope's channel from one pub/sub connection, reconnecting on errors."""
+        while True:
+            pubsub = None
+            try:
+                pubsub = await self.redis.pubsub()
+                await pubsub.psubscribe(f"{self.CHANNEL_PREFIX}:*")
+                logger.info("Leaderboard event consumer subscribed")
+                
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    
+                    scope = message["channel"].rsplit(":", 1)[-1]
+                    try:
+                        self.dispatch(scope, json.loads(message["data"]))
+                    except (json.JSONDecodeError, TypeError):
+                        logger.warning(f"Dropping malformed leaderboard event on {message['channel']}")
+            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Leaderboard event consumer error, reconnecting: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.reset()
+                    except Exception:
+                        pass
+
+
+# Global hub instance
+leaderboard_event_hub = LeaderboardEventHub()
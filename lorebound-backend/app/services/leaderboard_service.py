@@ -2,6 +2,7 @@
 
 import json
 import logging
+import math
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
@@ -9,9 +10,11 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..domain.enums import LeaderboardScope
-from ..domain.models import Score, User
-from ..repositories.leaderboard_repo import LeaderboardRepository
+from ..repositories.leaderboard_repo import LeaderboardRepository, GLOBAL_BOARD
 from ..core.redis_client import RedisClient
+from ..core.cache import get_or_compute
+from .leaderboard_events import LeaderboardEventHub
+from .exceptions import LeaderboardPeriodNotFoundError
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,38 @@ class LeaderboardService:
     KEY_PREFIX_LEADERBOARD = "leaderboard"
     KEY_PREFIX_USER_RANK = "user_rank"
     KEY_PREFIX_STATS = "leaderboard_stats"
+    KEY_PREFIX_GENERATION = "leaderboard_gen"
+    KEY_PREFIX_SNAPSHOT = "leaderboard_snapshot"
+    KEY_PREFIX_HISTOGRAM = "leaderboard_hist"
+    KEY_PREFIX_FRIENDS = "leaderboard_friends"
+    KEY_PREFIX_ARCHIVE = "leaderboard_archive"
+    
+    # Generation counters only need to outlive the longest period (one ISO week)
+    GENERATION_TTL = 60 * 60 * 24 * 8
+    
+    ALL_SCOPES = (LeaderboardScope.TODAY, LeaderboardScope.WEEKLY, LeaderboardScope.ALLTIME)
+    
+    # Materialized snapshots cover the first pages of every board and stay in
+    # Redis for several refresh intervals of the snapshot task
+    SNAPSHOT_SIZE = 500
+    SNAPSHOT_CACHE_TTL = 300
+    # Snapshots are rebuilt every minute; older ones mean the task is failing
+    # and reads go to the live query instead
+    SNAPSHOT_MAX_AGE = timedelta(minutes=5)
+    
+    # Players are counted in logarithmic score buckets about 5% wide; ranks
+    # beyond TOP_K_EXACT are estimated from the bucket counts
+    HISTOGRAM_GROWTH = 1.05
+    TOP_K_EXACT = 1000
+    
+    # Finished periods are frozen once no in-flight run can still land in them;
+    # archives keep every exactly ranked entry and never change afterwards
+    ROLLOVER_SCOPES = (LeaderboardScope.TODAY, LeaderboardScope.WEEKLY)
+    ROLLOVER_GRACE = timedelta(minutes=2)
+    # Periods missed while the beat was down are caught up to this many per run
+    ROLLOVER_MAX_CATCH_UP = 14
+    ARCHIVE_SIZE = TOP_K_EXACT
+    ARCHIVE_CACHE_TTL = 60 * 60 * 24
     
     def __init__(self, session: AsyncSession, redis: RedisClient):
         self.session = session
@@ -35,18 +70,9 @@ class LeaderboardService:
         self.repo = LeaderboardRepository(session)
     
     async def invalidate_all_caches(self):
-        """Invalidate all leaderboard caches."""
+        """Invalidate all leaderboard caches for the current periods."""
         try:
-            # Delete all leaderboard cache keys
-            pattern = f"{self.KEY_PREFIX_LEADERBOARD}:*"
-            await self.redis.delete_pattern(pattern)
-            
-            pattern = f"{self.KEY_PREFIX_USER_RANK}:*"
-            await self.redis.delete_pattern(pattern)
-            
-            pattern = f"{self.KEY_PREFIX_STATS}:*"
-            await self.redis.delete_pattern(pattern)
-            
+            await self._bump_generations(self.ALL_SCOPES)
             logger.info("Invalidated all leaderboard caches")
         except Exception as e:
             logger.warning(f"Failed to invalidate caches: {e}")
@@ -60,8 +86,10 @@ class LeaderboardService:
         - weekly: "2025-W43"
         - alltime: "alltime"
         """
-        now = datetime.now(timezone.utc)
-        
+        return self.get_period_key(scope, datetime.now(timezone.utc))
+    
+    def get_period_key(self, scope: LeaderboardScope, now: datetime) -> str:
+        """Generate the key of the period containing a point in time."""
         if scope == LeaderboardScope.TODAY:
             return now.strftime("%Y-%m-%d")
         elif scope == LeaderboardScope.WEEKLY:
@@ -83,41 +111,112 @@ class LeaderboardService:
             return self.CACHE_TTL_ALLTIME
         return self.CACHE_TTL_ALLTIME
     
-    def _make_leaderboard_cache_key(self, scope: str, period_key: str, limit: int, offset: int) -> str:
+    def _make_generation_key(self, scope: str, period_key: str) -> str:
+        """Generate key for the cache generation counter of a period."""
+        return f"{self.KEY_PREFIX_GENERATION}:{scope}:{period_key}"
+    
+    def _make_leaderboard_cache_key(
+        self, scope: str, period_key: str, board: str, generation: int, limit: int, offset: int
+    ) -> str:
         """Generate cache key for leaderboard."""
-        return f"{self.KEY_PREFIX_LEADERBOARD}:{scope}:{period_key}:{limit}:{offset}"
+        return f"{self.KEY_PREFIX_LEADERBOARD}:{scope}:{period_key}:{board}:v{generation}:{limit}:{offset}"
     
-    def _make_user_rank_cache_key(self, user_id: UUID, scope: str, period_key: str) -> str:
+    def _make_user_rank_cache_key(
+        self, user_id: UUID, scope: str, period_key: str, board: str, generation: int
+    ) -> str:
         """Generate cache key for user rank."""
-        return f"{self.KEY_PREFIX_USER_RANK}:{user_id}:{scope}:{period_key}"
+        return f"{self.KEY_PREFIX_USER_RANK}:{user_id}:{scope}:{period_key}:{board}:v{generation}"
+    
+    def _make_friends_cache_key(
+        self, user_id: UUID, scope: str, period_key: str, board: str, generation: int
+    ) -> str:
+        """Generate cache key for a user's friends leaderboard."""
+        return f"{self.KEY_PREFIX_FRIENDS}:{user_id}:{scope}:{period_key}:{board}:v{generation}"
     
-    def _make_stats_cache_key(self, scope: str, period_key: str) -> str:
+    def _make_stats_cache_key(self, scope: str, period_key: str, generation: int) -> str:
         """Generate cache key for leaderboard stats."""
-        return f"{self.KEY_PREFIX_STATS}:{scope}:{period_key}"
+        return f"{self.KEY_PREFIX_STATS}:{scope}:{period_key}:v{generation}"
+    
+    def _make_snapshot_cache_key(self, scope: str, period_key: str) -> str:
+        """Generate cache key for a materialized leaderboard snapshot."""
+        return f"{self.KEY_PREFIX_SNAPSHOT}:{scope}:{period_key}"
+    
+    def _make_histogram_key(self, scope: str, period_key: str) -> str:
+        """Generate key for the score histogram of a period."""
+        return f"{self.KEY_PREFIX_HISTOGRAM}:{scope}:{period_key}"
+    
+    def _make_archive_cache_key(self, scope: str, period_key: str) -> str:
+        """Generate cache key for the archive of a finished period."""
+        return f"{self.KEY_PREFIX_ARCHIVE}:{scope}:{period_key}"
+    
+    async def _get_generation(self, scope: LeaderboardScope, period_key: str) -> int:
+        """
+        Get the current cache generation for a scope and period.
+        
+        Every cache key embeds this number, so bumping it makes all entries of
+        the period unreachable at once; they then age out through their TTL.
+        """
+        value = await self.redis.get(self._make_generation_key(scope.value, period_key))
+        return int(value) if value else 0
+    
+    async def _bump_generations(self, scopes) -> None:
+        """Advance the cache generation of the current period of each scope."""
+        keys = [
+            self._make_generation_key(scope.value, self.get_current_period_key(scope))
+            for scope in scopes
+        ]
+        await self.redis.increment_many(keys, self.GENERATION_TTL)
     
     async def get_leaderboard(
         self,
         scope: LeaderboardScope = LeaderboardScope.ALLTIME,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        board: str = GLOBAL_BOARD
     ) -> Dict[str, Any]:
         """
         Get leaderboard with caching.
         
+        Args:
+            board: Board key of the global, a dungeon or a category leaderboard
+        
         Returns:
-            Dict with scope, period_key, total_participants, entries, and last_updated
+            Dict with scope, period_key, board, total_participants, entries, and last_updated
         """
         period_key = self.get_current_period_key(scope)
-        cache_key = self._make_leaderboard_cache_key(scope.value, period_key, limit, offset)
+        generation = await self._get_generation(scope, period_key)
+        cache_key = self._make_leaderboard_cache_key(
+            scope.value, period_key, board, generation, limit, offset
+        )
         
-        # Try cache first
-        cached_data = await self.redis.get_json(cache_key)
-        if cached_data:
-            return cached_data
+        async def load() -> Dict[str, Any]:
+            # Serve from the newest materialized snapshot when the live cache is cold
+            snapshot = await self._get_snapshot(scope, period_key) if board == GLOBAL_BOARD else None
+            if snapshot and self._snapshot_covers(snapshot, limit, offset):
+                return {
+                    "scope": scope.value,
+                    "period_key": period_key,
+                    "board": board,
+                    "total_participants": snapshot["total_participants"],
+                    "entries": snapshot["entries"][offset:offset + limit],
+                    "last_updated": snapshot["last_updated"]
+                }
+            return await self._compute_leaderboard(scope, period_key, limit, offset, board)
         
-        # Get from database
-        scores = await self.repo.get_top_scores_for_period(scope, period_key, limit, offset)
-        participants = await self.repo.count_participants_in_period(scope, period_key)
+        # Concurrent misses share a single recomputation
+        return await get_or_compute(self.redis, cache_key, self.get_cache_ttl(scope), load)
+    
+    async def _compute_leaderboard(
+        self,
+        scope: LeaderboardScope,
+        period_key: str,
+        limit: int,
+        offset: int,
+        board: str = GLOBAL_BOARD
+    ) -> Dict[str, Any]:
+        """Aggregate a leaderboard page from the database."""
+        scores = await self.repo.get_top_scores_for_period(scope, period_key, limit, offset, board)
+        participants = await self.repo.count_participants_in_period(scope, period_key, board)
         
         # Format entries
         entries = []
@@ -125,119 +224,275 @@ class LeaderboardService:
             rank = offset + idx + 1
             
             # Extract data from aggregated result (dict from repository)
-            user_id = score_data.get('user_id')
-            user = score_data.get('user')
-            total_score = int(score_data.get('total_score', 0))
-            run_count = int(score_data.get('run_count', 0))
-            
-            # Safely access profile
-            handle = "Anonymous"
-            avatar_layers = {}
-            
-            if user and hasattr(user, 'profile') and user.profile:
-                handle = user.profile.handle or "Anonymous"
-                avatar_layers = user.profile.avatar_layers or {}
-            
             entry = {
                 "rank": rank,
-                "user_id": str(user_id),
-                "handle": handle,
-                "score": total_score,
-                "total_runs": run_count,
-                "avatar_layers": avatar_layers,
+                "user_id": str(score_data.get('user_id')),
+                "handle": score_data.get('handle') or "Anonymous",
+                "score": int(score_data.get('total_score') or 0),
+                "total_runs": int(score_data.get('run_count') or 0),
+                "avatar_layers": score_data.get('avatar_layers') or {},
             }
             entries.append(entry)
         
-        # Build response
-        leaderboard_data = {
+        return {
             "scope": scope.value,
             "period_key": period_key,
+            "board": board,
             "total_participants": participants,
             "entries": entries,
             "last_updated": datetime.now(timezone.utc).isoformat()
         }
-        
-        # Cache it
-        cache_ttl = self.get_cache_ttl(scope)
-        await self.redis.set_json(cache_key, leaderboard_data, cache_ttl)
-        
-        return leaderboard_data
     
     async def get_user_rank(
         self,
         user_id: UUID,
         scope: LeaderboardScope = LeaderboardScope.ALLTIME,
-        neighbors_count: int = 3
+        neighbors_count: int = 3,
+        board: str = GLOBAL_BOARD
     ) -> Dict[str, Any]:
         """
         Get user's rank and neighboring players.
         
+        On the global boards the period's score histogram places the user in
+        O(1); only players estimated inside the top TOP_K_EXACT pay for the
+        exact window query (and get neighbors).
+        
+        Args:
+            board: Board key of the global, a dungeon or a category leaderboard
+        
         Returns:
-            Dict with user_id, handle, rank, score, total_runs, scope, period_key, neighbors
+            Dict with user_id, handle, rank, rank_is_approximate, percentile, score,
+            total_runs, total_participants, scope, period_key, board, neighbors
         """
         period_key = self.get_current_period_key(scope)
-        cache_key = self._make_user_rank_cache_key(user_id, scope.value, period_key)
+        generation = await self._get_generation(scope, period_key)
+        cache_key = self._make_user_rank_cache_key(user_id, scope.value, period_key, board, generation)
         
         # Try cache first
         cached_data = await self.redis.get_json(cache_key)
         if cached_data:
             return cached_data
         
-        # Get user's rank
-        rank = await self.repo.get_user_rank_in_period(user_id, scope, period_key)
+        user_total = await self.repo.get_user_period_total(user_id, scope, period_key, board)
+        histogram = None
+        if board == GLOBAL_BOARD:
+            histogram = await self._get_histogram(scope, period_key)
         
-        if rank is None:
+        if user_total is None:
             # User has no scores in this period
+            if histogram:
+                participants = sum(histogram.values())
+            else:
+                participants = await self.repo.count_participants_in_period(scope, period_key, board)
             return {
                 "user_id": str(user_id),
                 "handle": "You",
                 "rank": None,
+                "rank_is_approximate": False,
+                "percentile": None,
                 "score": 0,
                 "total_runs": 0,
+                "total_participants": participants,
+                "scope": scope.value,
+                "period_key": period_key,
+                "board": board,
+                "neighbors": []
+            }
+        
+        estimated_rank, participants = None, None
+        if histogram:
+            estimated_rank, participants = self._estimate_rank(histogram, user_total["total_score"])
+        
+        if estimated_rank is not None and estimated_rank > self.TOP_K_EXACT:
+            # Outside the top-K the bucket counts answer without touching the period aggregate
+            rank_data = {
+                "user_id": str(user_id),
+                "handle": user_total["handle"] or "You",
+                "rank": estimated_rank,
+                "rank_is_approximate": True,
+                "percentile": self._top_percentile(estimated_rank, participants),
+                "score": user_total["total_score"],
+                "total_runs": user_total["run_count"],
+                "total_participants": participants,
                 "scope": scope.value,
                 "period_key": period_key,
+                "board": board,
                 "neighbors": []
             }
+        else:
+            rank_data = await self._get_exact_rank(user_id, scope, period_key, neighbors_count, board)
+        
+        # Cache it
+        cache_ttl = self.get_cache_ttl(scope)
+        await self.redis.set_json(cache_key, rank_data, cache_ttl)
         
-        # Get user score and neighbors
-        user_score, neighbors = await self.repo.get_user_neighbors_in_leaderboard(
-            user_id, scope, period_key, neighbors_count
+        return rank_data
+    
+    async def _get_exact_rank(
+        self,
+        user_id: UUID,
+        scope: LeaderboardScope,
+        period_key: str,
+        neighbors_count: int,
+        board: str
+    ) -> Dict[str, Any]:
+        """Rank, participant count and true rank neighbors in one window query."""
+        user_entry, neighbors, participants = await self.repo.get_user_rank_with_neighbors(
+            user_id, scope, period_key, neighbors_count, board
         )
         
-        # Format neighbors
-        neighbor_entries = []
-        for neighbor_score in neighbors:
-            # Calculate neighbor rank (simplified - might not be exact)
-            neighbor_rank = await self.repo.get_user_rank_in_period(
-                neighbor_score.user_id, scope, period_key
-            )
+        return {
+            "user_id": str(user_id),
+            "handle": user_entry["handle"] or "You",
+            "rank": user_entry["rank"],
+            "rank_is_approximate": False,
+            "percentile": self._top_percentile(user_entry["rank"], participants),
+            "score": int(user_entry["total_score"] or 0),
+            "total_runs": int(user_entry["run_count"] or 0),
+            "total_participants": participants,
+            "scope": scope.value,
+            "period_key": period_key,
+            "board": board,
+            "neighbors": [
+                {
+                    "rank": neighbor["rank"],
+                    "user_id": str(neighbor["user_id"]),
+                    "handle": neighbor["handle"] or "Anonymous",
+                    "score": int(neighbor["total_score"] or 0)
+                }
+                for neighbor in neighbors
+            ]
+        }
+    
+    def _histogram_bucket(self, total: int) -> int:
+        """Get the logarithmic histogram bucket of a score total."""
+        return int(math.log1p(max(total, 0)) / math.log(self.HISTOGRAM_GROWTH))
+    
+    def _estimate_rank(self, histogram: Dict[int, int], total: int) -> Tuple[int, int]:
+        """
+        Estimate a rank from the bucket counts.
+        
+        Players in higher buckets are all ahead; within the player's own bucket
+        totals are assumed to be spread evenly.
+        
+        Returns:
+            Tuple of (estimated rank, participants)
+        """
+        bucket = self._histogram_bucket(total)
+        participants = sum(histogram.values())
+        ahead = sum(count for other, count in histogram.items() if other > bucket)
+        
+        lower = self.HISTOGRAM_GROWTH ** bucket - 1
+        upper = self.HISTOGRAM_GROWTH ** (bucket + 1) - 1
+        fraction_ahead = min(max((upper - total) / (upper - lower), 0.0), 1.0)
+        ahead += round(max(histogram.get(bucket, 1) - 1, 0) * fraction_ahead)
+        
+        return ahead + 1, max(participants, ahead + 1)
+    
+    def _top_percentile(self, rank: int, participants: int) -> float:
+        """Express a rank as "top X%" of the participants."""
+        if not participants:
+            return 100.0
+        return round(100.0 * rank / participants, 1)
+    
+    async def _get_histogram(
+        self,
+        scope: LeaderboardScope,
+        period_key: str
+    ) -> Optional[Dict[int, int]]:
+        """Get the score histogram of a period, or None if it hasn't been built."""
+        raw = await self.redis.hash_get_all(self._make_histogram_key(scope.value, period_key))
+        histogram = {int(bucket): int(count) for bucket, count in raw.items() if int(count) > 0}
+        return histogram or None
+    
+    async def _record_in_histograms(
+        self,
+        totals: Dict[LeaderboardScope, Dict[str, Any]],
+        score: int
+    ) -> None:
+        """
+        Move the user's period totals to their new buckets after a score write.
+        
+        The user's total before the score is the new total minus the score, so
+        all buckets move in one pipeline.
+        """
+        updates = {}
+        for scope, user_total in totals.items():
+            new_bucket = self._histogram_bucket(user_total["total_score"])
+            increments = {str(new_bucket): 1}
+            if user_total["run_count"] > 1:
+                old_bucket = self._histogram_bucket(user_total["total_score"] - score)
+                if old_bucket == new_bucket:
+                    continue
+                increments[str(old_bucket)] = -1
             
-            neighbor_entries.append({
-                "rank": neighbor_rank,
-                "handle": neighbor_score.user.profile.handle if neighbor_score.user.profile else "Anonymous",
-                "score": neighbor_score.score
-            })
+            period_key = self.get_current_period_key(scope)
+            updates[self._make_histogram_key(scope.value, period_key)] = increments
+        
+        if updates:
+            await self.redis.hash_increment_many(updates, self.GENERATION_TTL)
+    
+    async def rebuild_histograms(self) -> None:
+        """Rebuild the score histograms of the current periods from the rollups."""
+        for scope in self.ALL_SCOPES:
+            period_key = self.get_current_period_key(scope)
+            histogram = await self.repo.get_score_histogram(scope, period_key, self.HISTOGRAM_GROWTH)
+            await self.redis.replace_hash(
+                self._make_histogram_key(scope.value, period_key),
+                {str(bucket): count for bucket, count in histogram.items()},
+                self.GENERATION_TTL
+            )
+    
+    async def get_friends_leaderboard(
+        self,
+        user_id: UUID,
+        scope: LeaderboardScope = LeaderboardScope.ALLTIME,
+        board: str = GLOBAL_BOARD
+    ) -> Dict[str, Any]:
+        """
+        Rank the user among the players they follow.
         
-        # Sort neighbors by rank
-        neighbor_entries.sort(key=lambda x: x["rank"] if x["rank"] else 999999)
+        Follow changes show up once the cached entry expires (30-60 seconds).
         
-        # Build response
-        rank_data = {
-            "user_id": str(user_id),
-            "handle": user_score.user.profile.handle if user_score and user_score.user.profile else "You",
-            "rank": rank,
-            "score": user_score.score if user_score else 0,
-            "total_runs": len([s for s in user_score.user.scores]) if user_score else 0,
+        Returns:
+            Dict with scope, period_key, board, total_participants, entries, and last_updated
+        """
+        period_key = self.get_current_period_key(scope)
+        generation = await self._get_generation(scope, period_key)
+        cache_key = self._make_friends_cache_key(user_id, scope.value, period_key, board, generation)
+        
+        # Try cache first
+        cached_data = await self.redis.get_json(cache_key)
+        if cached_data:
+            return cached_data
+        
+        ranking = await self.repo.get_friends_ranking(user_id, scope, period_key, board)
+        
+        friends_data = {
             "scope": scope.value,
             "period_key": period_key,
-            "neighbors": neighbor_entries
+            "board": board,
+            "total_participants": len(ranking),
+            "entries": [
+                {
+                    "rank": entry["rank"],
+                    "user_id": str(entry["user_id"]),
+                    "handle": entry["handle"] or "Anonymous",
+                    "score": int(entry["total_score"] or 0),
+                    "total_runs": int(entry["run_count"] or 0),
+                    "avatar_layers": entry["avatar_layers"] or {},
+                    "is_you": entry["user_id"] == user_id,
+                }
+                for entry in ranking
+            ],
+            "last_updated": datetime.now(timezone.utc).isoformat()
         }
         
         # Cache it
         cache_ttl = self.get_cache_ttl(scope)
-        await self.redis.set_json(cache_key, rank_data, cache_ttl)
+        await self.redis.set_json(cache_key, friends_data, cache_ttl)
         
-        return rank_data
+        return friends_data
     
     async def get_leaderboard_stats(
         self,
@@ -251,22 +506,242 @@ class LeaderboardService:
             highest_score, lowest_score, last_updated
         """
         period_key = self.get_current_period_key(scope)
-        cache_key = self._make_stats_cache_key(scope.value, period_key)
+        generation = await self._get_generation(scope, period_key)
+        cache_key = self._make_stats_cache_key(scope.value, period_key, generation)
         
-        # Try cache first
-        cached_data = await self.redis.get_json(cache_key)
-        if cached_data:
-            return cached_data
+        async def load() -> Dict[str, Any]:
+            snapshot = await self._get_snapshot(scope, period_key)
+            if snapshot:
+                return snapshot["stats"]
+            
+            return await self._compute_stats(scope, period_key)
         
-        # Get from database
-        stats = await self.repo.get_leaderboard_stats(scope, period_key)
+        return await get_or_compute(self.redis, cache_key, self.get_cache_ttl(scope), load)
+    
+    async def materialize_snapshots(self) -> List[str]:
+        """
+        Compute the top pages and stats of the current period of every scope,
+        persist them as leaderboard snapshots and push them into the read cache.
         
-        # Cache it
-        cache_ttl = self.get_cache_ttl(scope)
-        await self.redis.set_json(cache_key, stats, cache_ttl)
+        Returns:
+            List of "scope:period_key" identifiers that were materialized
+        """
+        materialized = []
+        
+        for scope in self.ALL_SCOPES:
+            period_key = self.get_current_period_key(scope)
+            
+            leaderboard = await self._compute_leaderboard(scope, period_key, self.SNAPSHOT_SIZE, 0)
+            stats = await self._compute_stats(scope, period_key)
+            
+            payload = {**leaderboard, "stats": stats}
+            await self.repo.save_leaderboard_snapshot(scope, period_key, payload)
+            await self.redis.set_json(
+                self._make_snapshot_cache_key(scope.value, period_key),
+                payload,
+                self.SNAPSHOT_CACHE_TTL
+            )
+            
+            materialized.append(f"{scope.value}:{period_key}")
+            logger.info(
+                f"Materialized {scope.value} leaderboard {period_key}: "
+                f"{len(leaderboard['entries'])} entries, {leaderboard['total_participants']} participants"
+            )
+        
+        # Resync the incrementally maintained histograms with the rollups
+        await self.rebuild_histograms()
+        
+        return materialized
+    
+    async def rollover_periods(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Freeze the finished periods of every rolling scope into their archives.
+        
+        Every period since the last frozen one is frozen, oldest first, so
+        periods missed while the task wasn't running still get archived; at
+        most ROLLOVER_MAX_CATCH_UP per scope and run. Safe to run repeatedly:
+        periods that are already frozen are skipped.
+        
+        Returns:
+            List of "scope:period_key" identifiers that were frozen by this call
+        """
+        now = now or datetime.now(timezone.utc)
+        frozen = []
+        
+        for scope in self.ROLLOVER_SCOPES:
+            last_frozen = await self.repo.get_frozen_period_keys(scope, limit=1)
+            period_keys = self._unfrozen_period_keys(scope, now, last_frozen[0] if last_frozen else None)
+            
+            for period_key in period_keys:
+                if await self.freeze_period(scope, period_key):
+                    frozen.append(f"{scope.value}:{period_key}")
+        
+        return frozen
+    
+    def _period_length(self, scope: LeaderboardScope) -> timedelta:
+        """Get the length of a rolling scope's periods."""
+        return timedelta(days=7) if scope == LeaderboardScope.WEEKLY else timedelta(days=1)
+    
+    def _finished_period_key(self, scope: LeaderboardScope, now: datetime) -> str:
+        """Get the key of the most recent period that ended at least ROLLOVER_GRACE ago."""
+        return self.get_period_key(scope, now - self.ROLLOVER_GRACE - self._period_length(scope))
+    
+    def _unfrozen_period_keys(
+        self,
+        scope: LeaderboardScope,
+        now: datetime,
+        last_frozen: Optional[str]
+    ) -> List[str]:
+        """
+        Get the keys of the finished periods after the last frozen one, oldest first.
+        
+        Without any frozen period yet only the most recent one is returned.
+        """
+        latest = self._finished_period_key(scope, now)
+        if last_frozen is None:
+            return [latest]
+        
+        length = self._period_length(scope)
+        period_keys = []
+        moment = self._period_start(scope, last_frozen) + length
+        # Period keys sort chronologically
+        while (period_key := self.get_period_key(scope, moment)) <= latest:
+            if len(period_keys) == self.ROLLOVER_MAX_CATCH_UP:
+                logger.warning(
+                    f"More than {self.ROLLOVER_MAX_CATCH_UP} {scope.value} periods to freeze "
+                    f"after {last_frozen}; the rest follow in the next runs"
+                )
+                break
+            period_keys.append(period_key)
+            moment += length
+        
+        return period_keys
+    
+    def _period_start(self, scope: LeaderboardScope, period_key: str) -> datetime:
+        """Get the start of a rolling scope's period from its key."""
+        if scope == LeaderboardScope.WEEKLY:
+            # ISO week keys start on the Monday of that week
+            start = datetime.strptime(f"{period_key}-1", "%G-W%V-%u")
+        else:
+            start = datetime.strptime(period_key, "%Y-%m-%d")
+        return start.replace(tzinfo=timezone.utc)
+    
+    async def freeze_period(self, scope: LeaderboardScope, period_key: str) -> bool:
+        """
+        Archive a finished period and drop its live ranking structures.
         
+        Returns:
+            False if the period was already frozen
+        """
+        if await self.repo.get_frozen_snapshot(scope, period_key):
+            return False
+        
+        leaderboard = await self._compute_leaderboard(scope, period_key, self.ARCHIVE_SIZE, 0)
+        stats = await self._compute_stats(scope, period_key)
+        payload = {**leaderboard, "stats": stats, "frozen_at": datetime.now(timezone.utc).isoformat()}
+        await self.repo.freeze_leaderboard_snapshot(scope, period_key, payload)
+        
+        # Generation-keyed caches of the period become unreachable and age out
+        await self.redis.delete_many([
+            self._make_generation_key(scope.value, period_key),
+            self._make_histogram_key(scope.value, period_key),
+            self._make_snapshot_cache_key(scope.value, period_key),
+        ])
+        
+        logger.info(
+            f"Froze {scope.value} leaderboard {period_key}: "
+            f"{len(leaderboard['entries'])} entries, {leaderboard['total_participants']} participants"
+        )
+        return True
+    
+    async def get_archived_leaderboard(
+        self,
+        scope: LeaderboardScope,
+        period_key: str,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Get a page of a finished period from its archive.
+        
+        Raises:
+            LeaderboardPeriodNotFoundError: If the period hasn't been frozen
+        """
+        archive = await self._get_archive(scope, period_key)
+        return {
+            "scope": scope.value,
+            "period_key": period_key,
+            "board": archive["board"],
+            "total_participants": archive["total_participants"],
+            "entries": archive["entries"][offset:offset + limit],
+            "stats": archive["stats"],
+            "frozen_at": archive["frozen_at"]
+        }
+    
+    async def get_archived_periods(self, scope: LeaderboardScope, limit: int = 30) -> List[str]:
+        """Get the keys of the most recent archived periods of a scope, newest first."""
+        return await self.repo.get_frozen_period_keys(scope, limit)
+    
+    async def _get_archive(self, scope: LeaderboardScope, period_key: str) -> Dict[str, Any]:
+        """Get a frozen period payload, from Redis or the database."""
+        cache_key = self._make_archive_cache_key(scope.value, period_key)
+        
+        payload = await self.redis.get_json(cache_key)
+        if payload:
+            return payload
+        
+        snapshot = await self.repo.get_frozen_snapshot(scope, period_key)
+        if not snapshot:
+            raise LeaderboardPeriodNotFoundError(
+                f"No archived {scope.value} leaderboard for period {period_key}"
+            )
+        
+        # Archives never change, so they can stay cached for a long time
+        await self.redis.set_json(cache_key, snapshot.payload, self.ARCHIVE_CACHE_TTL)
+        return snapshot.payload
+    
+    async def _compute_stats(self, scope: LeaderboardScope, period_key: str) -> Dict[str, Any]:
+        """Aggregate leaderboard stats from the database in a JSON-safe form."""
+        stats = await self.repo.get_leaderboard_stats(scope, period_key)
+        stats["last_updated"] = stats["last_updated"].isoformat()
         return stats
     
+    async def _get_snapshot(
+        self,
+        scope: LeaderboardScope,
+        period_key: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get the newest materialized snapshot, from Redis or the database, unless it is stale."""
+        cache_key = self._make_snapshot_cache_key(scope.value, period_key)
+        
+        payload = await self.redis.get_json(cache_key)
+        if payload:
+            return payload if self._snapshot_is_fresh(payload) else None
+        
+        snapshot = await self.repo.get_leaderboard_snapshot(scope, period_key)
+        if not snapshot or not self._snapshot_is_fresh(snapshot.payload):
+            return None
+        
+        # Re-prime Redis so other workers don't go to the database as well
+        await self.redis.set_json(cache_key, snapshot.payload, self.SNAPSHOT_CACHE_TTL)
+        return snapshot.payload
+    
+    def _snapshot_is_fresh(self, snapshot: Dict[str, Any]) -> bool:
+        """Check whether a snapshot was materialized within SNAPSHOT_MAX_AGE."""
+        try:
+            last_updated = datetime.fromisoformat(snapshot["last_updated"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return datetime.now(timezone.utc) - last_updated <= self.SNAPSHOT_MAX_AGE
+    
+    def _snapshot_covers(self, snapshot: Dict[str, Any], limit: int, offset: int) -> bool:
+        """Check whether a snapshot holds every entry of the requested page."""
+        entries = snapshot.get("entries", [])
+        return (
+            offset + limit <= len(entries)
+            or len(entries) >= snapshot.get("total_participants", 0)
+        )
+    
     async def invalidate_leaderboard_cache(
         self,
         user_id: UUID,
@@ -275,28 +750,13 @@ class LeaderboardService:
         """
         Invalidate leaderboard cache when a new score is added.
         If scope is None, invalidate all scopes.
-        """
-        scopes_to_invalidate = (
-            [scope] if scope else [LeaderboardScope.TODAY, LeaderboardScope.WEEKLY, LeaderboardScope.ALLTIME]
-        )
         
-        for scope_item in scopes_to_invalidate:
-            period_key = self.get_current_period_key(scope_item)
-            
-            # Invalidate leaderboard cache (we'd need to iterate through common limit/offset combinations)
-            # For simplicity, we'll invalidate common ones
-            for limit in [10, 50, 100]:
-                for offset in [0, 10, 50, 100]:
-                    cache_key = self._make_leaderboard_cache_key(scope_item.value, period_key, limit, offset)
-                    await self.redis.delete(cache_key)
-            
-            # Invalidate user rank cache
-            user_rank_key = self._make_user_rank_cache_key(user_id, scope_item.value, period_key)
-            await self.redis.delete(user_rank_key)
-            
-            # Invalidate stats cache
-            stats_key = self._make_stats_cache_key(scope_item.value, period_key)
-            await self.redis.delete(stats_key)
+        A new score can move every rank in the period, so this advances the
+        period's cache generation (one INCR per scope, pipelined) instead of
+        deleting individual keys.
+        """
+        scopes_to_invalidate = [scope] if scope else self.ALL_SCOPES
+        await self._bump_generations(scopes_to_invalidate)
     
     async def update_user_score(
         self,
@@ -309,8 +769,46 @@ class LeaderboardService:
         This should be called after a run is completed.
         """
         # The score should already be in the database from run submission
-        # We just need to invalidate caches
+        # We just need to invalidate caches, keep the histograms current and
+        # tell live subscribers
         await self.invalidate_leaderboard_cache(user_id)
+        
+        totals = await self._get_current_totals(user_id)
+        await self._record_in_histograms(totals, score)
+        await self._publish_score_events(user_id, totals, score)
+    
+    async def _get_current_totals(self, user_id: UUID) -> Dict[LeaderboardScope, Dict[str, Any]]:
+        """Get the user's totals in the current period of every scope they played in."""
+        totals = {}
+        for scope in self.ALL_SCOPES:
+            period_key = self.get_current_period_key(scope)
+            user_total = await self.repo.get_user_period_total(user_id, scope, period_key)
+            if user_total is not None:
+                totals[scope] = user_total
+        return totals
+    
+    async def _publish_score_events(
+        self,
+        user_id: UUID,
+        totals: Dict[LeaderboardScope, Dict[str, Any]],
+        score: int
+    ) -> None:
+        """Publish a compact score change per scope for the SSE streams."""
+        messages = [
+            (
+                LeaderboardEventHub.channel_for(scope),
+                json.dumps({
+                    "user_id": str(user_id),
+                    "handle": user_total["handle"],
+                    "score": user_total["total_score"],
+                    "delta": score,
+                    "period_key": self.get_current_period_key(scope)
+                })
+            )
+            for scope, user_total in totals.items()
+        ]
+        if messages:
+            await self.redis.publish_many(messages)
     
     async def get_user_best_scores(
         self,
@@ -1,7 +1,7 @@
 """Profile service for user profile and character customization operations."""
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -190,3 +190,86 @@ class ProfileService:
             logger.error(f"Error getting profile with inventory for user {user_id}: {e}")
             raise ProfileError(f"Failed to get profile with inventory: {str(e)}")
 
+    async def follow_player(
+        self,
+        user_id: UUID,
+        handle: str,
+        session: AsyncSession
+    ) -> Profile:
+        """
+        Follow another player by handle.
+        
+        Args:
+            user_id: Following user's identifier
+            handle: Handle of the player to follow
+            session: Database session
+            
+        Returns:
+            Profile of the followed player
+            
+        Raises:
+            ProfileNotFoundError: If no player has this handle
+            ProfileError: If following yourself or for other errors
+        """
+        user_repo = UserRepository(session)
+        
+        try:
+            profile = await user_repo.get_profile_by_handle(handle)
+            if not profile:
+                raise ProfileNotFoundError(f"No player with handle '{handle}'")
+            
+            if profile.user_id == user_id:
+                raise ProfileError("You cannot follow yourself")
+            
+            await user_repo.follow_user(user_id, profile.user_id)
+            
+            logger.info(f"User {user_id} followed {profile.user_id}")
+            return profile
+            
+        except ProfileError:
+            raise
+        except Exception as e:
+            logger.error(f"Error following {handle} for user {user_id}: {e}")
+            raise ProfileError(f"Failed to follow player: {str(e)}")
+
+    async def unfollow_player(
+        self,
+        user_id: UUID,
+        handle: str,
+        session: AsyncSession
+    ) -> None:
+        """
+        Stop following a player by handle.
+        
+        Raises:
+            ProfileNotFoundError: If no player has this handle or it isn't followed
+            ProfileError: For other errors
+        """
+        user_repo = UserRepository(session)
+        
+        try:
+            profile = await user_repo.get_profile_by_handle(handle)
+            if not profile or not await user_repo.unfollow_user(user_id, profile.user_id):
+                raise ProfileNotFoundError(f"You are not following '{handle}'")
+            
+            logger.info(f"User {user_id} unfollowed {profile.user_id}")
+            
+        except ProfileError:
+            raise
+        except Exception as e:
+            logger.error(f"Error unfollowing {handle} for user {user_id}: {e}")
+            raise ProfileError(f"Failed to unfollow player: {str(e)}")
+
+    async def get_followed_players(
+        self,
+        user_id: UUID,
+        session: AsyncSession
+    ) -> List[Profile]:
+        """Get profiles of all players the user follows."""
+        user_repo = UserRepository(session)
+        
+        try:
+            return await user_repo.get_followed_profiles(user_id)
+        except Exception as e:
+            logger.error(f"Error getting followed players for user {user_id}: {e}")
+            raise ProfileError(f"Failed to get followed players: {str(e)}")
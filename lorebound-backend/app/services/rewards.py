@@ -0,0 +1,177 @@
+"""Reward rarity rolls using alias tables built from data-defined drop tables."""
+
+import json
+import logging
+import random
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from ..core.config import settings
+from ..domain.enums import ItemRarity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DROP_TABLES_PATH = Path(__file__).resolve().parent.parent / "domain" / "drop_tables.json"
+
+# One bit per rarity, for availability masks
+RARITY_BITS: Dict[ItemRarity, int] = {rarity: 1 << i for i, rarity in enumerate(ItemRarity)}
+ALL_RARITIES = sum(RARITY_BITS.values())
+
+# Simulation rolls per NumPy batch, bounding memory use
+SIMULATION_BATCH_SIZE = 1_000_000
+
+
+def rarity_mask(rarities: Iterable[ItemRarity]) -> int:
+    """Pack rarities into an availability mask."""
+    mask = 0
+    for rarity in rarities:
+        mask |= RARITY_BITS[rarity]
+    return mask
+
+
+class DropTable(BaseModel):
+    """Relative drop weights of each rarity for one kind of run."""
+    
+    name: str
+    weights: Dict[ItemRarity, float]
+    
+    model_config = ConfigDict(frozen=True)
+    
+    @field_validator("weights")
+    @classmethod
+    def validate_weights(cls, weights: Dict[ItemRarity, float]) -> Dict[ItemRarity, float]:
+        """Weights must be non-negative and not all zero."""
+        if any(weight < 0 for weight in weights.values()) or not any(weights.values()):
+            raise ValueError("Drop weights must be non-negative with at least one positive weight")
+        return weights
+    
+    def restricted_to(self, available: int) -> List[Tuple[ItemRarity, float]]:
+        """Weights of the rarities present in an availability mask."""
+        return [
+            (rarity, weight) for rarity, weight in self.weights.items()
+            if weight > 0 and available & RARITY_BITS[rarity]
+        ]
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table: samples a discrete distribution in O(1).
+    
+    Each of the n columns holds a probability of keeping its own outcome and
+    an alias outcome to return otherwise, so a sample is one uniform column
+    pick and one biased coin flip.
+    """
+    
+    def __init__(self, outcomes: Sequence, weights: Sequence[float]):
+        if not outcomes or len(outcomes) != len(weights):
+            raise ValueError("Alias table needs one positive weight per outcome")
+        
+        n = len(outcomes)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.outcomes = tuple(outcomes)
+        self.probabilities = [1.0] * n
+        self.aliases = list(range(n))
+        
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding and keeps its own outcome
+    
+    def sample(self, rng: random.Random = random):
+        """Draw one outcome."""
+        column = int(rng.random() * len(self.outcomes))
+        if rng.random() < self.probabilities[column]:
+            return self.outcomes[column]
+        return self.outcomes[self.aliases[column]]
+
+
+class RewardEngine:
+    """
+    Rolls reward rarities from named drop tables.
+    
+    Rarities a player can no longer receive are excluded by an availability
+    mask and their weight is shared proportionally by the rest. Alias tables
+    are built lazily per (drop table, mask), at most 2^5 per table.
+    """
+    
+    def __init__(self, tables: Iterable[DropTable]):
+        self.tables: Dict[str, DropTable] = {table.name: table for table in tables}
+        self._alias_tables: Dict[Tuple[str, int], Optional[AliasTable]] = {}
+    
+    @classmethod
+    def from_file(cls, path: Optional[Path] = None) -> "RewardEngine":
+        """Load drop tables from a JSON object of {table name: {rarity: weight}}."""
+        path = Path(path or settings.drop_tables_path or DEFAULT_DROP_TABLES_PATH)
+        with open(path, "r") as f:
+            data = json.load(f)
+        
+        tables = [DropTable(name=name, weights=weights) for name, weights in data.items()]
+        logger.info(f"Loaded {len(tables)} drop tables from {path}")
+        return cls(tables)
+    
+    def alias_table(self, table_name: str, available: int = ALL_RARITIES) -> Optional[AliasTable]:
+        """Get the alias table of a drop table restricted to the available rarities."""
+        key = (table_name, available)
+        if key not in self._alias_tables:
+            weights = self.tables[table_name].restricted_to(available)
+            self._alias_tables[key] = AliasTable(
+                [rarity for rarity, _ in weights], [weight for _, weight in weights]
+            ) if weights else None
+        return self._alias_tables[key]
+    
+    def roll_rarity(
+        self,
+        table_name: str,
+        available: int = ALL_RARITIES,
+        rng: random.Random = random
+    ) -> Optional[ItemRarity]:
+        """Roll a rarity, or None if no rarity of the table is available."""
+        table = self.alias_table(table_name, available)
+        return table.sample(rng) if table is not None else None
+    
+    def simulate(
+        self,
+        table_name: str,
+        rolls: int,
+        available: int = ALL_RARITIES,
+        seed: Optional[int] = None
+    ) -> Dict[ItemRarity, int]:
+        """
+        Roll a drop table many times with NumPy and count the outcomes.
+        
+        Meant for tuning drop tables offline; millions of rolls take well
+        under a second. Requires numpy.
+        """
+        import numpy as np
+        
+        table = self.alias_table(table_name, available)
+        if table is None:
+            return {}
+        
+        rng = np.random.default_rng(seed)
+        probabilities = np.asarray(table.probabilities)
+        aliases = np.asarray(table.aliases)
+        counts = np.zeros(len(table.outcomes), dtype=np.int64)
+        
+        remaining = rolls
+        while remaining > 0:
+            size = min(remaining, SIMULATION_BATCH_SIZE)
+            columns = rng.integers(0, len(table.outcomes), size=size)
+            keep = rng.random(size) < probabilities[columns]
+            outcomes = np.where(keep, columns, aliases[columns])
+            counts += np.bincount(outcomes, minlength=len(table.outcomes))
+            remaining -= size
+        
+        return {rarity: int(count) for rarity, count in zip(table.outcomes, counts, strict=True)}
+
+
+# Global reward engine instance
+reward_engine = RewardEngine.from_file()
@@ -185,6 +185,8 @@ class RunService:
 
             # Create Score record for leaderboard
             from ..domain.models import Score
+            from ..repositories.leaderboard_repo import LeaderboardRepository
+            played_at = datetime.now(timezone.utc)
             score_record = Score(
                 run_id=run_id,
                 user_id=user_id,
@@ -192,10 +194,20 @@ class RunService:
                 correct_count=correct_count,
                 total_time_ms=total_time_ms,
                 streak_max=streak_max,
-                score=total_score
+                score=total_score,
+                created_at=played_at
             )
             session.add(score_record)
             await session.flush()
+            
+            # Keep the rollups of the global, dungeon and category boards in step
+            await LeaderboardRepository(session).record_score(
+                user_id,
+                total_score,
+                played_at,
+                dungeon_id=run.dungeon_id,
+                category=run.dungeon.category if run.dungeon else None
+            )
             logger.info(f"Created score record for run {run_id}: {total_score} points")
 
             # Invalidate leaderboard cache (will be refreshed on next request)
@@ -203,7 +215,10 @@ class RunService:
             # For now, cache will expire naturally (30s-5min TTL)
 
             # Update user progression if needed
-            await self._update_user_progression(user_id, updated_run, session)
+            progression = await self._update_user_progression(user_id, updated_run, session)
+            if progression is not None:
+                # Assign a new dict: in-place changes to a JSON column aren't tracked
+                updated_run.summary = {**(updated_run.summary or {}), "progression": progression}
 
             # Distribute item rewards for completing the run
             from .inventory_service import InventoryService
@@ -223,15 +238,12 @@ class RunService:
                 )
                 
                 # Add rewards to the run response summary
-                if updated_run.summary is None:
-                    updated_run.summary = {}
-                updated_run.summary["rewards"] = rewards
+                updated_run.summary = {**(updated_run.summary or {}), "rewards": rewards}
                 logger.info(f"Distributed {len(rewards)} rewards to user {user_id} for run {run_id}")
             except Exception as e:
                 logger.error(f"Failed to distribute rewards for run {run_id}: {e}")
                 # Don't fail the run submission if rewards fail
-                updated_run.summary = updated_run.summary or {}
-                updated_run.summary["rewards"] = []
+                updated_run.summary = {**(updated_run.summary or {}), "rewards": []}
 
             # Fetch the updated run with dungeon relationship
             final_run = await self.run_repo.get_run_by_id(run_id)
@@ -250,7 +262,8 @@ class RunService:
                 'total_score': final_run.total_score,
                 'started_at': final_run.started_at,
                 'completed_at': final_run.completed_at,
-                'dungeon': DungeonMetaResponse.model_validate(final_run.dungeon) if final_run.dungeon else None
+                'dungeon': DungeonMetaResponse.model_validate(final_run.dungeon) if final_run.dungeon else None,
+                'progression': progression
             }
             return RunResponse(**run_dict)
 
@@ -453,19 +466,59 @@ class RunService:
         user_id: UUID,
         run: Run,
         session: AsyncSession
-    ) -> None:
-        """Update user progression based on run results."""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update user progression based on run results.
+        
+        Each level gained grants an item reward and unlocks the achievements
+        for the new level.
+        """
         try:
             # Calculate XP gained (basic formula)
             xp_gained = min(run.total_score // 10, 500)  # 1 XP per 10 points, max 500
             
-            if xp_gained > 0:
-                await self.user_repo.add_experience(user_id, xp_gained, session)
-                logger.info(f"Added {xp_gained} XP to user {user_id}")
+            if xp_gained <= 0:
+                return None
+            
+            progress = await self.user_repo.add_experience(user_id, xp_gained)
+            if progress is None:
+                return None
+            logger.info(f"Added {xp_gained} XP to user {user_id}")
+            
+            progression = {
+                "xp_gained": xp_gained,
+                "xp": progress.xp,
+                "level": progress.level,
+                "levels_gained": progress.levels_gained,
+                "level_up_rewards": [],
+                "achievements_unlocked": []
+            }
+            if not progress.levels_gained:
+                return progression
+            
+            from ..repositories.achievement_repo import AchievementRepository
+            from .inventory_service import InventoryService
+            
+            try:
+                # A savepoint, so a failure undoes partial grants but keeps the XP and the run
+                async with session.begin_nested():
+                    level_up_rewards = await InventoryService().distribute_level_up_rewards(
+                        user_id, progress.levels_gained, session
+                    )
+                    achievements_unlocked = await AchievementRepository(
+                        session
+                    ).unlock_level_achievements(user_id, progress.level)
+                progression["level_up_rewards"] = level_up_rewards
+                progression["achievements_unlocked"] = achievements_unlocked
+            except Exception as e:
+                logger.error(f"Failed to apply level up for user {user_id}: {e}")
+            
+            return progression
 
         except Exception as e:
             logger.warning(f"Failed to update user progression: {e}")
             # Don't fail the run submission if progression update fails
+            return None
 
     async def abandon_run(
         self,
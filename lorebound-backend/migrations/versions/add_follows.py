@@ -0,0 +1,35 @@
+"""add follows
+
+Revision ID: add_follows
+Revises: add_leaderboard_boards
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_follows'
+down_revision = 'add_leaderboard_boards'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'follows',
+        sa.Column('follower_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('followee_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['follower_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['followee_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('follower_id', 'followee_id')
+    )
+    op.create_index('idx_follows_followee', 'follows', ['followee_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_follows_followee', table_name='follows')
+    op.drop_table('follows')
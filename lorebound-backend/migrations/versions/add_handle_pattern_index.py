@@ -0,0 +1,30 @@
+"""add profile handle prefix index
+
+Revision ID: add_handle_pattern_index
+Revises: add_snapshot_frozen
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_handle_pattern_index'
+down_revision = 'add_snapshot_frozen'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The unique index follows the database collation, which LIKE 'prefix%'
+    # can't use; handle allocation scans numbered variants by prefix
+    op.create_index(
+        'idx_profiles_handle_pattern',
+        'profiles',
+        ['handle'],
+        postgresql_ops={'handle': 'varchar_pattern_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_profiles_handle_pattern', table_name='profiles')
@@ -0,0 +1,72 @@
+"""add dungeon and category leaderboard boards
+
+Revision ID: add_leaderboard_boards
+Revises: add_user_score_rollups
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_leaderboard_boards'
+down_revision = 'add_user_score_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rollup rows belong to the global board
+    for table in ('user_daily_scores', 'user_score_totals'):
+        op.add_column(table, sa.Column('board', sa.String(length=50), nullable=False, server_default='global'))
+        op.alter_column(table, 'board', server_default=None)
+    
+    # Re-key the rollups by board
+    op.drop_constraint('user_daily_scores_pkey', 'user_daily_scores', type_='primary')
+    op.create_primary_key('user_daily_scores_pkey', 'user_daily_scores', ['board', 'user_id', 'day'])
+    op.drop_index('idx_user_daily_scores_day', table_name='user_daily_scores')
+    op.create_index('idx_user_daily_scores_board_day', 'user_daily_scores', ['board', 'day'], unique=False)
+    
+    op.drop_constraint('user_score_totals_pkey', 'user_score_totals', type_='primary')
+    op.create_primary_key('user_score_totals_pkey', 'user_score_totals', ['board', 'user_id'])
+    op.drop_index('idx_user_score_totals_total', table_name='user_score_totals')
+    op.create_index('idx_user_score_totals_board_total', 'user_score_totals', ['board', sa.text('total_score DESC')], unique=False)
+    
+    # Backfill the dungeon and category boards from existing scores
+    for board in ("'dungeon:' || r.dungeon_id::text", "'category:' || d.category"):
+        op.execute(text(f"""
+            INSERT INTO user_daily_scores (board, user_id, day, total_score, run_count, best_score, last_played)
+            SELECT {board}, s.user_id, DATE(s.created_at AT TIME ZONE 'UTC'),
+                   SUM(s.score), COUNT(*), MAX(s.score), MAX(s.created_at)
+            FROM scores s
+            JOIN runs r ON r.id = s.run_id
+            JOIN dungeons d ON d.id = r.dungeon_id
+            GROUP BY 1, 2, 3
+        """))
+    op.execute(text("""
+        INSERT INTO user_score_totals (board, user_id, total_score, run_count, best_score, last_played)
+        SELECT board, user_id, SUM(total_score), SUM(run_count), MAX(best_score), MAX(last_played)
+        FROM user_daily_scores
+        WHERE board <> 'global'
+        GROUP BY board, user_id
+    """))
+
+
+def downgrade() -> None:
+    op.execute(text("DELETE FROM user_score_totals WHERE board <> 'global'"))
+    op.execute(text("DELETE FROM user_daily_scores WHERE board <> 'global'"))
+    
+    op.drop_index('idx_user_score_totals_board_total', table_name='user_score_totals')
+    op.create_index('idx_user_score_totals_total', 'user_score_totals', [sa.text('total_score DESC')], unique=False)
+    op.drop_constraint('user_score_totals_pkey', 'user_score_totals', type_='primary')
+    op.create_primary_key('user_score_totals_pkey', 'user_score_totals', ['user_id'])
+    
+    op.drop_index('idx_user_daily_scores_board_day', table_name='user_daily_scores')
+    op.create_index('idx_user_daily_scores_day', 'user_daily_scores', ['day'], unique=False)
+    op.drop_constraint('user_daily_scores_pkey', 'user_daily_scores', type_='primary')
+    op.create_primary_key('user_daily_scores_pkey', 'user_daily_scores', ['user_id', 'day'])
+    
+    for table in ('user_daily_scores', 'user_score_totals'):
+        op.drop_column(table, 'board')
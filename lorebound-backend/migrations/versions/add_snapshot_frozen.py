@@ -0,0 +1,36 @@
+"""add leaderboard snapshot frozen flag
+
+Revision ID: add_snapshot_frozen
+Revises: add_follows
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_snapshot_frozen'
+down_revision = 'add_follows'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'leaderboard_snapshots',
+        sa.Column('is_frozen', sa.Boolean(), server_default=sa.text('false'), nullable=False)
+    )
+    # Archived periods are looked up by scope and listed newest first
+    op.create_index(
+        'idx_leaderboard_snapshots_frozen',
+        'leaderboard_snapshots',
+        ['scope', 'period_key'],
+        unique=True,
+        postgresql_where=sa.text('is_frozen')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_leaderboard_snapshots_frozen', table_name='leaderboard_snapshots')
+    op.drop_column('leaderboard_snapshots', 'is_frozen')
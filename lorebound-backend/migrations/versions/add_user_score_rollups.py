@@ -0,0 +1,68 @@
+"""add user score rollups
+
+Revision ID: add_user_score_rollups
+Revises: reduce_handle_length_to_15
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_score_rollups'
+down_revision = 'reduce_handle_length_to_15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-user score rollup for one UTC day
+    op.create_table(
+        'user_daily_scores',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_score', sa.BigInteger(), nullable=False),
+        sa.Column('run_count', sa.Integer(), nullable=False),
+        sa.Column('best_score', sa.Integer(), nullable=False),
+        sa.Column('last_played', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_index('idx_user_daily_scores_day', 'user_daily_scores', ['day'], unique=False)
+    
+    # All-time per-user totals
+    op.create_table(
+        'user_score_totals',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_score', sa.BigInteger(), nullable=False),
+        sa.Column('run_count', sa.Integer(), nullable=False),
+        sa.Column('best_score', sa.Integer(), nullable=False),
+        sa.Column('last_played', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('idx_user_score_totals_total', 'user_score_totals', [sa.text('total_score DESC')], unique=False)
+    
+    # Fold in existing scores; the backfill_score_rollups task repeats this on demand
+    op.execute(text("""
+        INSERT INTO user_daily_scores (user_id, day, total_score, run_count, best_score, last_played)
+        SELECT user_id, DATE(created_at AT TIME ZONE 'UTC'), SUM(score), COUNT(*), MAX(score), MAX(created_at)
+        FROM scores
+        GROUP BY user_id, DATE(created_at AT TIME ZONE 'UTC')
+    """))
+    op.execute(text("""
+        INSERT INTO user_score_totals (user_id, total_score, run_count, best_score, last_played)
+        SELECT user_id, SUM(total_score), SUM(run_count), MAX(best_score), MAX(last_played)
+        FROM user_daily_scores
+        GROUP BY user_id
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_user_score_totals_total', table_name='user_score_totals')
+    op.drop_table('user_score_totals')
+    op.drop_index('idx_user_daily_scores_day', table_name='user_daily_scores')
+    op.drop_table('user_daily_scores')
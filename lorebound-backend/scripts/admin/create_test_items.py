@@ -8,7 +8,9 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from app.core.redis_client import redis_context
 from app.repositories.base import get_session
+from app.services.item_catalog import ItemCatalogCache
 from app.domain.models import Item
 from app.domain.enums import ItemSlot, ItemRarity
 
@@ -137,6 +139,10 @@ async def create_test_items():
             
             await session.commit()
             
+            # Running API processes reload their cached catalog
+            async with redis_context() as redis:
+                await ItemCatalogCache.bump_version(redis)
+            
             print("\n" + "=" * 60)
             print(f"✅ Created {created_count} items, Updated {updated_count} items")
             print("=" * 60)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Simulate reward rarity rolls for drop table tuning."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.services.rewards import RewardEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tables", type=Path, help="Drop tables JSON file (default: the configured tables)")
+    parser.add_argument("--rolls", type=int, default=1_000_000, help="Rolls per drop table")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+    
+    engine = RewardEngine.from_file(args.tables)
+    
+    for name in engine.tables:
+        started = time.perf_counter()
+        counts = engine.simulate(name, args.rolls, seed=args.seed)
+        elapsed = time.perf_counter() - started
+        
+        print(f"\n{name} ({args.rolls:,} rolls in {elapsed:.2f}s)")
+        for rarity, count in counts.items():
+            print(f"  {rarity.value:<10} {count:>12,}  {count / args.rolls:7.3%}")
+
+
+if __name__ == "__main__":
+    main()
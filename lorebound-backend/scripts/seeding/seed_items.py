@@ -17,6 +17,8 @@ from sqlalchemy import select
 from app.domain.models import Item
 from app.domain.enums import ItemSlot, ItemRarity
 from app.core.config import get_settings
+from app.core.redis_client import redis_context
+from app.services.item_catalog import ItemCatalogCache
 
 
 # Item definitions with stats based on rarity
@@ -226,6 +228,10 @@ async def seed_items():
         
         await session.commit()
         
+        # Running API processes reload their cached catalog
+        async with redis_context() as redis:
+            await ItemCatalogCache.bump_version(redis)
+        
         print(f"\n{'='*60}")
         print(f"✓ Created {created_count} new items")
         print(f"↻ Updated {updated_count} existing items")
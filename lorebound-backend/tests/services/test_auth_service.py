@@ -1,6 +1,8 @@
 """Tests for AuthenticationService."""
 
 import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from uuid import uuid4
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -26,21 +28,21 @@ class TestAuthenticationService:
     async def test_register_user_success(self, auth_service, db_session, sample_user_data):
         """Test successful user registration."""
         # Mock repository methods
-        auth_service.user_repo.get_user_by_email = AsyncMock(return_value=None)
-        auth_service.user_repo.get_profile_by_handle = AsyncMock(return_value=None)
-        auth_service.user_repo.create_user = AsyncMock(return_value=Mock(id=uuid4()))
-        auth_service.user_repo.create_profile = AsyncMock(return_value=Mock())
-        auth_service.user_repo.add_base_items_to_user = AsyncMock()
+        auth_service.user_repo.register_user = AsyncMock(return_value=(Mock(id=uuid4()), None))
         
         # Mock token generation
-        auth_service._generate_token_pair = Mock(return_value={
+        auth_service._generate_token_pair = AsyncMock(return_value={
             "access_token": "test_access",
             "refresh_token": "test_refresh",
             "expires_in": 900
         })
         
         registration_data = UserRegisterRequest(**sample_user_data)
-        result = await auth_service.register_user(registration_data, db_session)
+        with patch(
+            "app.services.auth_service.InventoryRepository.get_starter_item_ids",
+            AsyncMock(return_value=[uuid4()])
+        ):
+            result = await auth_service.register_user(registration_data, db_session)
         
         assert result is not None
         assert result.user is not None
@@ -49,22 +51,21 @@ class TestAuthenticationService:
     @pytest.mark.unit
     async def test_register_user_email_exists(self, auth_service, db_session, sample_user_data):
         """Test registration with existing email."""
-        auth_service.user_repo.get_user_by_email = AsyncMock(return_value=Mock(id=uuid4()))
+        auth_service.user_repo.register_user = AsyncMock(return_value=(None, "email"))
         
         registration_data = UserRegisterRequest(**sample_user_data)
         
-        with pytest.raises(UserAlreadyExistsError):
+        with pytest.raises(UserAlreadyExistsError, match="email"):
             await auth_service.register_user(registration_data, db_session)
 
     @pytest.mark.unit
     async def test_register_user_handle_exists(self, auth_service, db_session, sample_user_data):
         """Test registration with existing handle."""
-        auth_service.user_repo.get_user_by_email = AsyncMock(return_value=None)
-        auth_service.user_repo.get_profile_by_handle = AsyncMock(return_value=Mock())
+        auth_service.user_repo.register_user = AsyncMock(return_value=(None, "handle"))
         
         registration_data = UserRegisterRequest(**sample_user_data)
         
-        with pytest.raises(UserAlreadyExistsError):
+        with pytest.raises(UserAlreadyExistsError, match="Handle"):
             await auth_service.register_user(registration_data, db_session)
 
     @pytest.mark.unit
@@ -72,7 +73,7 @@ class TestAuthenticationService:
         """Test successful user login."""
         auth_service.user_repo.get_user_by_email = AsyncMock(return_value=test_user)
         auth_service.user_repo.update_user_login_time = AsyncMock()
-        auth_service._generate_token_pair = Mock(return_value={
+        auth_service._generate_token_pair = AsyncMock(return_value={
             "access_token": "test_access",
             "refresh_token": "test_refresh",
             "expires_in": 900
@@ -129,3 +130,45 @@ class TestAuthenticationService:
         with pytest.raises(InvalidCredentialsError):
             await auth_service.login_user(login_data, db_session)
 
+
+    @pytest.mark.unit
+    async def test_logout_revokes_only_its_session(self, auth_service):
+        """Test logout revokes the caller's token family, not the user's other sessions."""
+        with patch("app.services.auth_service.verified_token_cache") as token_cache, \
+             patch("app.services.auth_service.refresh_token_store") as store, \
+             patch("app.services.auth_service.token_revocation_list") as revocations:
+            token_cache.verify.return_value = {"user_id": "user-1", "fam": "family-1"}
+            store.revoke_family = AsyncMock()
+            revocations.revoke_user = AsyncMock()
+            
+            await auth_service.revoke_session_tokens("access-token", uuid4())
+        
+        store.revoke_family.assert_awaited_once_with("family-1")
+        revocations.revoke_user.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_login_invalidates_principal_after_commit(self, auth_service):
+        """Test the cached principal is dropped only once the new login time is committed."""
+        user = SimpleNamespace(
+            id=uuid4(), email="player@example.com", apple_sub=None, password_hash="hash",
+            status=UserStatus.ACTIVE, created_at=datetime.now(timezone.utc), last_login_at=None
+        )
+        auth_service.user_repo.get_user_by_email = AsyncMock(return_value=user)
+        auth_service.user_repo.update_user_login_time = AsyncMock(return_value=True)
+        auth_service._generate_token_pair = AsyncMock(return_value=Mock())
+        
+        calls = Mock()
+        session = Mock(commit=AsyncMock(), rollback=AsyncMock())
+        calls.attach_mock(session.commit, "commit")
+        with patch("app.services.auth_service.password_hasher.verify", AsyncMock(return_value=True)), \
+             patch("app.services.auth_service.user_principal_cache") as cache, \
+             patch("app.services.auth_service.AuthResponse"):
+            cache.invalidate = AsyncMock()
+            calls.attach_mock(cache.invalidate, "invalidate")
+            
+            await auth_service.login_user(
+                UserLoginRequest(email="player@example.com", password="Password123!"), session
+            )
+        
+        assert [call[0] for call in calls.mock_calls] == ["commit", "invalidate"]
+        cache.invalidate.assert_awaited_once_with(user.id)
@@ -0,0 +1,381 @@
+"""Tests for LeaderboardService."""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from app.services.leaderboard_service import LeaderboardService
+from app.services.exceptions import LeaderboardPeriodNotFoundError
+from app.domain.enums import LeaderboardScope
+
+
+@pytest.mark.service
+class TestLeaderboardService:
+    """Test LeaderboardService functionality."""
+
+    @pytest.fixture
+    def leaderboard_service(self, mock_redis_client):
+        """Create LeaderboardService instance with a mocked repository."""
+        mock_redis_client.get_json = AsyncMock(return_value=None)
+        mock_redis_client.set_json = AsyncMock()
+        mock_redis_client.acquire_lock = AsyncMock(return_value=True)
+        mock_redis_client.release_lock = AsyncMock(return_value=True)
+        mock_redis_client.hash_get_all = AsyncMock(return_value={})
+        service = LeaderboardService(Mock(), mock_redis_client)
+        service.repo = Mock()
+        service.repo.get_leaderboard_snapshot = AsyncMock(return_value=None)
+        return service
+
+    @pytest.mark.unit
+    async def test_get_leaderboard_formats_joined_rows(self, leaderboard_service):
+        """Test entries are built from the joined profile columns."""
+        user_id = uuid4()
+        leaderboard_service.repo.get_top_scores_for_period = AsyncMock(return_value=[
+            {
+                "user_id": user_id,
+                "handle": "TestPlayer",
+                "avatar_layers": {"color": "red"},
+                "total_score": 1500,
+                "run_count": 3,
+                "last_played": None,
+            },
+            {
+                "user_id": uuid4(),
+                "handle": None,
+                "avatar_layers": None,
+                "total_score": 900,
+                "run_count": 1,
+                "last_played": None,
+            },
+        ])
+        leaderboard_service.repo.count_participants_in_period = AsyncMock(return_value=2)
+
+        result = await leaderboard_service.get_leaderboard(LeaderboardScope.ALLTIME, limit=10, offset=0)
+
+        assert result["total_participants"] == 2
+        assert result["entries"][0] == {
+            "rank": 1,
+            "user_id": str(user_id),
+            "handle": "TestPlayer",
+            "score": 1500,
+            "total_runs": 3,
+            "avatar_layers": {"color": "red"},
+        }
+        assert result["entries"][1]["handle"] == "Anonymous"
+        assert result["entries"][1]["avatar_layers"] == {}
+
+    @pytest.mark.unit
+    async def test_get_user_rank_uses_window_query(self, leaderboard_service):
+        """Test user rank and neighbors come from the single ranked query."""
+        user_id = uuid4()
+        neighbor_id = uuid4()
+        leaderboard_service.repo.get_user_period_total = AsyncMock(return_value={
+            "total_score": 800, "run_count": 4, "handle": "TestPlayer"
+        })
+        leaderboard_service.repo.get_user_rank_with_neighbors = AsyncMock(return_value=(
+            {"user_id": user_id, "handle": "TestPlayer", "avatar_layers": {},
+             "total_score": 800, "run_count": 4, "rank": 2},
+            [{"user_id": neighbor_id, "handle": "Leader", "avatar_layers": {},
+              "total_score": 900, "run_count": 2, "rank": 1}],
+            25,
+        ))
+        leaderboard_service.repo.count_participants_in_period = AsyncMock()
+
+        result = await leaderboard_service.get_user_rank(user_id, LeaderboardScope.WEEKLY, neighbors_count=1)
+
+        assert result["rank"] == 2
+        assert result["rank_is_approximate"] is False
+        assert result["percentile"] == 8.0
+        assert result["score"] == 800
+        assert result["total_runs"] == 4
+        assert result["total_participants"] == 25
+        assert result["neighbors"] == [
+            {"rank": 1, "user_id": str(neighbor_id), "handle": "Leader", "score": 900}
+        ]
+        leaderboard_service.repo.count_participants_in_period.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_get_user_rank_without_scores(self, leaderboard_service):
+        """Test user without scores in the period gets no rank."""
+        leaderboard_service.repo.get_user_period_total = AsyncMock(return_value=None)
+        leaderboard_service.repo.get_user_rank_with_neighbors = AsyncMock()
+        leaderboard_service.repo.count_participants_in_period = AsyncMock(return_value=7)
+
+        result = await leaderboard_service.get_user_rank(uuid4(), LeaderboardScope.TODAY)
+
+        assert result["rank"] is None
+        assert result["neighbors"] == []
+        assert result["total_participants"] == 7
+        leaderboard_service.repo.get_user_rank_with_neighbors.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_invalidation_bumps_generation(self, leaderboard_service, mock_redis_client):
+        """Test invalidation is a generation bump and cache keys follow it."""
+        mock_redis_client.increment_many = AsyncMock(return_value=[1, 1, 1])
+
+        await leaderboard_service.invalidate_leaderboard_cache(uuid4())
+
+        keys, ttl = mock_redis_client.increment_many.call_args.args
+        assert len(keys) == 3
+        assert all(key.startswith("leaderboard_gen:") for key in keys)
+        assert ttl == LeaderboardService.GENERATION_TTL
+        mock_redis_client.delete.assert_not_called()
+        mock_redis_client.delete_pattern.assert_not_called()
+
+        mock_redis_client.get = AsyncMock(return_value="4")
+        leaderboard_service.repo.get_leaderboard_stats = AsyncMock(return_value={
+            "participants": 0, "last_updated": datetime.now(timezone.utc)
+        })
+
+        await leaderboard_service.get_leaderboard_stats(LeaderboardScope.TODAY)
+
+        cache_key = mock_redis_client.set_json.call_args.args[0]
+        assert cache_key.startswith("leaderboard_stats:today:")
+        assert cache_key.endswith(":v4")
+
+    @pytest.mark.unit
+    async def test_get_leaderboard_serves_snapshot_when_cache_cold(self, leaderboard_service):
+        """Test a cold live cache is filled from the snapshot without aggregating."""
+        entries = [
+            {"rank": i + 1, "user_id": str(uuid4()), "handle": f"P{i}",
+             "score": 100 - i, "total_runs": 1, "avatar_layers": {}}
+            for i in range(5)
+        ]
+        snapshot = Mock(payload={
+            "scope": "alltime",
+            "period_key": "alltime",
+            "total_participants": 5,
+            "entries": entries,
+            "stats": {"participants": 5},
+            "last_updated": datetime.now(timezone.utc).isoformat(),
+        })
+        leaderboard_service.repo.get_leaderboard_snapshot = AsyncMock(return_value=snapshot)
+        leaderboard_service.repo.get_top_scores_for_period = AsyncMock()
+
+        result = await leaderboard_service.get_leaderboard(LeaderboardScope.ALLTIME, limit=2, offset=2)
+
+        assert result["entries"] == entries[2:4]
+        cached = leaderboard_service.redis.set_json.call_args.args[1]
+        assert cached["value"] == result
+        assert result["total_participants"] == 5
+        leaderboard_service.repo.get_top_scores_for_period.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_stale_snapshot_falls_through_to_live_query(self, leaderboard_service):
+        """Test a snapshot left behind by a failing snapshot task isn't served."""
+        stale = datetime.now(timezone.utc) - LeaderboardService.SNAPSHOT_MAX_AGE - timedelta(minutes=1)
+        snapshot = Mock(payload={
+            "scope": "alltime",
+            "period_key": "alltime",
+            "total_participants": 0,
+            "entries": [],
+            "stats": {"participants": 0},
+            "last_updated": stale.isoformat(),
+        })
+        leaderboard_service.repo.get_leaderboard_snapshot = AsyncMock(return_value=snapshot)
+        leaderboard_service.repo.get_top_scores_for_period = AsyncMock(return_value=[])
+        leaderboard_service.repo.count_participants_in_period = AsyncMock(return_value=0)
+
+        await leaderboard_service.get_leaderboard(LeaderboardScope.ALLTIME, limit=2)
+
+        leaderboard_service.repo.get_top_scores_for_period.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_materialize_snapshots_persists_every_scope(self, leaderboard_service):
+        """Test materialization stores and caches a snapshot per scope."""
+        leaderboard_service.repo.get_top_scores_for_period = AsyncMock(return_value=[])
+        leaderboard_service.repo.count_participants_in_period = AsyncMock(return_value=0)
+        leaderboard_service.repo.get_leaderboard_stats = AsyncMock(side_effect=lambda *args: {
+            "participants": 0, "last_updated": datetime.now(timezone.utc)
+        })
+        leaderboard_service.repo.save_leaderboard_snapshot = AsyncMock()
+        leaderboard_service.repo.get_score_histogram = AsyncMock(return_value={10: 2})
+
+        materialized = await leaderboard_service.materialize_snapshots()
+
+        assert len(materialized) == 3
+        assert leaderboard_service.repo.save_leaderboard_snapshot.await_count == 3
+        scope, period_key, payload = leaderboard_service.repo.save_leaderboard_snapshot.call_args_list[0].args
+        assert isinstance(payload["stats"]["last_updated"], str)
+        assert leaderboard_service.repo.get_top_scores_for_period.call_args.args[2] == LeaderboardService.SNAPSHOT_SIZE
+        assert leaderboard_service.redis.replace_hash.await_count == 3
+
+    @pytest.mark.unit
+    async def test_dungeon_board_bypasses_global_snapshot(self, leaderboard_service):
+        """Test dungeon boards aggregate their own rollups and never serve the global snapshot."""
+        board = f"dungeon:{uuid4()}"
+        leaderboard_service.repo.get_top_scores_for_period = AsyncMock(return_value=[])
+        leaderboard_service.repo.count_participants_in_period = AsyncMock(return_value=0)
+
+        result = await leaderboard_service.get_leaderboard(LeaderboardScope.WEEKLY, limit=10, offset=0, board=board)
+
+        assert result["board"] == board
+        assert leaderboard_service.repo.get_top_scores_for_period.call_args.args[4] == board
+        leaderboard_service.repo.get_leaderboard_snapshot.assert_not_called()
+        cache_key = leaderboard_service.redis.set_json.call_args.args[0]
+        assert f":{board}:" in cache_key
+
+    @pytest.mark.unit
+    async def test_get_user_rank_estimates_outside_top_k(self, leaderboard_service, mock_redis_client):
+        """Test players outside the top-K are placed from the histogram alone."""
+        service = leaderboard_service
+        my_bucket = service._histogram_bucket(500)
+        mock_redis_client.hash_get_all = AsyncMock(return_value={
+            str(my_bucket + 5): "4000",
+            str(my_bucket): "1",
+            str(my_bucket - 5): "5999",
+        })
+        service.repo.get_user_period_total = AsyncMock(return_value={
+            "total_score": 500, "run_count": 9, "handle": "Midfield"
+        })
+        service.repo.get_user_rank_with_neighbors = AsyncMock()
+
+        result = await service.get_user_rank(uuid4(), LeaderboardScope.ALLTIME)
+
+        assert result["rank"] == 4001
+        assert result["rank_is_approximate"] is True
+        assert result["total_participants"] == 10000
+        assert result["percentile"] == 40.0
+        assert result["neighbors"] == []
+        service.repo.get_user_rank_with_neighbors.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_update_user_score_moves_histogram_buckets(self, leaderboard_service, mock_redis_client):
+        """Test a score write moves the user's totals between buckets in one pipeline."""
+        service = leaderboard_service
+        mock_redis_client.increment_many = AsyncMock(return_value=[1, 1, 1])
+        mock_redis_client.hash_increment_many = AsyncMock()
+        mock_redis_client.publish_many = AsyncMock()
+        totals = {
+            LeaderboardScope.TODAY: {"total_score": 300, "run_count": 1, "handle": None},
+            LeaderboardScope.WEEKLY: {"total_score": 1300, "run_count": 3, "handle": None},
+            LeaderboardScope.ALLTIME: None,
+        }
+        service.repo.get_user_period_total = AsyncMock(
+            side_effect=lambda user_id, scope, period_key: totals[scope]
+        )
+
+        await service.update_user_score(uuid4(), 300, uuid4())
+
+        updates, ttl = mock_redis_client.hash_increment_many.call_args.args
+        by_scope = {key.split(":")[1]: increments for key, increments in updates.items()}
+        assert set(by_scope) == {"today", "weekly"}
+        assert by_scope["today"] == {str(service._histogram_bucket(300)): 1}
+        assert by_scope["weekly"] == {
+            str(service._histogram_bucket(1300)): 1,
+            str(service._histogram_bucket(1000)): -1,
+        }
+        assert ttl == LeaderboardService.GENERATION_TTL
+
+        messages = mock_redis_client.publish_many.call_args.args[0]
+        assert sorted(channel for channel, _ in messages) == [
+            "leaderboard_events:today", "leaderboard_events:weekly"
+        ]
+        assert all(json.loads(message)["delta"] == 300 for _, message in messages)
+
+    @pytest.mark.unit
+    async def test_get_friends_leaderboard_marks_own_entry(self, leaderboard_service):
+        """Test the friends ranking is formatted and the caller's entry flagged."""
+        user_id = uuid4()
+        friend_id = uuid4()
+        leaderboard_service.repo.get_friends_ranking = AsyncMock(return_value=[
+            {"user_id": friend_id, "handle": "Buddy", "avatar_layers": None,
+             "total_score": 1200, "run_count": 5, "rank": 1},
+            {"user_id": user_id, "handle": "Me", "avatar_layers": {},
+             "total_score": 700, "run_count": 2, "rank": 2},
+        ])
+
+        result = await leaderboard_service.get_friends_leaderboard(user_id, LeaderboardScope.WEEKLY)
+
+        assert result["total_participants"] == 2
+        assert [entry["is_you"] for entry in result["entries"]] == [False, True]
+        assert result["entries"][0]["avatar_layers"] == {}
+        assert leaderboard_service.redis.set_json.call_args.args[0].startswith(f"leaderboard_friends:{user_id}:weekly:")
+
+    @pytest.mark.unit
+    def test_finished_period_keys_wait_for_grace(self, leaderboard_service):
+        """Test a period only counts as finished once the grace window has passed."""
+        service = leaderboard_service
+        just_after = datetime(2026, 10, 19, 0, 1, tzinfo=timezone.utc)
+        later = datetime(2026, 10, 19, 0, 5, tzinfo=timezone.utc)
+
+        assert service._finished_period_key(LeaderboardScope.TODAY, just_after) == "2026-10-17"
+        assert service._finished_period_key(LeaderboardScope.TODAY, later) == "2026-10-18"
+        assert service._finished_period_key(LeaderboardScope.WEEKLY, just_after) == "2026-W41"
+        assert service._finished_period_key(LeaderboardScope.WEEKLY, later) == "2026-W42"
+
+    @pytest.mark.unit
+    async def test_rollover_freezes_finished_periods_once(self, leaderboard_service, mock_redis_client):
+        """Test rollover archives unfrozen periods and drops their live keys."""
+        service = leaderboard_service
+        service.repo.get_frozen_snapshot = AsyncMock(
+            side_effect=lambda scope, period_key: Mock() if scope == LeaderboardScope.WEEKLY else None
+        )
+        service.repo.get_frozen_period_keys = AsyncMock(return_value=[])
+        service.repo.freeze_leaderboard_snapshot = AsyncMock()
+        service.repo.get_top_scores_for_period = AsyncMock(return_value=[])
+        service.repo.count_participants_in_period = AsyncMock(return_value=0)
+        service.repo.get_leaderboard_stats = AsyncMock(return_value={
+            "participants": 0, "last_updated": datetime.now(timezone.utc)
+        })
+        mock_redis_client.delete_many = AsyncMock()
+
+        frozen = await service.rollover_periods(datetime(2026, 10, 19, 0, 5, tzinfo=timezone.utc))
+
+        assert frozen == ["today:2026-10-18"]
+        scope, period_key, payload = service.repo.freeze_leaderboard_snapshot.call_args.args
+        assert (scope, period_key) == (LeaderboardScope.TODAY, "2026-10-18")
+        assert "stats" in payload and "frozen_at" in payload
+        assert service.repo.get_top_scores_for_period.call_args.args[2] == LeaderboardService.ARCHIVE_SIZE
+        assert mock_redis_client.delete_many.call_args.args[0] == [
+            "leaderboard_gen:today:2026-10-18",
+            "leaderboard_hist:today:2026-10-18",
+            "leaderboard_snapshot:today:2026-10-18",
+        ]
+
+    @pytest.mark.unit
+    async def test_rollover_catches_up_missed_periods(self, leaderboard_service, mock_redis_client):
+        """Test periods skipped while the beat was down are frozen oldest first, a bounded number per run."""
+        service = leaderboard_service
+        last_frozen = {LeaderboardScope.TODAY: "2026-10-15", LeaderboardScope.WEEKLY: "2026-W52"}
+        service.repo.get_frozen_period_keys = AsyncMock(
+            side_effect=lambda scope, limit: [last_frozen[scope]]
+        )
+        service.freeze_period = AsyncMock(return_value=True)
+
+        frozen = await service.rollover_periods(datetime(2026, 10, 19, 0, 5, tzinfo=timezone.utc))
+
+        assert frozen == ["today:2026-10-16", "today:2026-10-17", "today:2026-10-18"]
+
+        last_frozen[LeaderboardScope.WEEKLY] = "2025-W52"
+        frozen = await service.rollover_periods(datetime(2026, 10, 19, 0, 5, tzinfo=timezone.utc))
+
+        weekly = [key for key in frozen if key.startswith("weekly:")]
+        assert len(weekly) == LeaderboardService.ROLLOVER_MAX_CATCH_UP
+        assert weekly[:2] == ["weekly:2026-W01", "weekly:2026-W02"]
+
+    @pytest.mark.unit
+    async def test_get_archived_leaderboard(self, leaderboard_service):
+        """Test archived pages come from the frozen payload and missing periods raise."""
+        service = leaderboard_service
+        payload = {
+            "board": "global",
+            "total_participants": 3,
+            "entries": [{"rank": rank} for rank in (1, 2, 3)],
+            "stats": {"participants": 3},
+            "frozen_at": "2026-10-19T00:05:00+00:00",
+        }
+        service.repo.get_frozen_snapshot = AsyncMock(
+            side_effect=lambda scope, period_key: Mock(payload=payload) if period_key == "2026-W42" else None
+        )
+
+        result = await service.get_archived_leaderboard(LeaderboardScope.WEEKLY, "2026-W42", limit=2, offset=1)
+
+        assert [entry["rank"] for entry in result["entries"]] == [2, 3]
+        assert result["total_participants"] == 3
+        assert service.redis.set_json.call_args.args[0] == "leaderboard_archive:weekly:2026-W42"
+
+        with pytest.raises(LeaderboardPeriodNotFoundError):
+            await service.get_archived_leaderboard(LeaderboardScope.WEEKLY, "2026-W41")
@@ -0,0 +1,129 @@
+"""Tests for the coalescing read-through cache."""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.cache import SingleFlight, get_or_compute, should_refresh_early
+
+
+@pytest.mark.unit
+class TestGetOrCompute:
+    """Test request coalescing and early refresh."""
+
+    @pytest.fixture
+    def redis(self, mock_redis_client):
+        """Redis mock with an empty cache and a free lock."""
+        mock_redis_client.get_json = AsyncMock(return_value=None)
+        mock_redis_client.set_json = AsyncMock()
+        mock_redis_client.acquire_lock = AsyncMock(return_value=True)
+        mock_redis_client.release_lock = AsyncMock(return_value=True)
+        return mock_redis_client
+
+    async def test_concurrent_misses_compute_once(self, redis):
+        """Test concurrent misses on one key share a single computation."""
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"entries": []}
+
+        results = await asyncio.gather(*[
+            get_or_compute(redis, "leaderboard:test", 30, compute) for _ in range(10)
+        ])
+
+        assert calls == 1
+        assert all(result == {"entries": []} for result in results)
+        redis.acquire_lock.assert_awaited_once()
+        redis.release_lock.assert_awaited_once()
+
+        key, entry, ttl = redis.set_json.call_args.args
+        assert key == "leaderboard:test"
+        assert entry["value"] == {"entries": []}
+        assert ttl == 30
+
+    async def test_fresh_entry_is_served_from_cache(self, redis):
+        """Test an entry far from expiry is returned without recomputing."""
+        redis.get_json = AsyncMock(return_value={
+            "value": 42, "delta": 0.01, "expiry": time.time() + 60
+        })
+        compute = AsyncMock()
+
+        assert await get_or_compute(redis, "leaderboard:test", 30, compute) == 42
+        compute.assert_not_called()
+
+    async def test_stale_entry_served_while_locked_elsewhere(self, redis):
+        """Test an early refresh yields to another process holding the lock."""
+        redis.get_json = AsyncMock(return_value={
+            "value": 42, "delta": 0.01, "expiry": time.time() - 1
+        })
+        redis.acquire_lock = AsyncMock(return_value=False)
+        compute = AsyncMock()
+
+        assert await get_or_compute(redis, "leaderboard:test", 30, compute) == 42
+        compute.assert_not_called()
+
+    async def test_compute_errors_reach_every_waiter(self, redis):
+        """Test a failing computation is raised to all coalesced callers."""
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("database unavailable")
+
+        results = await asyncio.gather(
+            *[get_or_compute(redis, "leaderboard:test", 30, compute) for _ in range(3)],
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        redis.release_lock.assert_awaited_once()
+
+    async def test_cancelled_first_caller_keeps_others_served(self):
+        """Test cancelling the caller that started a computation doesn't fail the callers waiting on it."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42
+
+        leader = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await waiter == 42
+        assert leader.cancelled()
+        assert calls == 1
+        assert await flight.do("key", compute) == 42
+        assert calls == 2
+
+    async def test_redis_errors_fall_back_to_compute(self, redis):
+        """Test an unreachable Redis or exhausted pool serves computed values instead of errors."""
+        compute = AsyncMock(return_value=42)
+        redis.get_json = AsyncMock(side_effect=RedisConnectionError("No connection available."))
+
+        assert await get_or_compute(redis, "leaderboard:test", 30, compute) == 42
+
+        redis.get_json = AsyncMock(return_value=None)
+        redis.set_json = AsyncMock(side_effect=RedisConnectionError("No connection available."))
+        redis.release_lock = AsyncMock(side_effect=RedisConnectionError("No connection available."))
+
+        assert await get_or_compute(redis, "leaderboard:test", 30, compute) == 42
+        assert compute.await_count == 2
+
+    def test_should_refresh_early(self):
+        """Test XFetch refreshes expired entries and keeps fresh ones."""
+        assert should_refresh_early({"delta": 0.05, "expiry": time.time() - 1})
+        assert not should_refresh_early({"delta": 0.0, "expiry": time.time() + 60})
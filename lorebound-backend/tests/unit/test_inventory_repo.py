@@ -0,0 +1,128 @@
+"""Tests for InventoryRepository query construction."""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.domain.enums import ItemSlot
+from app.repositories.inventory_repo import InventoryRepository
+
+
+def summary_row(grouping, items, slot=None, rarity=None, equipped=None, equipped_item_ids=None):
+    """One row of the GROUPING SETS result."""
+    return Mock(
+        grouping=grouping, items=items, slot=slot, rarity=rarity,
+        equipped=equipped, equipped_item_ids=equipped_item_ids
+    )
+
+
+@pytest.mark.unit
+class TestInventorySummary:
+    """Test the single-query inventory summary."""
+    
+    @pytest.fixture
+    def repo(self):
+        """Repository over a session that records executed statements."""
+        session = Mock()
+        session.execute = AsyncMock()
+        return InventoryRepository(session)
+    
+    async def test_single_grouping_sets_query(self, repo):
+        """Test counts by slot, rarity and equipped state come from one query."""
+        equipped_ids = [uuid4(), uuid4()]
+        repo.session.execute.return_value = Mock(all=Mock(return_value=[
+            summary_row(0b011, 2, slot="weapon"),
+            summary_row(0b011, 1, slot="helmet"),
+            summary_row(0b101, 3, rarity="common"),
+            summary_row(0b110, 1, equipped=False),
+            summary_row(0b110, 2, equipped=True),
+            summary_row(0b111, 3, equipped_item_ids=equipped_ids),
+        ]))
+        
+        summary = await repo.get_inventory_summary(uuid4())
+        
+        repo.session.execute.assert_awaited_once()
+        sql = str(repo.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "GROUP BY GROUPING SETS((items.slot), (items.rarity), (inventory.equipped), ())" in sql
+        
+        assert summary["total_items"] == 3
+        assert summary["equipped_items"] == 2
+        assert summary["items_by_slot"]["weapon"] == 2
+        assert summary["items_by_slot"]["helmet"] == 1
+        assert summary["items_by_slot"]["amulet"] == 0
+        assert summary["items_by_rarity"] == {
+            "common": 3, "uncommon": 0, "rare": 0, "epic": 0, "legendary": 0
+        }
+        assert summary["equipped_item_ids"] == equipped_ids
+    
+    async def test_empty_inventory(self, repo):
+        """Test the grand total row alone yields a zero-filled summary."""
+        repo.session.execute.return_value = Mock(all=Mock(return_value=[summary_row(0b111, 0)]))
+        
+        summary = await repo.get_inventory_summary(uuid4())
+        
+        assert summary["total_items"] == summary["equipped_items"] == 0
+        assert set(summary["items_by_slot"].values()) == {0}
+        assert summary["equipped_item_ids"] == []
+
+
+def loadout_row(item_id, slot, equipped=True, changed=False):
+    """One row of the loadout statement: an updated row or a prior equipped one."""
+    return Mock(item_id=item_id, slot=slot, equipped=equipped, changed=changed)
+
+
+@pytest.mark.unit
+class TestSetLoadout:
+    """Test loadouts are validated and applied by one statement."""
+    
+    @pytest.fixture
+    def repo(self):
+        """Repository over a session that records executed statements."""
+        session = Mock()
+        session.execute = AsyncMock()
+        return InventoryRepository(session)
+    
+    def returns(self, repo, rows):
+        """Make the loadout statement return rows."""
+        repo.session.execute.return_value = Mock(all=Mock(return_value=rows))
+    
+    async def test_swap_items(self, repo):
+        """Test the new equipped set and the changed slots are returned."""
+        old_sword, new_sword, cap, shield = uuid4(), uuid4(), uuid4(), uuid4()
+        self.returns(repo, [
+            loadout_row(old_sword, "weapon", equipped=False, changed=True),
+            loadout_row(shield, "shield", equipped=False, changed=True),
+            loadout_row(new_sword, "weapon", changed=True),
+            loadout_row(old_sword, "weapon"),
+            loadout_row(cap, "helmet"),
+            loadout_row(shield, "shield"),
+        ])
+        
+        equipped, changed = await repo.set_loadout(
+            uuid4(), {ItemSlot.WEAPON: new_sword, ItemSlot.HELMET: cap, ItemSlot.SHIELD: None}
+        )
+        
+        assert equipped == {ItemSlot.WEAPON: new_sword, ItemSlot.HELMET: cap}
+        assert changed == {ItemSlot.WEAPON, ItemSlot.SHIELD}
+        
+        repo.session.execute.assert_awaited_once()
+        sql = str(repo.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("WITH changed AS \n(UPDATE inventory SET equipped=")
+        assert "(inventory.item_id, items.slot) IN" in sql
+        assert "RETURNING inventory.item_id, items.slot, inventory.equipped" in sql
+    
+    async def test_unowned_item_is_rejected(self, repo):
+        """Test nothing changes when an item isn't owned or doesn't fit its slot."""
+        cap = uuid4()
+        self.returns(repo, [loadout_row(cap, "helmet")])
+        
+        assert await repo.set_loadout(uuid4(), {ItemSlot.WEAPON: uuid4()}) is None
+    
+    async def test_unchanged_loadout(self, repo):
+        """Test requesting what is already equipped is not an error."""
+        cap = uuid4()
+        self.returns(repo, [loadout_row(cap, "helmet")])
+        
+        assert await repo.set_loadout(uuid4(), {ItemSlot.HELMET: cap}) == ({ItemSlot.HELMET: cap}, set())
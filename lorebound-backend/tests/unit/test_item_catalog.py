@@ -0,0 +1,135 @@
+"""Tests for the in-process item catalog."""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.domain.enums import ItemRarity, ItemSlot
+from app.services.inventory_service import InventoryService
+from app.services.item_catalog import CatalogItem, ItemCatalog, ItemCatalogCache
+
+
+def make_item(slug, rarity=ItemRarity.COMMON, slot=ItemSlot.WEAPON):
+    """Item row as loaded from the database."""
+    item = Mock(id=uuid4(), slug=slug, slot=slot.value, rarity=rarity.value, stats={"attack": 1})
+    # Mock() reserves the name argument
+    item.name = slug.title()
+    return item
+
+
+@pytest.mark.unit
+class TestItemCatalog:
+    """Test grouping and owned-item bitmasks."""
+
+    @pytest.fixture
+    def rows(self):
+        """A small catalog."""
+        return [
+            make_item("sword"),
+            make_item("cap", slot=ItemSlot.HELMET),
+            make_item("crown", ItemRarity.LEGENDARY, ItemSlot.HELMET),
+        ]
+
+    @pytest.fixture
+    def catalog(self, rows):
+        """Catalog built from the rows."""
+        return ItemCatalog((CatalogItem.model_validate(row) for row in rows), version=3)
+
+    def test_grouping(self, catalog, rows):
+        """Test items are grouped by rarity and slot."""
+        assert [item.slug for item in catalog.by_rarity[ItemRarity.COMMON]] == ["cap", "sword"]
+        assert [item.slug for item in catalog.by_slot[ItemSlot.HELMET]] == ["cap", "crown"]
+        assert catalog.get(rows[2].id).rarity == ItemRarity.LEGENDARY
+        assert catalog.get(uuid4()) is None
+
+        with pytest.raises(TypeError):
+            catalog.by_rarity[ItemRarity.RARE] = ()
+
+    def test_owned_mask(self, catalog, rows):
+        """Test owned items are excluded from the available ones."""
+        owned = catalog.owned_mask([rows[0].id, uuid4()])
+
+        assert [item.slug for item in catalog.unowned(ItemRarity.COMMON, owned)] == ["cap"]
+
+        owned = catalog.with_owned(catalog.get(rows[1].id), owned)
+        assert catalog.unowned(ItemRarity.COMMON, owned) == []
+        assert catalog.unowned(ItemRarity.EPIC, owned) == []
+
+    def test_total_stats(self, catalog, rows):
+        """Test numeric stats of a loadout are summed and unknown items skipped."""
+        assert catalog.total_stats([rows[0].id, rows[2].id, uuid4()]) == {"attack": 2}
+        assert catalog.total_stats([]) == {}
+
+
+@pytest.mark.unit
+class TestItemCatalogCache:
+    """Test loading and version checks."""
+
+    @pytest.fixture
+    def repo(self):
+        """Inventory repository returning a one-item catalog."""
+        repo = Mock()
+        repo.list_all_items = AsyncMock(return_value=[make_item("sword")])
+        with patch("app.services.item_catalog.InventoryRepository", return_value=repo):
+            yield repo
+
+    async def test_loaded_once_per_version(self, repo, mock_redis_client):
+        """Test the catalog is reused until its version changes."""
+        mock_redis_client.get = AsyncMock(return_value="1")
+        cache = ItemCatalogCache(mock_redis_client)
+
+        first = await cache.get(Mock())
+        assert await cache.get(Mock()) is first
+        mock_redis_client.get.assert_awaited_once()
+
+        # Past the check interval with the same version
+        cache._checked_at = 0.0
+        assert await cache.get(Mock()) is first
+        repo.list_all_items.assert_awaited_once()
+
+        # Seeding bumped the version
+        mock_redis_client.get = AsyncMock(return_value="2")
+        cache._checked_at = 0.0
+        second = await cache.get(Mock())
+        assert second is not first and second.version == 2
+        assert repo.list_all_items.await_count == 2
+
+    async def test_redis_errors_keep_serving(self, repo, mock_redis_client):
+        """Test a failed version check keeps the loaded catalog."""
+        mock_redis_client.get = AsyncMock(return_value="1")
+        cache = ItemCatalogCache(mock_redis_client)
+        first = await cache.get(Mock())
+
+        mock_redis_client.get = AsyncMock(side_effect=ConnectionError("down"))
+        cache._checked_at = 0.0
+
+        assert await cache.get(Mock()) is first
+        repo.list_all_items.assert_awaited_once()
+
+
+@pytest.mark.unit
+class TestRunRewards:
+    """Test reward distribution from the cached catalog."""
+
+    async def test_rewards_skip_owned_items_without_catalog_queries(self):
+        """Test rewards come from the catalog and are inserted in one statement."""
+        rows = [make_item(f"item{i}", rarity) for i, rarity in enumerate(ItemRarity)]
+        catalog = ItemCatalog((CatalogItem.model_validate(row) for row in rows), version=1)
+        owned = {row.id for row in rows[:-1]}
+
+        inventory_repo = Mock()
+        inventory_repo.get_owned_item_ids = AsyncMock(return_value=owned)
+        inventory_repo.add_items_to_inventory = AsyncMock(return_value=1)
+
+        with patch("app.services.inventory_service.InventoryRepository", return_value=inventory_repo), \
+                patch("app.services.inventory_service.item_catalog_cache") as cache:
+            cache.get = AsyncMock(return_value=catalog)
+            rewards = await InventoryService().distribute_run_rewards(
+                uuid4(), is_daily_challenge=True, is_victory=True, score=0, session=Mock()
+            )
+
+        # Only one item is left to win, however many rewards are rolled
+        assert [reward["slug"] for reward in rewards] == [rows[-1].slug]
+        inventory_repo.list_all_items.assert_not_called()
+        inventory_repo.add_items_to_inventory.assert_awaited_once()
+        assert inventory_repo.add_items_to_inventory.call_args.args[1] == [rows[-1].id]
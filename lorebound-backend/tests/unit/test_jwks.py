@@ -0,0 +1,128 @@
+"""Tests for the JWKS cache against a local stand-in server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.core.jwks import JWKSCache
+
+
+def make_jwk(kid: str):
+    """Generate an RSA key pair and its public JWK."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+class JWKSStandIn:
+    """Local HTTP server publishing a mutable key set and counting requests."""
+
+    def __init__(self):
+        self.keys = []
+        self.cache_control = "max-age=3600"
+        self.delay = 0.0
+        self.requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                time.sleep(stand_in.delay)
+                body = json.dumps({"keys": stand_in.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", stand_in.cache_control)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/auth/keys"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.mark.unit
+class TestJWKSCache:
+    """Test key caching, rotation and request coalescing."""
+
+    @pytest.fixture
+    async def stand_in(self):
+        server = JWKSStandIn()
+        yield server
+        server.close()
+
+    @pytest.fixture
+    async def jwks(self, stand_in):
+        cache = JWKSCache(stand_in.url)
+        yield cache
+        await cache.stop()
+
+    async def test_keys_verify_tokens_and_are_cached(self, stand_in, jwks):
+        """Test a fetched key verifies a token and later lookups stay local."""
+        private_key, jwk = make_jwk("key-1")
+        stand_in.keys = [jwk]
+        token = jwt.encode({"sub": "apple-user"}, private_key, algorithm="RS256", headers={"kid": "key-1"})
+
+        key = await jwks.get_key("key-1")
+        assert jwt.decode(token, key, algorithms=["RS256"])["sub"] == "apple-user"
+
+        await jwks.get_key("key-1")
+        assert stand_in.requests == 1
+
+    async def test_concurrent_lookups_share_one_fetch(self, stand_in, jwks):
+        """Test a cold cache under concurrent sign-ins makes one request."""
+        stand_in.keys = [make_jwk("key-1")[1]]
+        stand_in.delay = 0.1
+
+        keys = await asyncio.gather(*[jwks.get_key("key-1") for _ in range(10)])
+
+        assert all(key is not None for key in keys)
+        assert stand_in.requests == 1
+
+    async def test_unknown_kid_refetches_once(self, stand_in, jwks):
+        """Test a rotated-in key is picked up and unknown IDs don't cause refetch storms."""
+        stand_in.keys = [make_jwk("key-1")[1]]
+        await jwks.get_key("key-1")
+
+        stand_in.keys.append(make_jwk("key-2")[1])
+        jwks._fetched_at -= JWKSCache.UNKNOWN_KID_REFETCH_INTERVAL
+
+        assert await jwks.get_key("key-2") is not None
+        assert stand_in.requests == 2
+
+        assert await jwks.get_key("forged") is None
+        assert await jwks.get_key("forged") is None
+        assert stand_in.requests == 2
+
+    async def test_stale_keys_survive_endpoint_failure(self, stand_in, jwks):
+        """Test expired keys keep serving when the endpoint is down."""
+        stand_in.keys = [make_jwk("key-1")[1]]
+        await jwks.get_key("key-1")
+
+        stand_in.close()
+        jwks._expires_at = 0
+
+        assert await jwks.get_key("key-1") is not None
+
+    def test_max_age(self):
+        """Test Cache-Control parsing and bounds."""
+        assert JWKSCache.max_age("public, max-age=7200") == 7200
+        assert JWKSCache.max_age("max-age=5") == JWKSCache.MIN_MAX_AGE
+        assert JWKSCache.max_age("max-age=999999") == JWKSCache.MAX_MAX_AGE
+        assert JWKSCache.max_age("no-store") == JWKSCache.MIN_MAX_AGE
+        assert JWKSCache.max_age(None) == JWKSCache.DEFAULT_MAX_AGE
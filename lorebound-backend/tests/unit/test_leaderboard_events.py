@@ -0,0 +1,77 @@
+"""Tests for the leaderboard event hub."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.services.leaderboard_events import LeaderboardEventHub
+from app.domain.enums import LeaderboardScope
+
+
+class FakePubSub:
+    """Pub/sub stand-in replaying a fixed list of messages."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.psubscribe = AsyncMock()
+        self.reset = AsyncMock()
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        # Stay subscribed like a real connection would
+        await asyncio.Event().wait()
+
+
+@pytest.mark.unit
+class TestLeaderboardEventHub:
+    """Test fan-out from the single consumer to local subscribers."""
+
+    async def test_consumer_fans_out_to_scope_subscribers(self):
+        """Test one pub/sub message reaches every subscriber of its scope only."""
+        event = {"user_id": "u1", "handle": "Ace", "score": 900, "delta": 300, "period_key": "2026-W43"}
+        pubsub = FakePubSub([
+            {"type": "pmessage", "channel": "leaderboard_events:weekly", "data": json.dumps(event)},
+        ])
+        redis = Mock()
+        redis.pubsub = AsyncMock(return_value=pubsub)
+        hub = LeaderboardEventHub(redis)
+
+        weekly = [hub.subscribe(LeaderboardScope.WEEKLY) for _ in range(3)]
+        today = hub.subscribe(LeaderboardScope.TODAY)
+        try:
+            received = await asyncio.wait_for(
+                asyncio.gather(*[queue.get() for queue in weekly]), timeout=1
+            )
+        finally:
+            await hub.stop()
+
+        assert received == [event, event, event]
+        assert today.empty()
+        redis.pubsub.assert_awaited_once()
+        pubsub.psubscribe.assert_awaited_once_with("leaderboard_events:*")
+
+    async def test_slow_subscriber_drops_oldest(self):
+        """Test a full subscriber queue keeps the newest events."""
+        hub = LeaderboardEventHub(Mock())
+        hub._consumer = Mock(done=Mock(return_value=False))
+        queue = hub.subscribe(LeaderboardScope.TODAY)
+
+        for i in range(LeaderboardEventHub.SUBSCRIBER_QUEUE_SIZE + 5):
+            hub.dispatch("today", {"delta": i})
+
+        assert queue.qsize() == LeaderboardEventHub.SUBSCRIBER_QUEUE_SIZE
+        assert queue.get_nowait() == {"delta": 5}
+
+    async def test_unsubscribe(self):
+        """Test unsubscribed queues stop receiving events."""
+        hub = LeaderboardEventHub(Mock())
+        hub._consumer = Mock(done=Mock(return_value=False))
+        queue = hub.subscribe(LeaderboardScope.ALLTIME)
+
+        hub.unsubscribe(LeaderboardScope.ALLTIME, queue)
+        hub.dispatch("alltime", {"delta": 1})
+
+        assert queue.empty()
+        assert hub.subscriber_count == 0
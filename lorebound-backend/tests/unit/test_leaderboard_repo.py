@@ -0,0 +1,88 @@
+"""Tests for LeaderboardRepository query construction."""
+
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.leaderboard_repo import LeaderboardRepository
+from app.domain.enums import LeaderboardScope, DungeonCategory
+
+
+@pytest.mark.unit
+class TestLeaderboardRepository:
+    """Test period bounds and rollup maintenance."""
+
+    @pytest.fixture
+    def repo(self):
+        """Repository over a session that records executed statements."""
+        session = Mock()
+        session.execute = AsyncMock()
+        return LeaderboardRepository(session)
+
+    def test_period_ranges_have_upper_bounds(self, repo):
+        """Test daily and weekly periods are closed ranges."""
+        start, end = repo._get_time_range_for_period(LeaderboardScope.TODAY, "2026-10-19")
+        assert start == datetime(2026, 10, 19, tzinfo=timezone.utc)
+        assert end == datetime(2026, 10, 20, tzinfo=timezone.utc)
+
+        start, end = repo._get_time_range_for_period(LeaderboardScope.WEEKLY, "2026-W43")
+        assert start == datetime(2026, 10, 19, tzinfo=timezone.utc)
+        assert end == datetime(2026, 10, 26, tzinfo=timezone.utc)
+
+        assert repo._get_time_range_for_period(LeaderboardScope.ALLTIME, "alltime") is None
+
+    def test_period_totals_read_rollups(self, repo):
+        """Test period aggregates never scan raw scores."""
+        weekly = str(repo._period_totals_query(LeaderboardScope.WEEKLY, "2026-W43"))
+        alltime = str(repo._period_totals_query(LeaderboardScope.ALLTIME, "alltime"))
+
+        assert "user_daily_scores" in weekly and "scores.score" not in weekly
+        assert "user_score_totals" in alltime and "GROUP BY" not in alltime
+        assert "board" in weekly and "board" in alltime
+
+    def test_board_keys(self, repo):
+        """Test board keys for global, dungeon and category leaderboards."""
+        dungeon_id = uuid4()
+
+        assert repo.board_key() == "global"
+        assert repo.board_key(dungeon_id=dungeon_id) == f"dungeon:{dungeon_id}"
+        assert repo.board_key(category=DungeonCategory.SPORTS) == "category:sports"
+        assert repo.board_key(category="music") == "category:music"
+
+    async def test_record_score_upserts_rollups(self, repo):
+        """Test a score write upserts every board in one statement per table."""
+        dungeon_id = uuid4()
+        await repo.record_score(
+            uuid4(), 250, datetime(2026, 10, 19, 23, 59, tzinfo=timezone.utc),
+            dungeon_id=dungeon_id, category=DungeonCategory.SPORTS
+        )
+
+        statements = [
+            str(call.args[0].compile(dialect=postgresql.dialect()))
+            for call in repo.session.execute.call_args_list
+        ]
+        assert len(statements) == 2
+        assert statements[0].startswith("INSERT INTO user_daily_scores")
+        assert "ON CONFLICT (board, user_id, day) DO UPDATE" in statements[0]
+        assert statements[1].startswith("INSERT INTO user_score_totals")
+        assert "ON CONFLICT (board, user_id) DO UPDATE" in statements[1]
+
+        params = repo.session.execute.call_args_list[1].args[0].compile(dialect=postgresql.dialect()).params
+        boards = {value for key, value in params.items() if key.startswith("board")}
+        assert boards == {"global", f"dungeon:{dungeon_id}", "category:sports"}
+
+    async def test_friends_ranking_is_one_query(self, repo):
+        """Test the friends ranking filters rollups by the follow set in one statement."""
+        repo.session.execute.return_value = Mock(all=Mock(return_value=[]))
+
+        await repo.get_friends_ranking(uuid4(), LeaderboardScope.WEEKLY, "2026-W43")
+
+        repo.session.execute.assert_awaited_once()
+        sql = str(repo.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM follows" in sql
+        assert "rank() OVER" in sql
+        # The follow filter applies to rollup rows before they are grouped
+        assert sql.index("follows.follower_id") < sql.index("GROUP BY")
@@ -0,0 +1,98 @@
+"""Tests for Prometheus instrumentation."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from redis.asyncio import Redis
+
+from app.core.cache import get_or_compute
+from app.core.metrics import MetricsMiddleware, PoolSampler, render_metrics
+from app.core.redis_client import InstrumentedRedis
+
+
+def sample(name: str, **labels) -> float:
+    """Current value of a sample, 0 if it wasn't recorded yet."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.unit
+class TestMetricsMiddleware:
+    """Test request latency is recorded per route template."""
+    
+    @pytest.fixture
+    def client(self):
+        """Client of a small app behind the middleware."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            return {"id": item_id}
+        
+        return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    
+    async def test_route_template_label(self, client):
+        """Test IDs in the path don't become label values."""
+        count = "lorebound_http_request_duration_seconds_count"
+        before = sample(count, method="GET", route="/items/{item_id}", status="200")
+        
+        async with client:
+            await client.get("/items/1")
+            await client.get("/items/2")
+        
+        assert sample(count, method="GET", route="/items/{item_id}", status="200") == before + 2
+        assert sample("lorebound_http_requests_in_flight", method="GET") == 0
+    
+    async def test_unmatched_route(self, client):
+        """Test unknown paths share one series."""
+        count = "lorebound_http_request_duration_seconds_count"
+        before = sample(count, method="GET", route="unmatched", status="404")
+        
+        async with client:
+            await client.get("/missing/123")
+        
+        assert sample(count, method="GET", route="unmatched", status="404") == before + 1
+
+
+@pytest.mark.unit
+class TestInstrumentation:
+    """Test cache, Redis and pool metrics."""
+    
+    async def test_cache_hits_and_misses_by_namespace(self, mock_redis_client):
+        """Test read-through cache lookups are counted under the key's namespace."""
+        name = "lorebound_cache_requests_total"
+        hits = sample(name, namespace="leaderboard", result="hit")
+        misses = sample(name, namespace="leaderboard", result="miss")
+        
+        mock_redis_client.get_json = AsyncMock(return_value={"value": [1], "delta": 0.0, "expiry": 1e12})
+        await get_or_compute(mock_redis_client, "leaderboard:all_time", 60, AsyncMock())
+        mock_redis_client.get_json = AsyncMock(return_value=None)
+        mock_redis_client.acquire_lock = AsyncMock(return_value=True)
+        await get_or_compute(mock_redis_client, "leaderboard:today", 60, AsyncMock(return_value=[2]))
+        
+        assert sample(name, namespace="leaderboard", result="hit") == hits + 1
+        assert sample(name, namespace="leaderboard", result="miss") == misses + 1
+    
+    async def test_redis_command_latency(self):
+        """Test commands are timed by name."""
+        count = "lorebound_redis_command_duration_seconds_count"
+        before = sample(count, command="GET")
+        
+        with patch.object(Redis, "execute_command", AsyncMock(return_value="value")):
+            assert await InstrumentedRedis().execute_command("get", "key") == "value"
+        
+        assert sample(count, command="GET") == before + 1
+    
+    def test_pool_gauges(self):
+        """Test pool usage is copied into gauges and exported."""
+        sampler = PoolSampler()
+        sampler._pool = Mock(size=Mock(return_value=10), checkedout=Mock(return_value=12), overflow=Mock(return_value=2))
+        
+        sampler.sample()
+        
+        assert sample("lorebound_db_pool_checked_out") == 12
+        assert sample("lorebound_db_pool_overflow") == 2
+        assert b"lorebound_db_pool_size 10.0" in render_metrics()
@@ -0,0 +1,68 @@
+"""Tests for the password hashing pool."""
+
+import asyncio
+import threading
+import pytest
+
+from app.core.config import Settings
+from app.core.password_hashing import PasswordHasher
+
+
+@pytest.mark.unit
+class TestPasswordHasher:
+    """Test off-loop hashing, the concurrency cap and cost selection."""
+
+    @pytest.fixture
+    def hasher(self):
+        """Hasher at bcrypt's minimum cost so tests stay fast."""
+        hasher = PasswordHasher(max_workers=1, rounds=4)
+        yield hasher
+        hasher.shutdown()
+
+    async def test_hash_and_verify_round_trip(self, hasher):
+        """Test hashes use the configured cost and verify in the pool."""
+        hashed = await hasher.hash("SecurePassword123!")
+
+        assert hashed.startswith("$2b$04$")
+        assert await hasher.verify("SecurePassword123!", hashed)
+        assert not await hasher.verify("WrongPassword", hashed)
+        assert hasher.stats()["completed"] == 3
+
+    async def test_concurrency_cap_queues_requests(self, hasher):
+        """Test calls beyond the pool size wait in the queue and are counted."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return True
+
+        first = asyncio.create_task(hasher._run(blocking))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        second = asyncio.create_task(hasher._run(lambda: True))
+        await asyncio.sleep(0.01)
+
+        stats = hasher.stats()
+        assert stats["in_flight"] == 1
+        assert stats["queued"] == 1
+
+        release.set()
+        assert await asyncio.gather(first, second) == [True, True]
+
+        stats = hasher.stats()
+        assert (stats["queued"], stats["in_flight"], stats["completed"]) == (0, 0, 2)
+        assert stats["queue_wait_seconds_max"] > 0
+
+    def test_choose_rounds(self):
+        """Test the cost factor doubles work per round within the target."""
+        assert PasswordHasher.choose_rounds(50, 250, 10, 14) == 12
+        assert PasswordHasher.choose_rounds(300, 250, 10, 14) == 10
+        assert PasswordHasher.choose_rounds(1, 250, 10, 14) == 14
+
+    def test_calibration_never_lowers_default_cost(self):
+        """Test a slow host keeps at least bcrypt's default cost of 12."""
+        min_rounds = Settings.model_fields["bcrypt_min_rounds"].default
+
+        assert min_rounds >= 12
+        assert PasswordHasher.choose_rounds(2000, 250, min_rounds, 14) == min_rounds
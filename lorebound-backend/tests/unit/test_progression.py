@@ -0,0 +1,94 @@
+"""Tests for the level curve and level-up handling."""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.domain.progression import LevelCurve, LevelProgress
+from app.repositories.achievement_repo import AchievementRepository
+from app.services.run_service import RunService
+
+
+@pytest.mark.unit
+class TestLevelCurve:
+    """Test level lookups against the threshold table."""
+    
+    def test_linear_curve(self):
+        """Test each level needs the same XP and the top level is a cap."""
+        curve = LevelCurve.linear(xp_per_level=1000, max_level=5)
+        
+        assert curve.thresholds == (0, 1000, 2000, 3000, 4000)
+        assert [curve.level_for(xp) for xp in (0, 999, 1000, 3999, 4000, 10**9)] == [1, 1, 2, 4, 5, 5]
+    
+    def test_invalid_thresholds(self):
+        """Test thresholds must start at 0 and increase."""
+        with pytest.raises(ValueError):
+            LevelCurve([100, 200])
+        with pytest.raises(ValueError):
+            LevelCurve([0, 200, 200])
+    
+    def test_levels_gained(self):
+        """Test every level passed in one gain is reported."""
+        assert LevelProgress(xp=3500, level=4, previous_level=1).levels_gained == [2, 3, 4]
+        assert LevelProgress(xp=3500, level=4, previous_level=4).levels_gained == []
+
+
+@pytest.mark.unit
+class TestLevelUp:
+    """Test level-up events feed rewards and achievements."""
+    
+    async def test_achievements_unlocked_in_one_statement(self):
+        """Test reached level achievements are inserted and returned together."""
+        session = Mock()
+        session.execute = AsyncMock(return_value=Mock(
+            scalars=Mock(return_value=Mock(all=Mock(return_value=["level_5"])))
+        ))
+        
+        assert await AchievementRepository(session).unlock_level_achievements(uuid4(), 5) == ["level_5"]
+        
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("WITH unlocked AS \n(INSERT INTO user_achievements")
+        assert "WHERE user_achievements.unlocked_at IS NULL" in sql
+    
+    async def test_progression_grants_level_up_rewards(self):
+        """Test a run that levels up rewards an item per level and unlocks achievements."""
+        user_repo = Mock()
+        user_repo.add_experience = AsyncMock(return_value=LevelProgress(xp=2400, level=3, previous_level=1))
+        service = RunService(Mock(), user_repo, Mock())
+        user_id = uuid4()
+        
+        with patch("app.services.inventory_service.InventoryService.distribute_level_up_rewards",
+                   AsyncMock(return_value=[{"slug": "crown"}])) as rewards, \
+                patch.object(AchievementRepository, "unlock_level_achievements",
+                             AsyncMock(return_value=["level_3"])):
+            progression = await service._update_user_progression(user_id, Mock(total_score=5000), MagicMock())
+        
+        user_repo.add_experience.assert_awaited_once_with(user_id, 500)
+        assert rewards.await_args.args[:2] == (user_id, [2, 3])
+        assert progression["levels_gained"] == [2, 3]
+        assert progression["level_up_rewards"] == [{"slug": "crown"}]
+        assert progression["achievements_unlocked"] == ["level_3"]
+    
+    async def test_failed_level_up_rolls_back_to_savepoint(self):
+        """Test a failing achievement unlock undoes the level-up grants but keeps the XP."""
+        user_repo = Mock()
+        user_repo.add_experience = AsyncMock(return_value=LevelProgress(xp=2400, level=3, previous_level=1))
+        service = RunService(Mock(), user_repo, Mock())
+        session = MagicMock()
+        
+        with patch("app.services.inventory_service.InventoryService.distribute_level_up_rewards",
+                   AsyncMock(return_value=[{"slug": "crown"}])), \
+                patch.object(AchievementRepository, "unlock_level_achievements",
+                             AsyncMock(side_effect=RuntimeError("deadlock detected"))):
+            progression = await service._update_user_progression(uuid4(), Mock(total_score=5000), session)
+        
+        savepoint = session.begin_nested.return_value
+        savepoint.__aenter__.assert_awaited_once()
+        # The savepoint saw the error, so it rolls back instead of releasing
+        assert savepoint.__aexit__.await_args.args[0] is RuntimeError
+        assert progression["level"] == 3
+        assert progression["level_up_rewards"] == []
+        assert progression["achievements_unlocked"] == []
@@ -0,0 +1,146 @@
+"""Tests for the rate limiting middleware."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.rate_limit import LocalPrecheck, RateLimitMiddleware, RateLimitRule
+
+
+def http_scope(method, path, headers=None, client=("203.0.113.7", 5000)):
+    """Minimal ASGI HTTP scope."""
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": headers or [],
+        "client": client,
+    }
+
+
+@pytest.mark.unit
+class TestRateLimitMiddleware:
+    """Test rule matching, identity and enforcement."""
+
+    @pytest.fixture
+    def app(self):
+        """Downstream app recording whether it was reached."""
+        return AsyncMock()
+
+    @pytest.fixture
+    def middleware(self, app, mock_redis_client):
+        """Middleware with an auth rule and no local allowance."""
+        mock_redis_client.rate_limit = AsyncMock(return_value=(True, 0, 10))
+        return RateLimitMiddleware(
+            app,
+            rules={
+                "/auth": RateLimitRule(name="auth", per_minute=30, route_costs={"POST /login": 5}),
+                "/runs": RateLimitRule(name="runs", per_minute=60, route_costs={"POST /{run_id}/submit": 3}),
+            },
+            redis=mock_redis_client,
+            precheck=LocalPrecheck(fraction=0)
+        )
+
+    def test_route_costs(self, middleware):
+        """Test routes resolve to their router's rule and weight."""
+        rule, cost = middleware._match("POST", "/v1/auth/login")
+        assert (rule.name, cost) == ("auth", 5)
+
+        rule, cost = middleware._match("GET", "/v1/auth/me")
+        assert (rule.name, cost) == ("auth", 1)
+
+        rule, cost = middleware._match("POST", "/v1/runs/8a1f/submit")
+        assert (rule.name, cost) == ("runs", 3)
+
+        rule, cost = middleware._match("GET", "/v1/authors")
+        assert (rule.name, cost) == ("default", 1)
+
+    async def test_allowed_request_is_charged_per_ip(self, middleware, app, mock_redis_client):
+        """Test anonymous requests are limited per client IP with the route cost."""
+        await middleware(http_scope("POST", "/v1/auth/login"), AsyncMock(), AsyncMock())
+
+        app.assert_awaited_once()
+        mock_redis_client.rate_limit.assert_awaited_once_with(
+            "rate_limit:auth:ip:203.0.113.7", 30, 60_000, 5
+        )
+
+    async def test_authenticated_requests_are_limited_per_user(self, middleware, mock_redis_client):
+        """Test a verified bearer token keys the limit by user."""
+        headers = [(b"authorization", b"Bearer token")]
+        with patch("app.core.rate_limit.verified_token_cache") as cache:
+            cache.verify.return_value = {"user_id": "u1"}
+            await middleware(http_scope("GET", "/v1/runs/", headers), AsyncMock(), AsyncMock())
+
+        assert mock_redis_client.rate_limit.call_args.args[0] == "rate_limit:runs:user:u1"
+
+    async def test_over_limit_gets_429_with_retry_after(self, middleware, app, mock_redis_client):
+        """Test a denied request is rejected and later ones are blocked locally."""
+        mock_redis_client.rate_limit = AsyncMock(return_value=(False, 2500, 0))
+        send = AsyncMock()
+
+        await middleware(http_scope("POST", "/v1/auth/login"), AsyncMock(), send)
+        await middleware(http_scope("POST", "/v1/auth/login"), AsyncMock(), AsyncMock())
+
+        app.assert_not_awaited()
+        start = send.call_args_list[0].args[0]
+        assert start["status"] == 429
+        assert (b"retry-after", b"3") in start["headers"]
+        mock_redis_client.rate_limit.assert_awaited_once()
+
+    async def test_redis_errors_fail_open(self, middleware, app, mock_redis_client):
+        """Test requests pass when Redis is unavailable."""
+        mock_redis_client.rate_limit = AsyncMock(side_effect=ConnectionError("down"))
+
+        await middleware(http_scope("GET", "/v1/auth/me"), AsyncMock(), AsyncMock())
+
+        app.assert_awaited_once()
+
+    async def test_local_units_survive_rejection_and_errors(self, app, mock_redis_client):
+        """Test locally admitted units are only dropped once Redis has charged them."""
+        middleware = RateLimitMiddleware(
+            app,
+            rules={"/runs": RateLimitRule(name="runs", per_minute=60)},
+            redis=mock_redis_client,
+            precheck=LocalPrecheck(fraction=0.1)
+        )
+        for _ in range(6):
+            await middleware(http_scope("GET", "/v1/runs/"), AsyncMock(), AsyncMock())
+
+        mock_redis_client.rate_limit = AsyncMock(side_effect=ConnectionError("down"))
+        await middleware(http_scope("GET", "/v1/runs/"), AsyncMock(), AsyncMock())
+        mock_redis_client.rate_limit = AsyncMock(return_value=(False, 0, 0))
+        await middleware(http_scope("GET", "/v1/runs/"), AsyncMock(), AsyncMock())
+        mock_redis_client.rate_limit = AsyncMock(return_value=(True, 0, 10))
+        await middleware(http_scope("GET", "/v1/runs/"), AsyncMock(), AsyncMock())
+
+        assert mock_redis_client.rate_limit.await_args.args[3] == 7
+        assert middleware.precheck.pending("ip:203.0.113.7") == 0
+
+    async def test_unversioned_paths_are_not_limited(self, middleware, app, mock_redis_client):
+        """Test health checks and docs bypass the limiter."""
+        await middleware(http_scope("GET", "/healthz"), AsyncMock(), AsyncMock())
+
+        app.assert_awaited_once()
+        mock_redis_client.rate_limit.assert_not_awaited()
+
+
+@pytest.mark.unit
+class TestLocalPrecheck:
+    """Test the per-process allowance."""
+
+    def test_small_usage_skips_redis_and_is_charged_later(self):
+        """Test units within the local fraction are admitted and carried over."""
+        precheck = LocalPrecheck(fraction=0.1)
+
+        assert precheck.admit("k", 3, 60) == 0
+        assert precheck.admit("k", 3, 60) == 0
+        assert precheck.admit("k", 1, 60) is None
+        assert precheck.pending("k") == 6
+        precheck.charged("k", 6)
+        assert precheck.pending("k") == 0
+
+    def test_blocked_caller_is_rejected_locally(self):
+        """Test a blocked caller waits without asking Redis."""
+        precheck = LocalPrecheck(fraction=0.1)
+        precheck.block("k", 30)
+
+        assert 29 < precheck.admit("k", 1, 60) <= 30
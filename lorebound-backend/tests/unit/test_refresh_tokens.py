@@ -0,0 +1,69 @@
+"""Tests for refresh token rotation."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from app.core.refresh_tokens import RefreshTokenStore
+
+
+@pytest.mark.unit
+class TestRefreshTokenStore:
+    """Test token families, rotation and reuse detection."""
+
+    @pytest.fixture
+    def revocations(self):
+        """Revocation list recording revoked IDs."""
+        return Mock(revoke_token_id=AsyncMock())
+
+    @pytest.fixture
+    def store(self, mock_redis_client, revocations):
+        """Store over the mocked Redis client."""
+        return RefreshTokenStore(mock_redis_client, revocations)
+
+    async def test_start_family(self, store, mock_redis_client):
+        """Test a sign-in records the family's first token ID."""
+        family_id, token_id = await store.start_family(uuid4())
+
+        key, value, ttl = mock_redis_client.set.call_args.args
+        assert key == f"refresh_family:{family_id}"
+        assert value == token_id
+        assert ttl > 0
+
+    async def test_rotate_current_token(self, store, mock_redis_client, revocations):
+        """Test the current token is swapped for a new one."""
+        mock_redis_client.rotate = AsyncMock(side_effect=lambda key, previous, presented, value, *_: (True, value))
+
+        new_token_id = await store.rotate("family-1", "token-1")
+
+        key, previous_key, presented, value, _, grace_ms = mock_redis_client.rotate.call_args.args
+        assert (key, previous_key) == ("refresh_family:family-1", "refresh_family:family-1:previous")
+        assert (presented, value) == ("token-1", new_token_id)
+        assert new_token_id != "token-1"
+        assert grace_ms > 0
+        revocations.revoke_token_id.assert_not_awaited()
+
+    async def test_retry_within_grace_window(self, store, mock_redis_client, revocations):
+        """Test a retried refresh with the token just rotated away gets the current ID."""
+        mock_redis_client.rotate = AsyncMock(return_value=(True, "token-2"))
+
+        assert await store.rotate("family-1", "token-1") == "token-2"
+        revocations.revoke_token_id.assert_not_awaited()
+
+    async def test_reused_token_revokes_family(self, store, mock_redis_client, revocations):
+        """Test presenting a rotated-away token revokes the whole family."""
+        mock_redis_client.rotate = AsyncMock(return_value=(False, None))
+
+        assert await store.rotate("family-1", "token-0") is None
+
+        mock_redis_client.delete_many.assert_awaited_once_with(
+            ["refresh_family:family-1", "refresh_family:family-1:previous"]
+        )
+        revocations.revoke_token_id.assert_awaited_once_with("family-1")
+
+    async def test_unknown_family_is_rejected(self, store, mock_redis_client, revocations):
+        """Test expired or revoked families can't be rotated."""
+        mock_redis_client.rotate = AsyncMock(return_value=(None, None))
+
+        assert await store.rotate("family-1", "token-1") is None
+        revocations.revoke_token_id.assert_not_awaited()
@@ -0,0 +1,104 @@
+"""Tests for alias-table reward rolls."""
+
+import json
+import random
+import pytest
+
+from app.domain.enums import ItemRarity
+from app.services.rewards import (
+    ALL_RARITIES, AliasTable, DropTable, RewardEngine, rarity_mask
+)
+
+
+def implied_distribution(table):
+    """Exact outcome probabilities encoded by an alias table."""
+    n = len(table.outcomes)
+    distribution = dict.fromkeys(table.outcomes, 0.0)
+    for column, probability in enumerate(table.probabilities):
+        distribution[table.outcomes[column]] += probability / n
+        distribution[table.outcomes[table.aliases[column]]] += (1 - probability) / n
+    return distribution
+
+
+@pytest.mark.unit
+class TestAliasTable:
+    """Test alias table construction and sampling."""
+
+    def test_encodes_the_weights(self):
+        """Test the table reproduces the normalized weights exactly."""
+        table = AliasTable(["a", "b", "c", "d"], [0.5, 0.3, 0.15, 0.05])
+
+        for outcome, probability in implied_distribution(table).items():
+            assert probability == pytest.approx({"a": 0.5, "b": 0.3, "c": 0.15, "d": 0.05}[outcome])
+
+    def test_sampling(self):
+        """Test sampled frequencies follow the weights."""
+        table = AliasTable(["a", "b"], [3, 1])
+        rng = random.Random(7)
+
+        samples = [table.sample(rng) for _ in range(20000)]
+
+        assert samples.count("a") / len(samples) == pytest.approx(0.75, abs=0.02)
+
+    def test_rejects_empty(self):
+        """Test a table needs at least one outcome."""
+        with pytest.raises(ValueError):
+            AliasTable([], [])
+
+
+@pytest.mark.unit
+class TestRewardEngine:
+    """Test drop tables and availability masks."""
+
+    @pytest.fixture
+    def engine(self):
+        """Engine with one drop table."""
+        return RewardEngine([DropTable(name="normal_run", weights={
+            ItemRarity.COMMON: 0.5, ItemRarity.RARE: 0.3, ItemRarity.LEGENDARY: 0.2
+        })])
+
+    def test_unavailable_rarities_are_excluded(self, engine):
+        """Test exhausted rarities' weight is shared by the rest."""
+        table = engine.alias_table("normal_run", rarity_mask([ItemRarity.COMMON, ItemRarity.LEGENDARY]))
+
+        assert implied_distribution(table) == pytest.approx({
+            ItemRarity.COMMON: 0.5 / 0.7, ItemRarity.LEGENDARY: 0.2 / 0.7
+        })
+
+    def test_alias_tables_are_cached(self, engine):
+        """Test each (table, mask) pair is built once."""
+        assert engine.alias_table("normal_run") is engine.alias_table("normal_run", ALL_RARITIES)
+
+    def test_nothing_available(self, engine):
+        """Test a roll with no available rarity yields nothing."""
+        assert engine.roll_rarity("normal_run", rarity_mask([ItemRarity.EPIC])) is None
+        assert engine.roll_rarity("normal_run", rarity_mask([ItemRarity.RARE])) == ItemRarity.RARE
+
+    def test_from_file(self, tmp_path):
+        """Test drop tables are loaded from data."""
+        path = tmp_path / "drop_tables.json"
+        path.write_text(json.dumps({"boss": {"epic": 1, "legendary": 1}}))
+
+        engine = RewardEngine.from_file(path)
+
+        assert engine.tables["boss"].weights == {ItemRarity.EPIC: 1, ItemRarity.LEGENDARY: 1}
+
+    def test_packaged_tables(self):
+        """Test the shipped drop tables load and cover every run type."""
+        engine = RewardEngine.from_file()
+
+        assert {"normal_run", "daily_challenge"} <= set(engine.tables)
+
+    def test_negative_weights_rejected(self):
+        """Test drop tables validate their weights."""
+        with pytest.raises(ValueError):
+            DropTable(name="broken", weights={ItemRarity.COMMON: -1})
+
+    def test_simulation(self, engine):
+        """Test the vectorized simulation matches the drop table."""
+        pytest.importorskip("numpy")
+
+        counts = engine.simulate("normal_run", 2_500_000, seed=1)
+
+        assert sum(counts.values()) == 2_500_000
+        assert counts[ItemRarity.LEGENDARY] / 2_500_000 == pytest.approx(0.2, abs=0.002)
@@ -0,0 +1,30 @@
+"""Tests for database sessions of background jobs."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy.pool import NullPool
+
+from app.repositories.base import task_session
+
+
+@pytest.mark.unit
+class TestTaskSession:
+    """Test job runs never share pooled connections between event loops."""
+    
+    def test_each_run_gets_its_own_unpooled_engine(self):
+        """Test every asyncio.run() body builds and disposes an engine without a pool."""
+        async def run_job():
+            async with task_session() as session:
+                return session
+        
+        with patch("app.repositories.base.create_async_engine") as create_engine:
+            create_engine.return_value.dispose = AsyncMock()
+            
+            asyncio.run(run_job())
+            asyncio.run(run_job())
+        
+        assert create_engine.call_count == 2
+        assert create_engine.call_args.kwargs["poolclass"] is NullPool
+        assert create_engine.return_value.dispose.await_count == 2
@@ -0,0 +1,226 @@
+"""Tests for the verified token cache and token revocation."""
+
+import json
+import os
+import time
+import pytest
+from unittest.mock import AsyncMock, PropertyMock, patch
+from uuid import uuid4
+
+import jwt
+
+from app.core.token_cache import VerifiedTokenCache
+from app.core.token_revocation import BloomFilter, TokenRevocationList
+
+
+def make_claims(exp_in: int = 3600, user_id: str = "user-1") -> dict:
+    now_ms = time.time_ns() // 1_000_000 - 1
+    now = now_ms // 1000
+    return {
+        "sub": "player@example.com", "user_id": user_id, "iat": now, "iat_ms": now_ms,
+        "exp": now + exp_in, "type": "access"
+    }
+
+
+@pytest.mark.unit
+class TestVerifiedTokenCache:
+    """Test signature checks are skipped only while it is safe."""
+
+    @pytest.fixture
+    def settings(self, tmp_path):
+        """Patch the configured public key and its file."""
+        key_path = tmp_path / "public.pem"
+        key_path.write_text("key-1")
+        with patch("app.core.token_cache.settings") as settings:
+            settings.jwt_public_key = "key-1"
+            settings.jwt_public_key_path = str(key_path)
+            yield settings
+
+    @pytest.fixture
+    def verify(self, settings):
+        """Patch the full RS256 verification."""
+        with patch("app.core.token_cache.verify_token") as verify:
+            yield verify
+
+    def test_repeated_token_skips_verification(self, verify):
+        """Test the second request with a token is served from the cache."""
+        verify.return_value = make_claims()
+        cache = VerifiedTokenCache(max_size=10)
+
+        assert cache.verify("token-a") == cache.verify("token-a")
+        verify.assert_called_once_with("token-a", token_type="access", public_key="key-1")
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_expired_entry_is_verified_again(self, verify):
+        """Test a cached token past its exp goes back through verification."""
+        verify.return_value = make_claims(exp_in=-1)
+        cache = VerifiedTokenCache(max_size=10)
+
+        cache.verify("token-a")
+        verify.side_effect = jwt.ExpiredSignatureError("Token has expired")
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            cache.verify("token-a")
+        assert len(cache) == 0
+
+    def test_lru_bound(self, verify):
+        """Test the least recently used token is evicted at capacity."""
+        verify.side_effect = lambda token, token_type, public_key: make_claims()
+        cache = VerifiedTokenCache(max_size=2)
+
+        cache.verify("token-a")
+        cache.verify("token-b")
+        cache.verify("token-a")
+        cache.verify("token-c")
+
+        assert len(cache) == 2
+        cache.verify("token-a")
+        cache.verify("token-b")
+        assert verify.call_count == 4
+
+    def test_key_rotation_clears_cache(self, verify, settings):
+        """Test claims verified with an old public key are not reused."""
+        verify.return_value = make_claims()
+        cache = VerifiedTokenCache(max_size=10)
+
+        cache.verify("token-a")
+        settings.jwt_public_key = "key-2"
+        cache.reload_key()
+        cache.verify("token-a")
+
+        assert verify.call_count == 2
+        assert verify.call_args.kwargs["public_key"] == "key-2"
+
+    def test_key_is_read_once(self, verify, settings):
+        """Test requests don't read the key file while it is unchanged."""
+        verify.return_value = make_claims()
+        read_key = PropertyMock(return_value="key-1")
+        type(settings).jwt_public_key = read_key
+        cache = VerifiedTokenCache(max_size=10)
+
+        with patch.object(VerifiedTokenCache, "KEY_CHECK_INTERVAL", 0.0):
+            for token in ("token-a", "token-a", "token-b"):
+                cache.verify(token)
+
+        read_key.assert_called_once()
+
+    def test_changed_key_file_is_reloaded(self, verify, settings):
+        """Test a key file replaced on disk is picked up at the next check."""
+        verify.return_value = make_claims()
+        cache = VerifiedTokenCache(max_size=10)
+        cache.verify("token-a")
+
+        settings.jwt_public_key = "key-2"
+        key_path = settings.jwt_public_key_path
+        os.utime(key_path, ns=(0, os.stat(key_path).st_mtime_ns + 1_000_000_000))
+        with patch.object(VerifiedTokenCache, "KEY_CHECK_INTERVAL", 0.0):
+            cache.verify("token-a")
+
+        assert verify.call_count == 2
+        assert verify.call_args.kwargs["public_key"] == "key-2"
+
+
+@pytest.mark.unit
+class TestTokenRevocationList:
+    """Test revocation cutoffs and revoked token IDs."""
+
+    async def test_revoke_user_rejects_earlier_tokens(self, mock_redis_client):
+        """Test revocation applies locally and is stored and published."""
+        revocations = TokenRevocationList(mock_redis_client)
+        user_id = uuid4()
+        claims = make_claims(user_id=str(user_id))
+
+        assert not revocations.is_revoked(claims)
+        await revocations.revoke_user(user_id)
+
+        assert revocations.is_revoked(claims)
+        assert not revocations.is_revoked({**claims, "iat_ms": claims["iat_ms"] + 60000})
+        assert not revocations.is_revoked(make_claims(user_id="someone-else"))
+
+        mock_redis_client.sorted_set_add.assert_awaited_once()
+        channel, message = mock_redis_client.publish_many.call_args.args[0][0]
+        assert channel == TokenRevocationList.CHANNEL
+        assert json.loads(message)["user_id"] == str(user_id)
+
+    async def test_sign_in_right_after_revocation(self, mock_redis_client):
+        """Test tokens issued in the same second as a logout, but after it, stay valid."""
+        revocations = TokenRevocationList(mock_redis_client)
+        user_id = uuid4()
+        revoked_at = 1_700_000_000_500
+
+        with patch("app.core.token_revocation.time.time_ns", return_value=revoked_at * 1_000_000):
+            await revocations.revoke_user(user_id)
+
+        before = {"user_id": str(user_id), "iat": 1_700_000_000, "iat_ms": revoked_at - 1}
+        after = {"user_id": str(user_id), "iat": 1_700_000_000, "iat_ms": revoked_at}
+        assert revocations.is_revoked(before)
+        assert not revocations.is_revoked(after)
+        # Tokens without the millisecond claim are rejected for the whole second
+        assert revocations.is_revoked({"user_id": str(user_id), "iat": 1_700_000_000})
+
+    async def test_revoke_token_id_rejects_its_family(self, mock_redis_client):
+        """Test a revoked family ID rejects every token carrying it."""
+        revocations = TokenRevocationList(mock_redis_client)
+        claims = make_claims(user_id="user-1")
+
+        await revocations.revoke_token_id("family-1")
+
+        assert revocations.is_revoked({**claims, "fam": "family-1"})
+        assert not revocations.is_revoked({**claims, "fam": "family-2"})
+        assert not revocations.is_revoked(claims)
+
+        channel, message = mock_redis_client.publish_many.call_args.args[0][0]
+        assert json.loads(message) == {"token_id": "family-1"}
+
+    async def test_own_revocation_is_counted_once(self, mock_redis_client):
+        """Test a revocation echoed back over pub/sub doesn't fill the filter twice."""
+        revocations = TokenRevocationList(mock_redis_client)
+
+        await revocations.revoke_token_id("family-1")
+        revocations._apply_token_id("family-1")
+
+        assert revocations._revoked_ids[-1].count == 1
+
+    async def test_full_filter_is_extended(self, mock_redis_client):
+        """Test revocations beyond the filter capacity are still caught."""
+        with patch("app.core.token_revocation.settings") as settings:
+            settings.token_revocation_filter_size = 10
+            settings.refresh_token_ttl_seconds = 60
+            revocations = TokenRevocationList(mock_redis_client)
+
+            for i in range(25):
+                revocations._apply_token_id(f"family-{i}")
+
+        assert len(revocations._revoked_ids) == 3
+        assert all(revocations.is_revoked({"fam": f"family-{i}"}) for i in range(25))
+
+    async def test_load_replaces_cutoffs_from_redis(self, mock_redis_client):
+        """Test a (re)connect loads current revocations and prunes expired ones."""
+        mock_redis_client.sorted_set_range_by_score = AsyncMock(side_effect=[
+            [("user-1", 1700000000.0)],
+            [("family-1", time.time() + 60)],
+        ])
+        revocations = TokenRevocationList(mock_redis_client)
+
+        await revocations._load()
+
+        assert mock_redis_client.sorted_set_remove_by_score.await_count == 3
+        # Cutoffs stored in seconds cover the whole second
+        assert revocations.is_revoked({"user_id": "user-1", "iat": 1700000000, "iat_ms": 1700000000999})
+        assert not revocations.is_revoked({"user_id": "user-1", "iat": 1700000001, "iat_ms": 1700000001000})
+        assert revocations.is_revoked({"user_id": "user-2", "fam": "family-1"})
+
+
+@pytest.mark.unit
+class TestBloomFilter:
+    """Test the revoked ID filter."""
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        """Test added items are always found and others almost never."""
+        bloom = BloomFilter(capacity=10000, false_positive_rate=1e-3)
+        for i in range(10000):
+            bloom.add(f"added-{i}")
+
+        assert all(f"added-{i}" in bloom for i in range(10000))
+        false_positives = sum(f"missing-{i}" in bloom for i in range(10000))
+        assert false_positives < 50
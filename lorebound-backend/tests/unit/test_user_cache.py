@@ -0,0 +1,82 @@
+"""Tests for the user principal cache."""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from app.core.user_cache import UserPrincipal, UserPrincipalCache
+from app.domain.enums import UserStatus
+from app.schemas.auth import UserResponse
+
+
+def make_principal(**overrides) -> UserPrincipal:
+    fields = {
+        "id": uuid4(),
+        "status": UserStatus.ACTIVE,
+        "email": "player@example.com",
+        "handle": "Player",
+        "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+    }
+    return UserPrincipal(**{**fields, **overrides})
+
+
+@pytest.mark.unit
+class TestUserPrincipalCache:
+    """Test the in-process and Redis tiers in front of the database."""
+
+    @pytest.fixture
+    def redis(self, mock_redis_client):
+        """Redis mock with an empty cache."""
+        mock_redis_client.get_json = AsyncMock(return_value=None)
+        return mock_redis_client
+
+    async def test_miss_loads_once_then_serves_locally(self, redis):
+        """Test a database load fills both tiers and later reads skip Redis."""
+        principal = make_principal()
+        load = AsyncMock(return_value=principal)
+        cache = UserPrincipalCache(redis)
+
+        assert await cache.get(principal.id, load) == principal
+        assert await cache.get(principal.id, load) == principal
+
+        load.assert_awaited_once()
+        redis.get_json.assert_awaited_once()
+        key, data, ttl = redis.set_json.call_args.args
+        assert key == f"user_principal:{principal.id}"
+        assert data["status"] == "active"
+        assert ttl == UserPrincipalCache.REDIS_TTL
+
+    async def test_redis_hit_skips_database(self, redis):
+        """Test a principal cached by another worker is used without loading."""
+        principal = make_principal()
+        redis.get_json = AsyncMock(return_value=principal.model_dump(mode="json"))
+        load = AsyncMock()
+
+        assert await UserPrincipalCache(redis).get(principal.id, load) == principal
+        load.assert_not_called()
+
+    async def test_invalidate_drops_both_tiers(self, redis):
+        """Test a status change is visible on the next request."""
+        principal = make_principal()
+        banned = make_principal(id=principal.id, status=UserStatus.BANNED)
+        cache = UserPrincipalCache(redis)
+
+        await cache.get(principal.id, AsyncMock(return_value=principal))
+        await cache.invalidate(principal.id)
+
+        assert (await cache.get(principal.id, AsyncMock(return_value=banned))).status == UserStatus.BANNED
+        redis.delete.assert_awaited_once_with(f"user_principal:{principal.id}")
+
+    async def test_redis_failure_falls_back_to_database(self, redis):
+        """Test Redis errors don't fail authentication."""
+        redis.get_json = AsyncMock(side_effect=ConnectionError("redis down"))
+        redis.set_json = AsyncMock(side_effect=ConnectionError("redis down"))
+        principal = make_principal()
+
+        assert await UserPrincipalCache(redis).get(principal.id, AsyncMock(return_value=principal)) == principal
+
+    def test_principal_serves_user_response(self):
+        """Test /auth/me can be answered from the principal alone."""
+        principal = make_principal()
+        assert UserResponse.model_validate(principal).id == principal.id
@@ -0,0 +1,191 @@
+"""Tests for UserRepository query construction."""
+
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.inventory_repo import InventoryRepository
+from app.repositories.user_repo import UserRepository
+
+
+@pytest.mark.unit
+class TestRegisterUser:
+    """Test set-based registration."""
+
+    @pytest.fixture
+    def repo(self):
+        """Repository over a session that records executed statements."""
+        session = Mock()
+        session.execute = AsyncMock()
+        return UserRepository(session)
+
+    def returns(self, repo, row):
+        """Make the registration statement return one row or none."""
+        repo.session.execute.return_value = Mock(one_or_none=Mock(return_value=row))
+
+    async def test_single_statement(self, repo):
+        """Test user, profile and starter items are inserted by one statement."""
+        self.returns(repo, Mock(created_at=datetime.now(timezone.utc), profiles=1, items=4))
+
+        user, conflict = await repo.register_user("a@example.com", "hash", "Ace", [uuid4(), uuid4()])
+
+        assert conflict is None
+        assert user.email == "a@example.com"
+        repo.session.execute.assert_awaited_once()
+        sql = str(repo.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("WITH new_user AS")
+        assert "ON CONFLICT (email) DO NOTHING" in sql
+        assert "INSERT INTO profiles" in sql and "ON CONFLICT (handle) DO NOTHING" in sql
+        assert "INSERT INTO inventory" in sql
+
+    async def test_email_conflict(self, repo):
+        """Test a taken email inserts nothing."""
+        self.returns(repo, None)
+
+        assert await repo.register_user("a@example.com", "hash", "Ace", []) == (None, "email")
+
+    async def test_handle_conflict(self, repo):
+        """Test a taken handle is reported for the caller to roll back."""
+        self.returns(repo, Mock(created_at=datetime.now(timezone.utc), profiles=0, items=0))
+
+        assert await repo.register_user("a@example.com", "hash", "Ace", []) == (None, "handle")
+
+
+@pytest.mark.unit
+class TestStarterItems:
+    """Test the starter item ID cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start every test with an empty cache."""
+        InventoryRepository._starter_item_ids = None
+        yield
+        InventoryRepository._starter_item_ids = None
+
+    def make_repo(self, item_ids):
+        """Repository whose item query returns the given IDs."""
+        session = Mock()
+        session.execute = AsyncMock(return_value=Mock(
+            scalars=Mock(return_value=Mock(all=Mock(return_value=item_ids)))
+        ))
+        return InventoryRepository(session)
+
+    async def test_ids_are_cached(self):
+        """Test starter item IDs are queried once per process."""
+        item_ids = [uuid4() for _ in InventoryRepository.STARTER_ITEM_SLUGS]
+        repo = self.make_repo(item_ids)
+
+        assert await repo.get_starter_item_ids() == item_ids
+        assert await self.make_repo([]).get_starter_item_ids() == item_ids
+        repo.session.execute.assert_awaited_once()
+
+    async def test_partial_catalog_is_not_cached(self):
+        """Test a catalog missing starter items is queried again."""
+        repo = self.make_repo([uuid4()])
+
+        await repo.get_starter_item_ids()
+        await repo.get_starter_item_ids()
+
+        assert repo.session.execute.await_count == 2
+
+
+@pytest.mark.unit
+class TestHandleAllocation:
+    """Test unique handle allocation."""
+
+    @pytest.fixture
+    def repo(self):
+        """Repository over a session that records executed statements."""
+        session = Mock()
+        session.execute = AsyncMock()
+        return UserRepository(session)
+
+    def free_handle_result(self, taken, last_suffix=None):
+        """Result of the free handle query."""
+        return Mock(one=Mock(return_value=Mock(taken=taken, last_suffix=last_suffix)))
+
+    def insert_result(self, inserted):
+        """Result of a conflict-safe profile insert."""
+        return Mock(scalar_one_or_none=Mock(return_value=uuid4() if inserted else None))
+
+    async def test_free_handle_is_used_as_is(self, repo):
+        """Test an untaken handle needs no suffix."""
+        repo.session.execute.return_value = self.free_handle_result(None)
+
+        assert await repo.find_free_handle("Ace") == "Ace"
+
+    async def test_next_suffix_in_one_query(self, repo):
+        """Test the next numbered variant comes from a single aggregate query."""
+        repo.session.execute.return_value = self.free_handle_result(True, "041")
+
+        assert await repo.find_free_handle("Player_001234a") == "Player_0012_42"
+
+        repo.session.execute.assert_awaited_once()
+        sql = str(repo.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "bool_or" in sql and "max(lpad" in sql and "FILTER" in sql
+
+    async def test_exhausted_suffixes(self, repo):
+        """Test no numbered variant is offered past the suffix width."""
+        repo.session.execute.return_value = self.free_handle_result(True, "999")
+
+        assert await repo.find_free_handle("Ace") is None
+
+    async def test_lost_race_falls_back_to_random_suffix(self, repo):
+        """Test a handle taken concurrently is replaced by a random variant."""
+        repo.session.execute.side_effect = [
+            self.free_handle_result(True, "001"),
+            self.insert_result(False),
+            self.insert_result(True),
+        ]
+
+        handle = await repo.create_profile_with_free_handle(uuid4(), "Ace")
+
+        assert handle.startswith("Ace_") and handle != "Ace_2"
+        assert len(handle) <= 15
+        assert repo.session.execute.await_count == 3
+
+    async def test_attempts_are_bounded(self, repo):
+        """Test allocation gives up after a constant number of round trips."""
+        repo.session.execute.side_effect = [self.free_handle_result(True, "999")] + [
+            self.insert_result(False) for _ in range(10)
+        ]
+
+        assert await repo.create_profile_with_free_handle(uuid4(), "Ace") is None
+        assert repo.session.execute.await_count == 4
+
+
+@pytest.mark.unit
+class TestAddExperience:
+    """Test XP and level are updated atomically."""
+
+    @pytest.fixture
+    def repo(self):
+        """Repository over a session that records executed statements."""
+        session = Mock()
+        session.execute = AsyncMock()
+        return UserRepository(session)
+
+    def returns(self, repo, row):
+        """Make the update return the new XP and level, or no row."""
+        repo.session.execute.return_value = Mock(one_or_none=Mock(return_value=row))
+
+    async def test_single_update(self, repo):
+        """Test XP is incremented and the level looked up in the database."""
+        self.returns(repo, Mock(xp=3100, level=4))
+
+        progress = await repo.add_experience(uuid4(), 500)
+
+        assert progress.levels_gained == [4]
+        repo.session.execute.assert_awaited_once()
+        sql = str(repo.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE profiles SET level=width_bucket(profiles.xp + ")
+        assert "RETURNING profiles.xp, profiles.level" in sql
+
+    async def test_missing_profile(self, repo):
+        """Test a user without a profile gains nothing."""
+        self.returns(repo, None)
+
+        assert await repo.add_experience(uuid4(), 500) is None